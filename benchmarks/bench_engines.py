@@ -0,0 +1,70 @@
+"""Compare GamryParser.load() table engines on large generated DTA files.
+
+usage: python benchmarks/bench_engines.py [--points N] [--curves N] [--repeat N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from pandas.testing import assert_frame_equal
+
+import gamry_parser as parser
+from generators import write_dta
+
+
+def time_load(fname: str, engine: str, repeat: int) -> tuple:
+    """return the best-of-`repeat` load time and the loaded parser"""
+    best = None
+    for _ in range(repeat):
+        gp = parser.GamryParser(filename=fname, engine=engine)
+        start = time.perf_counter()
+        gp.load()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, gp
+
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    args.add_argument("--points", type=int, default=20000)
+    args.add_argument("--curves", type=int, default=100)
+    args.add_argument("--repeat", type=int, default=3)
+    args = args.parse_args()
+
+    cases = [
+        ("CHRONOA", 1, args.points),
+        ("CV", args.curves, max(args.points // args.curves, 1)),
+    ]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for tag, curves, points in cases:
+            fname = os.path.join(tmpdir, "{}.dta".format(tag.lower()))
+            write_dta(fname, tag, curves=curves, points=points)
+            size = os.path.getsize(fname) / 1e6
+
+            results = {}
+            for engine in parser.GamryParser.ENGINES:
+                results[engine] = time_load(fname, engine, args.repeat)
+
+            reference = results["python"][1]
+            for engine, (_, gp) in results.items():
+                assert gp.curve_count == reference.curve_count
+                for curve, expected in zip(gp.curves, reference.curves):
+                    assert_frame_equal(curve, expected)
+
+            print(
+                "{} ({} curves x {} points, {:.1f} MB)".format(
+                    tag, curves, points, size
+                )
+            )
+            for engine, (elapsed, _) in results.items():
+                print(
+                    "  {:<8} {:8.3f} s  ({:.1f}x)".format(
+                        engine, elapsed, results["python"][0] / elapsed
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""Synthetic EXPLAIN (DTA) files of configurable size, for every experiment type supported by gamry_parser.
+
+usage: python benchmarks/generators.py CV out.dta [--curves N] [--points N] [--decimal ,] [--ocv N] [--aborted]
+"""
+
+import argparse
+import io
+
+import numpy as np
+
+# placeholder written in place of the Over column, replaced after decimal separators are converted
+OVER = "@"
+OVER_FLAGS = "..........."
+
+OVER_COLUMN = ("Over", "bits", OVER)
+EXPERIMENTS = {
+    "CV": dict(
+        marker="EXPLAIN",
+        table="CURVE",
+        header=[
+            ("VINIT", "POTEN", 0.1, "F\tInitial &E (V)"),
+            ("VLIMIT1", "POTEN", 0.5, "F\tScan Limit &1 (V)"),
+            ("VLIMIT2", "POTEN", -0.5, "F\tScan Limit &2 (V)"),
+            ("VFINAL", "POTEN", 0.1, "F\tFinal &E (V)"),
+            ("SCANRATE", "QUANT", 100.0, "&Scan Rate (mV/s)"),
+            ("STEPSIZE", "QUANT", 2.0, "St&ep Size (mV)"),
+            ("AREA", "QUANT", 1.0, "Electrode &Area (cm^2)"),
+        ],
+        columns=[
+            ("Pt", "#", "%d"),
+            ("T", "s", "%g"),
+            ("Vf", "V vs. Ref.", "%.5E"),
+            ("Im", "A", "%.5E"),
+            ("Vu", "V", "%.5E"),
+            ("Sig", "V", "%.5E"),
+            ("Ach", "V", "%.5E"),
+            ("IERange", "#", "%d"),
+            OVER_COLUMN,
+        ],
+    ),
+    "CHRONOA": dict(
+        marker="EXPLAIN",
+        table="CURVE",
+        header=[
+            ("VPRESTEP", "POTEN", 0.0, "F\tPre-step Voltage (V)"),
+            ("TPRESTEP", "QUANT", 0.5, "Pre-step Delay &Time (s)"),
+            ("VSTEP1", "POTEN", 0.5, "F\tStep 1 Voltage (V)"),
+            ("TSTEP1", "QUANT", 30.0, "Step 1 Time (s)"),
+            ("SAMPLETIME", "QUANT", 0.1, "Sa&mple Period (s)"),
+            ("AREA", "QUANT", 1.0, "Electrode &Area (cm^2)"),
+        ],
+        columns=[
+            ("Pt", "#", "%d"),
+            ("T", "s", "%g"),
+            ("Vf", "V vs. Ref.", "%.5E"),
+            ("Im", "A", "%.5E"),
+            ("Vu", "V", "%.5E"),
+            ("Sig", "V", "%.5E"),
+            ("Ach", "V", "%.5E"),
+            ("IERange", "#", "%d"),
+            OVER_COLUMN,
+        ],
+    ),
+    "CORPOT": dict(
+        marker="EXPLAIN",
+        table="CURVE",
+        header=[
+            ("TIMEOUT", "QUANT", 180000.0, "Total &Time (s)"),
+            ("SAMPLETIME", "QUANT", 0.1, "Sa&mple Period (s)"),
+            ("STABILITY", "QUANT", 0.0, "Sta&bility (mV/s)"),
+        ],
+        columns=[
+            ("Pt", "#", "%d"),
+            ("T", "s", "%g"),
+            ("Vf", "V vs. Ref.", "%.5E"),
+            ("Vm", "V", "%.5E"),
+            ("Ach", "V", "%.5E"),
+            OVER_COLUMN,
+            ("Temp", "deg C", "%.2f"),
+        ],
+    ),
+    "SQUARE_WAVE": dict(
+        marker="EXPLAIN",
+        table="CURVE",
+        header=[
+            ("VINIT", "QUANT", 0.0, "Initial &E (V)"),
+            ("VFINAL", "QUANT", -0.5, "Final &E (V)"),
+            ("STEPSIZE", "QUANT", 2.0, "St&ep Size (mV)"),
+            ("FREQUENCY", "QUANT", 100.0, "&Frequency (Hz)"),
+            ("PULSESIZE", "QUANT", 25.0, "Pulse Size &Epeak (mV)"),
+            ("PULSEON", "QUANT", 0.01, "Pulse &Time (s)"),
+            ("CYCLES", "IQUANT", 251, "C&ycles (#)"),
+        ],
+        columns=[
+            ("Pt", "#", "%d"),
+            ("T", "s", "%g"),
+            ("Vfwd", "V", "%.5E"),
+            ("Vrev", "V", "%.5E"),
+            ("Vstep", "V", "%.5E"),
+            ("Ifwd", "A", "%.5E"),
+            ("Irev", "A", "%.5E"),
+            ("Idif", "A", "%.5E"),
+            ("Sig", "V", "%.5E"),
+            ("Ach", "V", "%.5E"),
+            ("IERange", "#", "%d"),
+            OVER_COLUMN,
+            ("Temp", "deg C", "%.2f"),
+        ],
+    ),
+    "EISPOT": dict(
+        marker="EXPLAIN",
+        table="ZCURVE",
+        header=[
+            ("VDC", "POTEN", 1.3, "F\tDC &Voltage (V)"),
+            ("FREQINIT", "QUANT", 100000.0, "Initial Fre&q. (Hz)"),
+            ("FREQFINAL", "QUANT", 1.0, "Final Fre&q. (Hz)"),
+            ("PTSPERDEC", "QUANT", 10.0, "Points/&decade"),
+            ("VAC", "QUANT", 10.0, "AC &Voltage (mV rms)"),
+            ("AREA", "QUANT", 1.0, "&Area (cm^2)"),
+        ],
+        columns=[
+            ("Pt", "#", "%d"),
+            ("Time", "s", "%g"),
+            ("Freq", "Hz", "%g"),
+            ("Zreal", "ohm", "%.7g"),
+            ("Zimag", "ohm", "%.7g"),
+            ("Zsig", "V", "%g"),
+            ("Zmod", "ohm", "%.7g"),
+            ("Zphz", "°", "%.7g"),
+            ("Idc", "A", "%.6E"),
+            ("Vdc", "V", "%.7g"),
+            ("IERange", "#", "%d"),
+        ],
+    ),
+    "VFP600": dict(
+        marker="VFP600",
+        table="VFPCURVE",
+        header=[
+            ("CTRLMODE", "IQUANT", 1, "Control Mode"),
+            ("FREQ", "QUANT", 15.0, "Acquisition Frequency (Hz)"),
+        ],
+        columns=[
+            ("Voltage", "V", "%.6f"),
+            ("Current", "A", "%.6E"),
+        ],
+    ),
+}
+
+OCV_COLUMNS = [
+    ("Pt", "#", "%d"),
+    ("T", "s", "%g"),
+    ("Vf", "V vs. Ref.", "%.5E"),
+    ("Vm", "V", "%.5E"),
+    ("Ach", "V", "%.5E"),
+    OVER_COLUMN,
+]
+
+
+def _format_quant(value, decimal: str) -> str:
+    """format a header value the way EXPLAIN writes it (e.g. 1.00000E+002)"""
+    if isinstance(value, int):
+        return str(value)
+    return "{:.5E}".format(value).replace(".", decimal)
+
+
+def _write_header(f, tag: str, decimal: str, ocv: int, rng):
+    """write the header of an experiment, with an optional OCVCURVE block of `ocv` points"""
+    spec = EXPERIMENTS[tag]
+    lines = [
+        spec["marker"],
+        "TAG\t{}".format(tag),
+        "TITLE\tLABEL\tBenchmark {}\tTest &Identifier".format(tag),
+        "DATE\tLABEL\t3/10/2019\tDate",
+        "TIME\tLABEL\t12:00:00\tTime",
+        "NOTES\tNOTES\t1\t&Notes...",
+        "\tGenerated for benchmarking",
+        "PSTAT\tPSTAT\tpotentiostat-id\tPotentiostat",
+    ]
+    for key, kind, value, label in spec["header"]:
+        lines.append(
+            "{}\t{}\t{}\t{}".format(key, kind, _format_quant(value, decimal), label)
+        )
+    f.write("\n".join(lines) + "\n")
+    if ocv > 0:
+        f.write("OCVCURVE\tTABLE\t{}\n".format(ocv))
+        _write_table(f, OCV_COLUMNS, _ocv_data(ocv, rng), 0, decimal)
+        f.write(
+            "EOC\tQUANT\t{}\tOpen Circuit (V)\n".format(_format_quant(0.28, decimal))
+        )
+
+
+def _ocv_data(points: int, rng) -> np.ndarray:
+    """open circuit potential: a slowly drifting voltage"""
+    t = np.arange(points) * 0.25
+    vf = 0.28 + 1e-4 * np.cumsum(rng.normal(size=points))
+    return np.column_stack(
+        [
+            t,
+            vf,
+            vf + rng.normal(scale=1e-5, size=points),
+            rng.normal(scale=1e-4, size=points),
+        ]
+    )
+
+
+def _curve_data(tag: str, curve: int, points: int, rng) -> np.ndarray:
+    """realistic-looking columns (excluding Pt and Over) for one table of an experiment"""
+    n = np.arange(points)
+    noise = lambda scale: rng.normal(scale=scale, size=points)  # noqa: E731
+    if tag == "CV":
+        # one triangular sweep between the scan limits per curve
+        phase = n / max(points - 1, 1)
+        vf = 0.1 + 0.4 * np.where(
+            phase < 0.25,
+            4 * phase,
+            np.where(phase < 0.75, 2 - 4 * phase, 4 * phase - 4),
+        )
+        im = 1e-6 * vf + 1e-6 * np.exp(-(((vf - 0.2) / 0.05) ** 2)) + noise(1e-9)
+        t = (curve * points + n) * 0.02
+        return np.column_stack([t, vf, im, vf * 0, vf, noise(1e-4), np.full(points, 5)])
+    if tag == "CHRONOA":
+        t = n * 0.1
+        im = 1e-5 / np.sqrt(t + 0.1) + noise(1e-9)
+        vf = np.full(points, 0.5) + noise(1e-5)
+        return np.column_stack([t, vf, im, vf * 0, vf, noise(1e-4), np.full(points, 6)])
+    if tag == "CORPOT":
+        t = n * 0.1
+        vf = 0.02 + 1e-5 * np.cumsum(noise(1.0))
+        return np.column_stack([t, vf, vf + noise(1e-5), noise(1e-4), 25 + noise(0.01)])
+    if tag == "SQUARE_WAVE":
+        t = (n + 1) * 0.01
+        vstep = -n * 0.002
+        ifwd = 1e-7 + noise(1e-8)
+        irev = -1e-6 + noise(1e-8)
+        return np.column_stack(
+            [
+                t,
+                vstep - 0.025,
+                vstep + 0.025,
+                vstep,
+                ifwd,
+                irev,
+                ifwd - irev,
+                vstep,
+                noise(1e-4),
+                np.full(points, 7),
+                25 + noise(0.01),
+            ]
+        )
+    if tag == "EISPOT":
+        # randles circuit, logarithmic frequency sweep
+        freq = np.logspace(5, 0, points)
+        w = 2 * np.pi * freq
+        z = 20 + 200 / (1 + 1j * w * 200 * 1e-6)
+        return np.column_stack(
+            [
+                n + 1.0,
+                freq,
+                z.real,
+                z.imag,
+                np.ones(points),
+                np.abs(z),
+                np.degrees(np.angle(z)),
+                2e-6 + noise(1e-7),
+                1.3 + noise(1e-5),
+                np.full(points, 10),
+            ]
+        )
+    if tag == "VFP600":
+        return np.column_stack([0.03 * np.sin(n / 3.0), 5e-11 + noise(1e-12)])
+    raise ValueError("Unknown experiment type '{}'".format(tag))
+
+
+def _write_table(f, columns: list, data: np.ndarray, start: int, decimal: str):
+    """write the column names, units and rows of a table. Pt (if any) counts from `start`."""
+    f.write("".join("\t" + key for key, _, _ in columns) + "\n")
+    f.write("".join("\t" + unit for _, unit, _ in columns) + "\n")
+
+    formats = [fmt for key, _, fmt in columns if key not in ("Pt", "Over")]
+    values = [data]
+    if columns[0][0] == "Pt":
+        values.insert(0, np.arange(start, start + len(data))[:, None])
+        formats.insert(0, "%d")
+    if any(key == "Over" for key, _, _ in columns):
+        # the Over flags are written as a literal in the row format
+        position = [key for key, _, _ in columns].index("Over")
+        formats.insert(position, OVER)
+
+    text = io.StringIO()
+    np.savetxt(text, np.hstack(values), fmt="\t".join(formats))
+    rows = text.getvalue()
+    if decimal != ".":
+        rows = rows.replace(".", decimal)
+    rows = rows.replace(OVER, OVER_FLAGS)
+    # EXPLAIN rows start with a tab
+    f.write("\t" + rows.replace("\n", "\n\t")[:-1])
+
+
+def write_dta(
+    fname: str,
+    tag: str,
+    curves: int = 1,
+    points: int = 1000,
+    decimal: str = ".",
+    ocv: int = 0,
+    aborted: bool = False,
+    seed: int = 0,
+):
+    """write a synthetic EXPLAIN file
+
+    Args:
+        fname (str): output filepath
+        tag (str): experiment type, one of EXPERIMENTS (CV, CHRONOA, CORPOT, SQUARE_WAVE, EISPOT, VFP600)
+        curves (int, optional): number of tables. Defaults to 1.
+        points (int, optional): number of rows per table. Defaults to 1000.
+        decimal (str, optional): decimal separator ("." or ","). Defaults to ".".
+        ocv (int, optional): number of points in an OCVCURVE block written in the header (0 for none). Defaults to 0.
+        aborted (bool, optional): end the file with EXPERIMENTABORTED, after writing only half of the last table
+            (whose TABLE line still declares `points` rows). Defaults to False.
+        seed (int, optional): random seed used to generate data. Defaults to 0.
+
+    Returns:
+        int: size of the file, in bytes
+
+    """
+    assert (
+        tag in EXPERIMENTS
+    ), "Unknown experiment type '{}'. Expected one of {}".format(
+        tag, tuple(EXPERIMENTS)
+    )
+    assert decimal in (".", ","), "Unknown decimal separator '{}'".format(decimal)
+    rng = np.random.default_rng(seed)
+    spec = EXPERIMENTS[tag]
+    with open(fname, "w", encoding="utf8") as f:
+        _write_header(f, tag, decimal, ocv, rng)
+        start = 0
+        for curve in range(curves):
+            label = spec["table"] + (str(curve + 1) if curves > 1 else "")
+            f.write("{}\tTABLE\t{}\n".format(label, points))
+            rows = points // 2 if aborted and curve == curves - 1 else points
+            data = _curve_data(tag, curve, points, rng)[:rows]
+            _write_table(f, spec["columns"], data, start, decimal)
+            start += rows
+        if aborted:
+            f.write("EXPERIMENTABORTED\tTOGGLE\tT\tExperiment Aborted\n")
+        return f.tell()
+
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    args.add_argument("tag", choices=sorted(EXPERIMENTS))
+    args.add_argument("fname")
+    args.add_argument("--curves", type=int, default=1)
+    args.add_argument("--points", type=int, default=1000)
+    args.add_argument("--decimal", choices=[".", ","], default=".")
+    args.add_argument("--ocv", type=int, default=0)
+    args.add_argument("--aborted", action="store_true")
+    args = args.parse_args()
+    size = write_dta(
+        args.fname,
+        args.tag,
+        curves=args.curves,
+        points=args.points,
+        decimal=args.decimal,
+        ocv=args.ocv,
+        aborted=args.aborted,
+    )
+    print("{}: {:.1f} MB".format(args.fname, size / 1e6))
+
+
+if __name__ == "__main__":
+    main()
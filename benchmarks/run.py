@@ -0,0 +1,207 @@
+"""Benchmark suite for gamry_parser on synthetic DTA files of every experiment type.
+
+Times load() (per engine), read_header() and curve() access, and records the peak memory of load(), for a set
+of generated experiments (see CASES and generators.py). Results are written as JSON, so that runs on different
+releases can be compared with --compare.
+
+usage: python benchmarks/run.py [--scale X] [--repeat N] [--modes python scan mmap lazy] [--cases NAME ...]
+                                [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import gamry_parser as parser
+from gamry_parser.batch import EXPERIMENT_CLASSES
+from generators import write_dta
+
+# name: (experiment type, curves, points per curve at scale 1, generator options)
+CASES = {
+    "cv-many-curves": ("CV", 200, 1000, dict()),
+    "cv-ocvcurve": ("CV", 10, 10000, dict(ocv=5000)),
+    "chronoa-long": ("CHRONOA", 1, 200000, dict()),
+    "chronoa-comma": ("CHRONOA", 1, 200000, dict(decimal=",")),
+    "corpot-long": ("CORPOT", 1, 200000, dict()),
+    "square-wave": ("SQUARE_WAVE", 1, 100000, dict()),
+    "eispot-aborted": ("EISPOT", 50, 1000, dict(aborted=True)),
+    "vfp600-long": ("VFP600", 1, 200000, dict()),
+}
+
+# load() options of each benchmarked mode
+MODES = {
+    "python": dict(engine="python"),
+    "scan": dict(engine="scan"),
+    "mmap": dict(engine="mmap"),
+    "lazy": dict(lazy=True),
+}
+
+
+def best_of(repeat: int, func) -> float:
+    """return the shortest of `repeat` timed calls of func()"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_case(fname: str, tag: str, decimal: str, mode: str, repeat: int) -> dict:
+    """benchmark one generated file with one load() mode"""
+    cls = EXPERIMENT_CLASSES[tag]
+    options = dict(filename=fname, decimal=decimal, **MODES[mode])
+
+    def load():
+        gp = cls(**options)
+        gp.load()
+        return gp
+
+    def access(gp):
+        if gp.curve_count == 1:
+            # single-curve experiments (e.g. OpenCircuitPotential) take no curve argument
+            return [gp.curve()]
+        return [gp.curve(curve) for curve in range(gp.curve_count)]
+
+    load_s = best_of(repeat, load)
+
+    # first access parses the curve (lazy) or builds its view; later accesses return it as-is
+    gp = load()
+    start = time.perf_counter()
+    access(gp)
+    first_s = time.perf_counter() - start
+    curve_s = best_of(repeat, lambda: access(gp)) / max(gp.curve_count, 1)
+    rows = sum(len(curve) for curve in access(gp))
+
+    tracemalloc.start()
+    access(load())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return dict(
+        load_s=load_s,
+        curve_first_s=first_s,
+        curve_s=curve_s,
+        peak_bytes=peak,
+        curve_count=gp.curve_count,
+        rows=rows,
+    )
+
+
+def run(cases: list, modes: list, scale: float, repeat: int) -> dict:
+    """run the benchmark suite
+
+    Returns:
+        dict: meta (environment and settings) and results (one record per case and mode)
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name in cases:
+            tag, curves, points, options = CASES[name]
+            points = max(int(points * scale), 2)
+            fname = os.path.join(tmpdir, "{}.dta".format(name))
+            size = write_dta(fname, tag, curves=curves, points=points, **options)
+            decimal = options.get("decimal", ".")
+            header_s = best_of(
+                repeat,
+                lambda: EXPERIMENT_CLASSES[tag](
+                    filename=fname, decimal=decimal
+                ).read_header(),
+            )
+            print(
+                "{} ({}, {} curves x {} points, {:.1f} MB)".format(
+                    name, tag, curves, points, size / 1e6
+                )
+            )
+            print("  {:<8} {:9.4f} s".format("header", header_s))
+            for mode in modes:
+                record = dict(
+                    case=name,
+                    experiment=tag,
+                    mode=mode,
+                    curves=curves,
+                    points=points,
+                    size_bytes=size,
+                    read_header_s=header_s,
+                    **options,
+                )
+                record.update(run_case(fname, tag, decimal, mode, repeat))
+                results.append(record)
+                print(
+                    "  {:<8} {:9.4f} s  curve() {:.2e} s (first {:.4f} s)  peak {:8.1f} MB".format(
+                        mode,
+                        record["load_s"],
+                        record["curve_s"],
+                        record["curve_first_s"],
+                        record["peak_bytes"] / 1e6,
+                    )
+                )
+
+    meta = dict(
+        gamry_parser=parser.__version__,
+        python=platform.python_version(),
+        pandas=pd.__version__,
+        numpy=np.__version__,
+        platform=platform.platform(),
+        date=datetime.datetime.now().isoformat(timespec="seconds"),
+        scale=scale,
+        repeat=repeat,
+    )
+    return dict(meta=meta, results=results)
+
+
+def compare(results: dict, baseline: dict):
+    """print load time and peak memory of `results` relative to a previous run"""
+    previous = {(r["case"], r["mode"]): r for r in baseline["results"]}
+    print(
+        "\ncompared to gamry_parser {} ({}):".format(
+            baseline["meta"]["gamry_parser"], baseline["meta"]["date"]
+        )
+    )
+    for record in results["results"]:
+        other = previous.get((record["case"], record["mode"]), None)
+        if other is None:
+            continue
+        print(
+            "  {:<16} {:<8} load {:6.2f}x  header {:6.2f}x  peak {:6.2f}x".format(
+                record["case"],
+                record["mode"],
+                other["load_s"] / record["load_s"],
+                other["read_header_s"] / record["read_header_s"],
+                record["peak_bytes"] / max(other["peak_bytes"], 1),
+            )
+        )
+
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    args.add_argument(
+        "--scale", type=float, default=1.0, help="multiplier for the number of points"
+    )
+    args.add_argument("--repeat", type=int, default=3)
+    args.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    args.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    args.add_argument("--output", help="write results to this JSON file")
+    args.add_argument("--compare", help="JSON results of a previous run")
+    args = args.parse_args()
+
+    results = run(args.cases, args.modes, args.scale, args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, "r") as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,3 +6,17 @@ from .eispot import Impedance
 from .ocp import OpenCircuitPotential
 from .squarewave import SquareWaveVoltammetry
 from .vfp600 import VFP600
+from .header import scan_header, scan_headers
+from .batch import load_batch, experiment_class
+from .cache import ParseCache
+from .tail import TailReader
+from .aio import AsyncGamryParser
+from .stats import ParseStats
+from .export import (
+    to_arrow,
+    from_arrow,
+    write_experiment,
+    write_experiments,
+    read_experiment,
+)
+from .store import ExperimentStore
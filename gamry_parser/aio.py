@@ -0,0 +1,145 @@
+import asyncio
+from .gamryparser import GamryParser
+from .tail import TailReader
+
+
+def _read_file(filename: str) -> bytes:
+    """read the contents of a file (runs in the executor)"""
+    with open(file=filename, mode="rb") as f:
+        return f.read()
+
+
+def _load_buffer(gp: GamryParser, buf: bytes, kwargs: dict) -> GamryParser:
+    """load a parser from file contents that were already read (runs in the executor)"""
+    gp._buffer = buf
+    try:
+        gp.load(**kwargs)
+    finally:
+        gp._buffer = None
+    return gp
+
+
+class AsyncGamryParser:
+    """asyncio interface to the GamryParser family.
+
+    File contents are read in the event loop's default executor, and tables are parsed in `executor` (a thread or
+    process pool), so that many experiments can be loaded concurrently without blocking the event loop.
+    """
+
+    def __init__(
+        self, filename: str = None, parser=GamryParser, executor=None, **kwargs
+    ):
+        """AsyncGamryParser.__init__
+
+        Args:
+            filename (str, optional): filepath to experiment data. Defaults to None
+            parser (type, optional): GamryParser subclass used to parse the file. Defaults to GamryParser.
+            executor (concurrent.futures.Executor, optional): executor used to parse tables. Defaults to None
+                (the event loop's default executor).
+            **kwargs: additional options passed to the parser (e.g. to_timestamp, decimal)
+
+        Returns:
+            None
+
+        """
+        self.parser = parser(filename=filename, **kwargs)
+        self.executor = executor
+
+    async def load(self, filename: str = None, **kwargs) -> GamryParser:
+        """read and parse the file, without blocking the event loop
+
+        Args:
+            filename (str, optional): file containing EXPLAIN-formatted data. defaults to None.
+            **kwargs: additional options passed to the parser's load() (e.g. to_timestamp, decimal)
+        Returns:
+            GamryParser: the loaded parser (also available as AsyncGamryParser.parser)
+
+        """
+        loop = asyncio.get_event_loop()
+        if filename is not None:
+            kwargs["filename"] = filename
+        fname = kwargs.get("filename", None) or self.parser.fname
+        assert fname is not None, "GamryParser needs to know what file to parse."
+
+        buf = None
+        if not (kwargs.get("lazy", None) or self.parser.lazy):
+            buf = await loop.run_in_executor(None, _read_file, fname)
+        self.parser = await loop.run_in_executor(
+            self.executor, _load_buffer, self.parser, buf, kwargs
+        )
+        return self.parser
+
+    async def curves(self):
+        """iterate over the loaded curves
+
+        Curves of lazily loaded files are parsed in the event loop's default executor.
+
+        Returns:
+            async generator: pandas.DataFrame for each curve, as returned by curve()
+
+        """
+        loop = asyncio.get_event_loop()
+        for curve in range(self.parser.curve_count):
+            if self.parser.lazy:
+                yield await loop.run_in_executor(None, self.parser.curve, curve)
+            else:
+                yield self.parser.curve(curve)
+                await asyncio.sleep(0)
+
+    def __aiter__(self):
+        return self.curves()
+
+
+async def load(
+    filename: str, parser=GamryParser, executor=None, **kwargs
+) -> GamryParser:
+    """read and parse a DTA file, without blocking the event loop
+
+    Args:
+        filename (str): filepath to experiment data
+        parser (type, optional): GamryParser subclass used to parse the file. Defaults to GamryParser.
+        executor (concurrent.futures.Executor, optional): executor used to parse tables. Defaults to None.
+        **kwargs: additional options passed to the parser (e.g. to_timestamp, decimal)
+
+    Returns:
+        GamryParser: the loaded parser
+
+    """
+    return await AsyncGamryParser(parser=parser, executor=executor, **kwargs).load(
+        filename
+    )
+
+
+async def tail(
+    filename: str,
+    parser=GamryParser,
+    interval: float = 1.0,
+    timeout: float = None,
+    **kwargs
+):
+    """follow a DTA file that is still being written (see TailReader.follow), without blocking the event loop
+
+    Args:
+        filename (str): filepath to experiment data
+        parser (type, optional): GamryParser subclass used to convert and store the data. Defaults to GamryParser.
+        interval (float, optional): time between polls, in seconds. Defaults to 1.0.
+        timeout (float, optional): stop after this many seconds without new data. Defaults to None (never).
+        **kwargs: additional options passed to the parser (e.g. to_timestamp, decimal)
+
+    Returns:
+        async generator: TailBatch entries, as they are read
+
+    """
+    loop = asyncio.get_event_loop()
+    reader = TailReader(filename, parser=parser, **kwargs)
+    idle = loop.time()
+    while not reader.aborted:
+        batches = await loop.run_in_executor(None, reader.poll)
+        for batch in batches:
+            yield batch
+        if len(batches) > 0:
+            idle = loop.time()
+        elif timeout is not None and loop.time() - idle >= timeout:
+            break
+        if not reader.aborted:
+            await asyncio.sleep(interval)
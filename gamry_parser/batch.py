@@ -0,0 +1,116 @@
+import glob
+import os
+from collections import deque, namedtuple
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from .gamryparser import GamryParser
+from .chronoa import ChronoAmperometry
+from .cv import CyclicVoltammetry
+from .eispot import Impedance
+from .ocp import OpenCircuitPotential
+from .squarewave import SquareWaveVoltammetry
+from .vfp600 import VFP600
+from .header import scan_header
+
+# parser class used for each experiment type (EXPLAIN TAG); other experiments are loaded with GamryParser
+EXPERIMENT_CLASSES = {
+    "CV": CyclicVoltammetry,
+    "CHRONOA": ChronoAmperometry,
+    "CORPOT": OpenCircuitPotential,
+    "SQUARE_WAVE": SquareWaveVoltammetry,
+    "EISPOT": Impedance,
+    "VFP600": VFP600,
+}
+
+EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+BatchResult = namedtuple("BatchResult", ["filename", "parser", "error"])
+BatchResult.__doc__ = """outcome of loading a single file in load_batch()
+
+    filename (str): filepath to experiment data
+    parser (GamryParser): loaded parser (an experiment-specific subclass where available), or None on error
+    error (Exception): exception raised while loading the file, or None
+"""
+
+
+def experiment_class(filename: str) -> type:
+    """select the parser class for a DTA file, from the TAG entry of its header
+
+    Args:
+        filename (str): filepath to experiment data
+
+    Returns:
+        type: GamryParser subclass (see EXPERIMENT_CLASSES), or GamryParser for other experiment types
+
+    """
+    tag = scan_header(filename, keys=["TAG"]).get("TAG", None)
+    return EXPERIMENT_CLASSES.get(tag, GamryParser)
+
+
+def _load_file(filename: str, load_kwargs: dict) -> BatchResult:
+    """load a single file, capturing any error (runs in the executor)"""
+    try:
+        gp = experiment_class(filename)(filename=filename)
+        gp.load(**load_kwargs)
+        return BatchResult(filename, gp, None)
+    except Exception as error:
+        return BatchResult(filename, None, error)
+
+
+def load_batch(
+    filenames,
+    executor: str = "thread",
+    max_workers: int = None,
+    ordered: bool = True,
+    **kwargs
+):
+    """load many DTA files concurrently, yielding each result as it becomes available
+
+    Args:
+        filenames (str or list): glob pattern (e.g. "archive/**/*.DTA") or list of filepaths
+        executor (str, optional): "thread" or "process" pool. Defaults to "thread".
+        max_workers (int, optional): number of workers. Defaults to None (number of CPUs).
+        ordered (bool, optional): yield results in the order of `filenames`. If False, results are yielded
+            as soon as each file is loaded. Defaults to True.
+        **kwargs: options passed to the load() method of each parser (e.g. engine, decimal, lazy)
+
+    Returns:
+        generator: BatchResult(filename, parser, error) for every file. Errors are collected instead of raised.
+
+    """
+    assert executor in EXECUTORS, "Unknown executor '{}'. Expected one of {}".format(
+        executor, tuple(EXECUTORS)
+    )
+    if isinstance(filenames, str):
+        filenames = sorted(glob.glob(filenames, recursive=True))
+
+    max_workers = max_workers or os.cpu_count() or 1
+    # bound the number of files in flight, so that results are not loaded faster than they are consumed
+    limit = 2 * max_workers
+    with EXECUTORS[executor](max_workers=max_workers) as pool:
+        pending = deque() if ordered else set()
+        for filename in filenames:
+            future = pool.submit(_load_file, filename, kwargs)
+            if ordered:
+                pending.append(future)
+                if len(pending) >= limit:
+                    yield pending.popleft().result()
+            else:
+                pending.add(future)
+                if len(pending) >= limit:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+
+        if ordered:
+            while pending:
+                yield pending.popleft().result()
+        else:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
@@ -0,0 +1,252 @@
+import hashlib
+import json
+import numpy as np
+import os
+import pandas as pd
+import shutil
+import tempfile
+
+# version of the on-disk entry layout; entries written with another version are treated as misses
+CACHE_FORMAT = 1
+
+# number of bytes hashed at a time when fingerprinting a source file
+HASH_BLOCKSIZE = 1 << 20
+
+
+def file_digest(filename: str) -> str:
+    """content hash of a file
+
+    Args:
+        filename (str): filepath
+
+    Returns:
+        str: hex digest
+
+    """
+    digest = hashlib.sha1()
+    with open(file=filename, mode="rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCKSIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Persistent cache of parsed experiments, stored as one .npy file per column (loaded as memory maps).
+
+    Entries are keyed by the absolute path of the source file and the parser options that affect parsing. Each
+    entry records the mtime, size and content hash of its source file: an entry is reused while the source is
+    unchanged (a file that was touched but not modified is re-hashed rather than re-parsed), and replaced when
+    the source changes. Once the cache grows beyond `max_size` bytes, least recently used entries are removed.
+    """
+
+    def __init__(self, directory: str, max_size: int = 1 << 30):
+        """ParseCache.__init__
+
+        Args:
+            directory (str): cache location. Created if it does not exist.
+            max_size (int, optional): cache size limit, in bytes. Defaults to 1 GiB.
+
+        Returns:
+            None
+
+        """
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _entry(self, filename: str, options: dict) -> str:
+        """cache entry directory for a source file and set of parser options"""
+        key = json.dumps(
+            dict(path=os.path.abspath(filename), options=options), sort_keys=True
+        )
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest())
+
+    def get(self, filename: str, options: dict = None) -> dict:
+        """retrieve a parsed experiment
+
+        Args:
+            filename (str): filepath to experiment data
+            options (dict, optional): parser options the entry was stored with. Defaults to None.
+
+        Returns:
+            dict: header, header_length, curve_units, curves and ocv (see put()), or None if there is no valid entry
+
+        """
+        entry = self._entry(filename, options)
+        try:
+            with open(os.path.join(entry, "meta.json"), "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        stat = os.stat(filename)
+        source = meta["source"]
+        if meta["format"] != CACHE_FORMAT or source["size"] != stat.st_size:
+            return None
+        if source["mtime"] != stat.st_mtime_ns:
+            if source["digest"] != file_digest(filename):
+                return None
+            source["mtime"] = stat.st_mtime_ns
+            self._write_meta(entry, meta)
+
+        # mark the entry as recently used
+        os.utime(os.path.join(entry, "meta.json"))
+        return dict(
+            header=meta["header"],
+            header_length=meta["header_length"],
+            curve_units=meta["curve_units"],
+            curves=[_load_table(entry, table) for table in meta["curves"]],
+            ocv=None if meta["ocv"] is None else _load_table(entry, meta["ocv"]),
+        )
+
+    def put(self, filename: str, data: dict, options: dict = None):
+        """store a parsed experiment
+
+        Args:
+            filename (str): filepath to experiment data
+            data (dict): parsed experiment, with entries
+                header (dict): experimental header data in key-value pairs,
+                header_length (int): length of header text, in # of bytes,
+                curve_units (dict): unit of each curve column,
+                curves (list): curve DataFrames,
+                ocv (DataFrame): OCVCURVE table, or None
+            options (dict, optional): parser options used to parse the file. Defaults to None.
+
+        Returns:
+            None
+
+        """
+        stat = os.stat(filename)
+        entry = self._entry(filename, options)
+        staging = tempfile.mkdtemp(dir=self.directory, prefix=".tmp")
+        try:
+            meta = dict(
+                format=CACHE_FORMAT,
+                source=dict(
+                    path=os.path.abspath(filename),
+                    mtime=stat.st_mtime_ns,
+                    size=stat.st_size,
+                    digest=file_digest(filename),
+                ),
+                header=data["header"],
+                header_length=data["header_length"],
+                curve_units=data["curve_units"],
+                curves=[
+                    _save_table(staging, "curve{}".format(i), curve)
+                    for i, curve in enumerate(data["curves"])
+                ],
+                ocv=(
+                    None
+                    if data["ocv"] is None
+                    else _save_table(staging, "ocv", data["ocv"])
+                ),
+            )
+            self._write_meta(staging, meta)
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(staging, entry)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        self.evict()
+
+    def evict(self):
+        """remove least recently used entries until the cache fits within max_size
+
+        Args:
+            None
+        Returns:
+            None
+
+        """
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            entry = os.path.join(self.directory, name)
+            meta = os.path.join(entry, "meta.json")
+            if name.startswith(".") or not os.path.exists(meta):
+                continue
+            size = sum(
+                os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry)
+            )
+            entries.append((os.path.getmtime(meta), size, entry))
+            total += size
+
+        for _, size, entry in sorted(entries):
+            if total <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """remove all entries from the cache
+
+        Only cache entries (directories holding a meta.json file) and unfinished entries (.tmp staging directories)
+        are removed; other files in the cache directory are left untouched.
+
+        Args:
+            None
+        Returns:
+            None
+
+        """
+        for name in os.listdir(self.directory):
+            entry = os.path.join(self.directory, name)
+            if not os.path.isdir(entry):
+                continue
+            if name.startswith(".tmp") or os.path.exists(
+                os.path.join(entry, "meta.json")
+            ):
+                shutil.rmtree(entry, ignore_errors=True)
+
+    @staticmethod
+    def _write_meta(entry: str, meta: dict):
+        with open(os.path.join(entry, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+
+def _save_table(entry: str, name: str, table: pd.DataFrame) -> dict:
+    """write the index and columns of a DataFrame as .npy files
+
+    Returns:
+        dict: table layout, used by _load_table()
+    """
+    columns = [("index", table.index)] + [
+        ("c{}".format(i), table[key]) for i, key in enumerate(table.columns)
+    ]
+    layout = dict(
+        index=table.index.name,
+        columns=table.columns.tolist(),
+        dtypes=[str(values.dtype) for _, values in columns],
+    )
+    for tag, values in columns:
+        if values.dtype.kind in "biuf":
+            array = values.to_numpy()
+        else:
+            # text columns are stored as fixed-width unicode, so that they can be loaded without pickle
+            array = values.to_numpy(dtype=str)
+        np.save(os.path.join(entry, "{}.{}.npy".format(name, tag)), array)
+
+    layout["name"] = name
+    return layout
+
+
+def _load_table(entry: str, layout: dict) -> pd.DataFrame:
+    """memory-map a DataFrame written by _save_table()"""
+    arrays = []
+    tags = ["index"] + ["c{}".format(i) for i in range(len(layout["columns"]))]
+    for tag, dtype in zip(tags, layout["dtypes"]):
+        array = np.load(
+            os.path.join(entry, "{}.{}.npy".format(layout["name"], tag)), mmap_mode="r"
+        )
+        if array.dtype.kind == "U":
+            # text (and categorical) columns are restored to their recorded dtype
+            arrays.append(pd.Series(array).astype(dtype).array)
+        else:
+            # plain ndarray view of the memory map
+            arrays.append(np.asarray(array))
+
+    index = pd.Index(arrays[0], name=layout["index"], copy=False)
+    return pd.DataFrame(
+        dict(zip(layout["columns"], arrays[1:])), index=index, copy=False
+    )
@@ -1,11 +1,14 @@
 import gamry_parser as parser
 import pandas as pd
 import re
+from gamry_parser.decimate import Decimation
 
 
-class ChronoAmperometry(parser.GamryParser):
+class ChronoAmperometry(Decimation, parser.GamryParser):
     """Load a ChronoAmperometry experiment generated in Gamry EXPLAIN format."""
 
+    COLUMNS: tuple = ("T", "Vf", "Im")
+
     def curve(self, curve: int = 0):
         """retrieve chronoamperometry experiment data
 
@@ -20,8 +23,7 @@ class ChronoAmperometry(parser.GamryParser):
         """
 
         assert self.loaded, "DTA file not loaded. Run ChronoAmperometry.load()"
-        df = self._curves[curve]
-        return df[["T", "Vf", "Im"]]
+        return self._view(curve)
 
     @property
     def sample_time(self):
@@ -48,4 +50,4 @@ class ChronoAmperometry(parser.GamryParser):
 
         """
 
-        return len(self._curves[curve - 1].index) if len(self.curves) > 0 else 0
+        return len(self._curve(curve - 1).index) if self.curve_count > 0 else 0
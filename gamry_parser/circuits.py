@@ -0,0 +1,305 @@
+import numpy as np
+import pandas as pd
+import time
+from collections import namedtuple
+
+Circuit = namedtuple("Circuit", ["name", "params", "limits", "model", "guess"])
+Circuit.__doc__ = """equivalent circuit model used by fit_spectra()
+
+    name (str): circuit identifier (see CIRCUITS)
+    params (tuple): parameter names, e.g. ("Rs", "Rct", "Cdl")
+    limits (tuple): (min, max) of each parameter. All parameters are positive, and are fitted on a log scale.
+    model (callable): model(params, omega) -> complex impedance, with params of shape (spectra, parameters) and
+        angular frequencies of shape (spectra, points)
+    guess (callable): guess(omega, z) -> initial parameters, estimated from the measured spectra
+"""
+
+# relative step of the finite-difference jacobian (on the log scale of the parameters)
+JACOBIAN_STEP = 1e-6
+# number of spectra fitted together by fit_spectra()
+BATCH_SIZE = 64
+
+
+def _column(params: np.ndarray, i: int) -> np.ndarray:
+    return params[:, i : i + 1]
+
+
+def _features(omega: np.ndarray, z: np.ndarray) -> tuple:
+    """estimate series resistance, polarization resistance and apex frequency of measured spectra
+
+    Args:
+        omega (np.ndarray): angular frequencies, shape (spectra, points). Missing points are NaN.
+        z (np.ndarray): complex impedance, shape (spectra, points)
+    Returns:
+        tuple: Rs, Rp, the angular frequency at the maximum of -Zimag, and the lowest angular frequency and its
+            impedance, each of shape (spectra, 1)
+
+    """
+    rows = np.arange(len(omega))
+    valid = ~np.isnan(omega)
+    high = np.where(valid, omega, -np.inf).argmax(axis=1)
+    low = np.where(valid, omega, np.inf).argmin(axis=1)
+    apex = np.where(valid, -z.imag, -np.inf).argmax(axis=1)
+    scale = np.nanmax(np.abs(z), axis=1)
+    rs = np.maximum(z.real[rows, high], 1e-6 * scale)
+    rp = np.maximum(z.real[rows, low] - rs, 1e-3 * scale)
+    return (
+        rs[:, None],
+        rp[:, None],
+        omega[rows, apex][:, None],
+        omega[rows, low][:, None],
+        z[rows, low][:, None],
+    )
+
+
+def _rc_model(params: np.ndarray, omega: np.ndarray) -> np.ndarray:
+    rs, rct, cdl = (_column(params, i) for i in range(3))
+    return rs + rct / (1 + 1j * omega * rct * cdl)
+
+
+def _rc_guess(omega: np.ndarray, z: np.ndarray) -> np.ndarray:
+    rs, rp, apex, _, _ = _features(omega, z)
+    return np.hstack([rs, rp, 1 / (apex * rp)])
+
+
+def _rq_model(params: np.ndarray, omega: np.ndarray) -> np.ndarray:
+    rs, rct, q, n = (_column(params, i) for i in range(4))
+    return rs + rct / (1 + (1j * omega) ** n * q * rct)
+
+
+def _rq_guess(omega: np.ndarray, z: np.ndarray) -> np.ndarray:
+    rs, rp, apex, _, _ = _features(omega, z)
+    return np.hstack([rs, rp, 1 / (apex * rp), np.full_like(rs, 0.9)])
+
+
+def _randles_model(params: np.ndarray, omega: np.ndarray) -> np.ndarray:
+    rs, rct, cdl, sigma = (_column(params, i) for i in range(4))
+    warburg = sigma * (1 - 1j) / np.sqrt(omega)
+    return rs + 1 / (1j * omega * cdl + 1 / (rct + warburg))
+
+
+def _randles_guess(omega: np.ndarray, z: np.ndarray) -> np.ndarray:
+    rs, rp, apex, low, z_low = _features(omega, z)
+    # the Warburg element dominates at the lowest frequency, where -Zimag ~ sigma / sqrt(w)
+    sigma = np.maximum(-z_low.imag * np.sqrt(low), 1e-6 * rp)
+    rct = np.maximum(rp - sigma / np.sqrt(low), 1e-3 * rp)
+    return np.hstack([rs, rct, 1 / (apex * rct), sigma])
+
+
+_POSITIVE = (1e-15, 1e15)
+
+CIRCUITS = {
+    # Rs + (Rct || Cdl)
+    "R-RC": Circuit(
+        "R-RC", ("Rs", "Rct", "Cdl"), (_POSITIVE,) * 3, _rc_model, _rc_guess
+    ),
+    # Rs + (Rct || CPE), with CPE impedance 1 / (Q (jw)^n)
+    "R-RQ": Circuit(
+        "R-RQ",
+        ("Rs", "Rct", "Q", "n"),
+        (_POSITIVE,) * 3 + ((1e-3, 1.0),),
+        _rq_model,
+        _rq_guess,
+    ),
+    # Randles cell: Rs + (Cdl || (Rct + W)), with Warburg impedance sigma (1 - j) / sqrt(w)
+    "randles": Circuit(
+        "randles",
+        ("Rs", "Rct", "Cdl", "sigma"),
+        (_POSITIVE,) * 4,
+        _randles_model,
+        _randles_guess,
+    ),
+}
+
+
+def _residuals(
+    circuit: Circuit, theta: np.ndarray, omega: np.ndarray, z: np.ndarray, weight
+) -> np.ndarray:
+    """residuals of the model at log-parameters theta, relative to |Z| (zero at missing points)"""
+    r = (circuit.model(np.exp(theta), omega) - z) * weight
+    return np.concatenate([r.real, r.imag], axis=1)
+
+
+def _levenberg_marquardt(
+    circuit: Circuit,
+    theta: np.ndarray,
+    omega: np.ndarray,
+    z: np.ndarray,
+    weight: np.ndarray,
+    max_iter: int,
+    tol: float,
+    xtol: float,
+) -> tuple:
+    """minimize the residuals of many spectra at once, with one Levenberg-Marquardt step per spectrum and iteration
+
+    Every spectrum keeps its own damping factor, and stops iterating once converged. Normal equations of all
+    active spectra are solved in one batched call.
+
+    Returns:
+        theta (np.ndarray): fitted log-parameters
+        cost (np.ndarray): sum of squared residuals of each spectrum
+        iterations (np.ndarray): iterations run for each spectrum
+        converged (np.ndarray): True where the relative cost reduction, or the reduction of the mean squared
+            residual (chi2) relative to tol**2, fell below `tol`, or the largest parameter step below `xtol`
+    """
+    lower, upper = np.log(np.array(circuit.limits, dtype=float)).T
+    count, size = theta.shape
+    residuals = _residuals(circuit, theta, omega, z, weight)
+    cost = (residuals**2).sum(axis=1)
+    points = np.maximum(2 * (weight != 0).sum(axis=1), 1)
+    damping = np.full(count, 1e-3)
+    iterations = np.zeros(count, dtype=np.int64)
+    converged = np.zeros(count, dtype=bool)
+    active = np.arange(count)
+
+    for _ in range(max_iter):
+        if len(active) == 0:
+            break
+        args = omega[active], z[active], weight[active]
+        th, r = theta[active], residuals[active]
+        jacobian = np.stack(
+            [
+                (_residuals(circuit, th + JACOBIAN_STEP * step, *args) - r)
+                / JACOBIAN_STEP
+                for step in np.eye(size)
+            ],
+            axis=2,
+        )
+        jtj = np.einsum("nmp,nmq->npq", jacobian, jacobian)
+        gradient = np.einsum("nmp,nm->np", jacobian, r)
+        diagonal = np.einsum("npp->np", jtj)
+        system = jtj + np.einsum(
+            "np,pq->npq", damping[active, None] * diagonal + 1e-12, np.eye(size)
+        )
+        delta = np.linalg.solve(system, -gradient[..., None])[..., 0]
+        candidate = np.clip(th + delta, lower, upper)
+        new_residuals = _residuals(circuit, candidate, *args)
+        new_cost = (new_residuals**2).sum(axis=1)
+
+        better = new_cost < cost[active]
+        improved = active[better]
+        decrease = cost[improved] - new_cost[better]
+        reduction = decrease / np.maximum(cost[improved], 1e-300)
+        # changes of chi2 below tol**2 are beyond the precision of the data (e.g. noise-free spectra)
+        stalled = decrease / points[improved] < tol**2
+        theta[improved] = candidate[better]
+        residuals[improved] = new_residuals[better]
+        cost[improved] = new_cost[better]
+        damping[active] = np.clip(
+            np.where(better, damping[active] / 10, damping[active] * 10), 1e-12, 1e12
+        )
+        iterations[active] += 1
+
+        small = np.abs(candidate - th).max(axis=1) < xtol
+        done = small.copy()
+        done[better] |= (reduction < tol) | stalled
+        # no step reduces the cost any further: the fit sits in a minimum
+        done |= ~better & (damping[active] >= 1e12)
+        converged[active[done]] = True
+        active = active[~done]
+
+    return theta, cost, iterations, converged
+
+
+def fit_spectra(
+    freq: np.ndarray,
+    z: np.ndarray,
+    circuit: str = "randles",
+    x0=None,
+    warm_start: bool = True,
+    batch_size: int = BATCH_SIZE,
+    max_iter: int = 200,
+    tol: float = 1e-8,
+    xtol: float = 1e-8,
+) -> pd.DataFrame:
+    """fit an equivalent circuit to many impedance spectra at once
+
+    Residuals are weighted by the modulus of the measured impedance, and parameters are fitted on a log scale
+    (within the limits of the circuit). Spectra are fitted in batches of `batch_size`, in order. Each spectrum
+    starts from the best (lowest cost) of: an estimate from its own data (see Circuit.guess), `x0` if given, and
+    with warm_start, the parameters fitted to the last spectrum of the previous batch. With batch_size=1, every
+    spectrum is warm-started from the previous one.
+
+    Args:
+        freq (np.ndarray): frequencies, in Hz, of shape (spectra, points) or (points,) if shared. Points that are
+            NaN (e.g. padding of shorter spectra) are ignored.
+        z (np.ndarray): complex impedance (Zreal + 1j * Zimag), in ohms, of shape (spectra, points)
+        circuit (str or Circuit, optional): circuit model, one of CIRCUITS. Defaults to "randles".
+        x0 (array-like, optional): initial parameters, for all spectra (parameters,) or per spectrum (spectra,
+            parameters), e.g. the results of a previous fit. Defaults to None.
+        warm_start (bool, optional): also start from the parameters fitted to the previous batch. Defaults to True.
+        batch_size (int, optional): number of spectra fitted together. Defaults to BATCH_SIZE.
+        max_iter (int, optional): maximum number of iterations per spectrum. Defaults to 200.
+        tol (float, optional): relative cost reduction below which a fit is converged (or reduction of chi2, below
+            tol**2). Defaults to 1e-8.
+        xtol (float, optional): parameter step (on the log scale, i.e. relative) below which a fit is converged.
+            Defaults to 1e-8.
+
+    Returns:
+        pandas.DataFrame: one row per spectrum, with the fitted parameters, chi2 (mean squared relative
+            residual), iterations and converged. attrs holds the circuit name, the elapsed time (elapsed_s) and
+            the throughput (spectra_per_s).
+
+    """
+    circuit = CIRCUITS[circuit] if isinstance(circuit, str) else circuit
+    z = np.atleast_2d(np.asarray(z, dtype=np.complex128))
+    freq = np.broadcast_to(np.asarray(freq, dtype=np.float64), z.shape)
+    assert batch_size > 0, "batch_size must be positive"
+    start = time.perf_counter()
+
+    valid = ~(np.isnan(freq) | np.isnan(z))
+    omega = np.where(valid, 2 * np.pi * freq, np.nan)
+    weight = np.where(valid, 1 / np.where(valid, np.abs(z), 1), 0)
+    # missing points are evaluated at a harmless frequency, and ignored through their zero weight
+    omega_model = np.where(valid, omega, 1.0)
+    z_model = np.where(valid, z, 0)
+    if x0 is not None:
+        x0 = np.broadcast_to(
+            np.log(np.asarray(x0, dtype=np.float64)), (len(z), len(circuit.params))
+        )
+
+    count = len(z)
+    theta = np.empty((count, len(circuit.params)))
+    cost = np.empty(count)
+    iterations = np.zeros(count, dtype=np.int64)
+    converged = np.zeros(count, dtype=bool)
+    lower, upper = np.log(np.array(circuit.limits, dtype=float)).T
+    previous = None
+    for first in range(0, count, batch_size):
+        batch = slice(first, min(first + batch_size, count))
+        args = omega_model[batch], z_model[batch], weight[batch]
+        with np.errstate(all="ignore"):
+            guess = np.log(circuit.guess(omega[batch], z[batch]))
+        candidates = [np.nan_to_num(guess, nan=0.0)]
+        if x0 is not None:
+            candidates.append(x0[batch])
+        if warm_start and previous is not None:
+            candidates.append(np.broadcast_to(previous, guess.shape))
+        candidates = [np.clip(c, lower, upper) for c in candidates]
+        costs = np.stack(
+            [(_residuals(circuit, c, *args) ** 2).sum(axis=1) for c in candidates]
+        )
+        costs[np.isnan(costs)] = np.inf
+        best = costs.argmin(axis=0)
+        initial = np.stack(candidates)[best, np.arange(len(best))]
+
+        with np.errstate(all="ignore"):
+            (
+                theta[batch],
+                cost[batch],
+                iterations[batch],
+                converged[batch],
+            ) = _levenberg_marquardt(circuit, initial, *args, max_iter, tol, xtol)
+        previous = theta[batch.stop - 1]
+
+    elapsed = time.perf_counter() - start
+    results = pd.DataFrame(np.exp(theta), columns=list(circuit.params))
+    results["chi2"] = cost / np.maximum(2 * valid.sum(axis=1), 1)
+    results["iterations"] = iterations
+    results["converged"] = converged
+    results.attrs.update(
+        circuit=circuit.name,
+        elapsed_s=elapsed,
+        spectra_per_s=count / elapsed if elapsed > 0 else np.inf,
+    )
+    return results
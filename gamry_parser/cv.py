@@ -1,9 +1,36 @@
 import gamry_parser as parser
+import numpy as np
+import pandas as pd
 
 
 class CyclicVoltammetry(parser.GamryParser):
     """Load a Cyclic Voltammetry experiment generated in Gamry EXPLAIN format."""
 
+    COLUMNS: tuple = ("Vf", "Im")
+    # columns of the table returned by peak_metrics()
+    METRICS: tuple = (
+        "Epa",
+        "Ipa",
+        "Epc",
+        "Ipc",
+        "dEp",
+        "E12",
+        "Ipa_Ipc",
+        "Qa",
+        "Qc",
+        "Q",
+    )
+    # sweep directions accepted by sweep(): anodic (increasing potential) and cathodic (decreasing potential)
+    SWEEP_DIRECTIONS: dict = dict(anodic=1, cathodic=-1)
+    # smallest potential excursion of a sweep measured on Vf, as a fraction of the scan range (see v_range).
+    # Shorter reversals (noise) are merged into the surrounding sweep
+    SWEEP_TOLERANCE: float = 0.05
+
+    def _reset_props(self):
+        "re-initialize parser properties"
+        super()._reset_props()
+        self._sweeps = dict()
+
     @property
     def v_range(self):
         """retrieve the programmed voltage scan ranges
@@ -59,6 +86,258 @@ class CyclicVoltammetry(parser.GamryParser):
         ), "Invalid curve ({}). File contains {} total curves.".format(
             curve, self.curve_count
         )
-        df = self._curves[curve]
+        return self._view(curve)
+
+    def sweep(self, curve: int = 0, sweep: int = 0, direction: str = None):
+        """retrieve a single sweep (half-cycle) of a curve: the rows between two turning points of the potential
+
+        Sweeps are found from sign changes of the applied potential (Sig, or Vf if Sig was not loaded). The
+        index is computed once per curve and cached, so each call is a constant-time lookup. The returned slice
+        shares memory with the curve under copy-on-write (see GamryParser._view), and the turning point is included
+        in both adjacent sweeps.
+
+        Args:
+            curve (int, optional): curve number. Defaults to 0.
+            sweep (int, optional): sweep number within the curve, counting only sweeps in `direction` if given.
+                Negative values count from the last sweep. Defaults to 0.
+            direction (str, optional): "anodic" (increasing potential) or "cathodic" (decreasing potential).
+                Defaults to None (any direction).
+
+        Returns:
+            pandas.DataFrame: rows of curve(curve) belonging to the sweep
+
+        """
+        sweeps = self._sweep_index(curve, direction)
+        assert (
+            -len(sweeps) <= sweep < len(sweeps)
+        ), "Invalid sweep ({}). Curve {} contains {} {}sweeps.".format(
+            sweep, curve, len(sweeps), "" if direction is None else direction + " "
+        )
+        start, stop, _ = sweeps[sweep]
+        return self.curve(curve).iloc[start:stop]
+
+    def sweep_count(self, curve: int = 0, direction: str = None) -> int:
+        """return the number of sweeps in a curve (optionally only those in `direction`, see sweep())"""
+        return len(self._sweep_index(curve, direction))
+
+    @property
+    def sweeps(self) -> pd.DataFrame:
+        """return the sweep index of every curve
+
+        Returns:
+            pandas.DataFrame: one row per sweep, with columns Curve, Sweep, Direction (1: anodic, -1: cathodic),
+                Start and Stop (row positions in the curve, Stop excluded)
+
+        """
+        assert self.loaded, "DTA file not loaded. Run CyclicVoltammetry.load()"
+        index = [self._sweep_index(curve) for curve in range(self.curve_count)]
+        counts = [len(sweeps) for sweeps in index]
+        index = np.concatenate(index) if index else np.empty((0, 3), dtype=np.int64)
+        return pd.DataFrame(
+            dict(
+                Curve=np.repeat(np.arange(self.curve_count), counts),
+                Sweep=np.concatenate([np.arange(count) for count in counts] + [[]]),
+                Direction=index[:, 2],
+                Start=index[:, 0],
+                Stop=index[:, 1],
+            )
+        ).astype(np.int64)
+
+    def _sweep_index(self, curve: int, direction: str = None) -> np.ndarray:
+        """helper function to retrieve (computing it on first use) the sweep index of a curve
+
+        Args:
+            curve (int): curve index (negative values count from the last curve)
+            direction (str, optional): only keep sweeps in this direction (see SWEEP_DIRECTIONS). Defaults to None.
+        Returns:
+            np.ndarray: one row per sweep: start, stop (row positions, stop excluded) and direction
+
+        """
+        assert self.loaded, "DTA file not loaded. Run CyclicVoltammetry.load()"
+        assert (
+            direction is None or direction in self.SWEEP_DIRECTIONS
+        ), "Unknown sweep direction '{}'. Expected one of {}".format(
+            direction, list(self.SWEEP_DIRECTIONS)
+        )
+        assert (
+            -self.curve_count <= curve < self.curve_count
+        ), "Invalid curve ({}). File contains {} total curves.".format(
+            curve, self.curve_count
+        )
+        curve = curve + self.curve_count if curve < 0 else curve
+        sweeps = self._sweeps.get(curve, None)
+        if sweeps is None:
+            df = self._curve(curve)
+            if "Sig" in df.columns:
+                # the applied signal is noise-free: every reversal is a turning point
+                sweeps = self._segment(df["Sig"].to_numpy(np.float64), 0.0)
+            else:
+                potential = df["Vf"].to_numpy(np.float64)
+                limits = [v for v in self._header_limits() if v is not None]
+                if len(limits) < 2 and len(potential):
+                    limits = [potential.min(), potential.max()]
+                span = abs(limits[1] - limits[0]) if len(limits) == 2 else 0.0
+                sweeps = self._segment(potential, self.SWEEP_TOLERANCE * span)
+            self._sweeps[curve] = sweeps
 
-        return df[["Vf", "Im"]]
+        if direction is not None:
+            sweeps = sweeps[sweeps[:, 2] == self.SWEEP_DIRECTIONS[direction]]
+        return sweeps
+
+    def _header_limits(self) -> tuple:
+        """helper function to return VLIMIT1 and VLIMIT2 (None if missing), without the checks of v_range"""
+        return self._header.get("VLIMIT1", None), self._header.get("VLIMIT2", None)
+
+    @staticmethod
+    def _segment(potential: np.ndarray, tolerance: float) -> np.ndarray:
+        """helper function to split a potential trace into sweeps of constant direction
+
+        Args:
+            potential (np.ndarray): potential of each sample
+            tolerance (float): smallest potential excursion of a sweep. Shorter reversals are merged into the
+                surrounding sweep.
+        Returns:
+            np.ndarray: one row per sweep: start, stop (row positions, stop excluded) and direction
+
+        """
+        size = len(potential)
+        steps = np.sign(np.diff(potential))
+
+        def fill(steps: np.ndarray) -> np.ndarray:
+            # steps without a direction (flat, or merged) take the direction of the previous step
+            last = np.maximum.accumulate(np.where(steps != 0, np.arange(len(steps)), 0))
+            steps = steps[last]
+            nonzero = np.flatnonzero(steps)
+            if len(nonzero) == 0:
+                return steps
+            steps[: nonzero[0]] = steps[nonzero[0]]
+            return steps
+
+        def runs(steps: np.ndarray) -> tuple:
+            starts = np.concatenate(([0], np.flatnonzero(steps[1:] != steps[:-1]) + 1))
+            stops = np.append(starts[1:], len(steps))
+            return starts, stops
+
+        steps = fill(steps)
+        if tolerance > 0 and len(steps):
+            starts, stops = runs(steps)
+            excursion = np.abs(potential[stops] - potential[starts])
+            short = np.repeat(excursion < tolerance, stops - starts)
+            if short.all():
+                # no reversal exceeds the tolerance: a single sweep, in the overall direction
+                steps[:] = np.sign(potential[-1] - potential[0])
+            else:
+                steps[short] = 0
+                steps = fill(steps)
+        if len(steps) == 0 or steps[0] == 0:
+            return np.array([[0, size, 0]], dtype=np.int64)
+
+        # step i joins samples i and i + 1, so a sweep of steps [start, stop) spans samples [start, stop]
+        starts, stops = runs(steps)
+        directions = steps[starts]
+        vertices = stops[:-1].copy()
+        if tolerance > 0:
+            # merged reversals shift turning points: move each to the potential extremum between its neighbours
+            previous = 0
+            for i, (start, stop) in enumerate(zip(starts[:-1], stops[1:])):
+                start = max(start, previous)
+                region = potential[start : stop + 1]
+                vertices[i] = start + (
+                    region.argmax() if directions[i] > 0 else region.argmin()
+                )
+                previous = vertices[i]
+        return np.column_stack(
+            (
+                np.concatenate(([0], vertices)),
+                np.append(vertices + 1, size),
+                directions,
+            )
+        ).astype(np.int64)
+
+    def peak_metrics(self, window: tuple = None) -> pd.DataFrame:
+        """compute peak and charge metrics of every curve (cycle) at once
+
+        Curves are stacked into 2D arrays (one row per curve, padded with NaN), and each metric is computed with a
+        single vectorized pass over all curves. Peak currents are the extreme values of Im, without baseline
+        correction. Charges are integrated over the sample times (T), or over the potential sweep at the
+        programmed scan rate if T was not loaded (e.g. columns="default").
+
+        Args:
+            window (tuple, optional): (min, max) potential range searched for peaks, in V. Charges are always
+                integrated over the whole curve. Defaults to None (the whole curve).
+
+        Returns:
+            pandas.DataFrame: one row per curve, indexed by curve index:
+                - Epa: anodic peak potential, in V
+                - Ipa: anodic peak current, in A
+                - Epc: cathodic peak potential, in V
+                - Ipc: cathodic peak current, in A
+                - dEp: peak separation (Epa - Epc), in V
+                - E12: half-wave potential ((Epa + Epc) / 2), in V
+                - Ipa_Ipc: peak current ratio (|Ipa / Ipc|)
+                - Qa: anodic charge (integral of positive currents), in C
+                - Qc: cathodic charge (integral of negative currents), in C
+                - Q: net charge, in C
+
+        """
+        assert self.loaded, "DTA file not loaded. Run CyclicVoltammetry.load()"
+        index = pd.RangeIndex(self.curve_count, name="Curve")
+        if self.curve_count == 0:
+            return pd.DataFrame(columns=list(self.METRICS), index=index, dtype=float)
+
+        curves = self.curves
+        vf = self._stack(curves, "Vf")
+        im = self._stack(curves, "Im")
+        rows = np.arange(len(curves))
+
+        valid = ~np.isnan(im)
+        if window is not None:
+            assert len(window) == 2, "window must be a (min, max) potential range"
+            valid &= (vf >= min(window)) & (vf <= max(window))
+        found = valid.any(axis=1)
+
+        anodic = np.where(valid, im, -np.inf).argmax(axis=1)
+        cathodic = np.where(valid, im, np.inf).argmin(axis=1)
+        epa = np.where(found, vf[rows, anodic], np.nan)
+        ipa = np.where(found, im[rows, anodic], np.nan)
+        epc = np.where(found, vf[rows, cathodic], np.nan)
+        ipc = np.where(found, im[rows, cathodic], np.nan)
+
+        # trapezoidal integration; padded samples give NaN steps, which are ignored
+        current = (im[:, 1:] + im[:, :-1]) / 2
+        dt = self._time_steps(curves, vf)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.abs(ipa / ipc)
+        metrics = dict(
+            Epa=epa,
+            Ipa=ipa,
+            Epc=epc,
+            Ipc=ipc,
+            dEp=epa - epc,
+            E12=(epa + epc) / 2,
+            Ipa_Ipc=ratio,
+            Qa=np.nansum(np.clip(current, 0, None) * dt, axis=1),
+            Qc=np.nansum(np.clip(current, None, 0) * dt, axis=1),
+            Q=np.nansum(current * dt, axis=1),
+        )
+        if np.isnan(dt).all():
+            for key in ("Qa", "Qc", "Q"):
+                metrics[key] = np.full(len(curves), np.nan)
+        return pd.DataFrame(metrics, index=index)
+
+    def _time_steps(self, curves: list, vf: np.ndarray) -> np.ndarray:
+        """helper function to return the time between consecutive samples of stacked curves, in s
+
+        Args:
+            curves (list): curves, as returned by GamryParser.curves
+            vf (np.ndarray): stacked potentials (see _stack)
+        Returns:
+            np.ndarray: time steps, one column less than `vf` (NaN where unknown)
+
+        """
+        if all("T" in curve.columns or curve.index.name == "T" for curve in curves):
+            return np.diff(self._stack(curves, "T"), axis=1)
+        if self.scan_rate:
+            # linear sweep at the programmed scan rate (mV/s)
+            return np.abs(np.diff(vf, axis=1)) / (self.scan_rate / 1000)
+        return np.full((vf.shape[0], max(vf.shape[1] - 1, 0)), np.nan)
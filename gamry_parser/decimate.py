@@ -0,0 +1,475 @@
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+
+# decimation methods of Decimation.decimate()
+METHODS = ("bucket", "lttb", "resample")
+# default number of output points of Decimation.decimate()
+DECIMATE_POINTS = 2000
+# buckets per output point used to preselect LTTB candidates, when decimating a curve chunk by chunk
+LTTB_CANDIDATES = 4
+
+# per-bucket aggregates: bucket keys (bucket start = origin + key * width), sample count, sum, min and max of each
+# column, and the samples ([T, columns...]) holding the min and max of the tracked column (or None)
+Buckets = namedtuple(
+    "Buckets", ["keys", "count", "total", "low", "high", "lo_rows", "hi_rows"]
+)
+
+
+def _first_match(
+    values: np.ndarray, target: np.ndarray, starts: np.ndarray
+) -> np.ndarray:
+    """index of the first element of each segment (starting at `starts`) equal to the segment `target`"""
+    seglen = np.diff(np.append(starts, len(values)))
+    expected = np.repeat(target, seglen)
+    match = np.flatnonzero((values == expected) | np.isnan(expected))
+    segment = np.repeat(np.arange(len(starts)), seglen)[match]
+    return match[np.r_[True, segment[1:] != segment[:-1]]]
+
+
+def reduce_buckets(buckets: Buckets, track: int = None) -> Buckets:
+    """merge the entries of `buckets` that share a key (keys must be sorted)
+
+    Args:
+        buckets (Buckets): per-sample or per-bucket aggregates
+        track (int, optional): column whose min and max samples are kept (lo_rows, hi_rows). Defaults to None.
+    Returns:
+        Buckets: one entry per key
+
+    """
+    keys = buckets.keys
+    if len(keys) == 0:
+        return buckets
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    low = np.fmin.reduceat(buckets.low, starts, axis=0)
+    high = np.fmax.reduceat(buckets.high, starts, axis=0)
+    lo_rows = hi_rows = None
+    if track is not None:
+        lo_rows = buckets.lo_rows[
+            _first_match(buckets.low[:, track], low[:, track], starts)
+        ]
+        hi_rows = buckets.hi_rows[
+            _first_match(buckets.high[:, track], high[:, track], starts)
+        ]
+    return Buckets(
+        keys[starts],
+        np.add.reduceat(buckets.count, starts),
+        np.add.reduceat(buckets.total, starts, axis=0),
+        low,
+        high,
+        lo_rows,
+        hi_rows,
+    )
+
+
+def aggregate(
+    t: np.ndarray, values: np.ndarray, keys: np.ndarray, track: int = None
+) -> Buckets:
+    """aggregate samples into buckets, in a single vectorized pass
+
+    Args:
+        t (np.ndarray): sample times, in seconds (sorted)
+        values (np.ndarray): sample values (samples x columns)
+        keys (np.ndarray): bucket of each sample (sorted)
+        track (int, optional): column whose min and max samples are kept (see reduce_buckets()). Defaults to None.
+    Returns:
+        Buckets: one entry per non-empty bucket
+
+    """
+    rows = np.column_stack([t, values]) if track is not None else None
+    return reduce_buckets(
+        Buckets(
+            keys, np.ones(len(t), dtype=np.int64), values, values, values, rows, rows
+        ),
+        track=track,
+    )
+
+
+def lttb(x: np.ndarray, y: np.ndarray, points: int) -> np.ndarray:
+    """select the samples of a series that preserve its visual shape (Largest-Triangle-Three-Buckets)
+
+    The first and last samples are always kept. The remaining samples are split into points - 2 buckets of equal
+    sample count, and the sample of each bucket forming the largest triangle with the sample kept in the previous
+    bucket and the mean of the next bucket is selected.
+
+    Args:
+        x (np.ndarray): sample times (sorted)
+        y (np.ndarray): sample values
+        points (int): number of samples to keep
+    Returns:
+        np.ndarray: indices of the selected samples
+
+    """
+    count = len(x)
+    if points >= count:
+        return np.arange(count)
+    if points < 3:
+        return np.array([0, count - 1][:points], dtype=np.int64)
+
+    # bucket i spans samples bounds[i]:bounds[i + 1]; the final "bucket" is the last sample
+    bounds = np.append(np.linspace(1, count - 1, points - 1).astype(np.int64), count)
+    cx = np.concatenate([[0.0], np.cumsum(x)])
+    cy = np.concatenate([[0.0], np.cumsum(y)])
+    size = np.diff(bounds)
+    mean_x = (cx[bounds[1:]] - cx[bounds[:-1]]) / size
+    mean_y = (cy[bounds[1:]] - cy[bounds[:-1]]) / size
+
+    selected = np.empty(points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = count - 1
+    a = 0
+    for i in range(points - 2):
+        start, end = bounds[i], bounds[i + 1]
+        area = np.abs(
+            (x[a] - mean_x[i + 1]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (mean_y[i + 1] - y[a])
+        )
+        a = start + int(np.nanargmax(area)) if not np.isnan(area).all() else start
+        selected[i + 1] = a
+    return selected
+
+
+class Decimator:
+    """Streaming time-bucket aggregation of a series, fed chunk by chunk (see Decimation.decimate()).
+
+    Samples are aggregated (count, sum, min and max of each column) into buckets of `width` seconds, starting at
+    `origin`. When `points` is set, the bucket width is doubled whenever the samples seen so far span more than
+    `points` buckets, so that memory stays bounded for series of unknown length.
+    """
+
+    def __init__(
+        self,
+        width: float = None,
+        points: int = None,
+        origin: float = None,
+        track: int = None,
+    ):
+        """Decimator.__init__
+
+        Args:
+            width (float, optional): initial bucket width, in seconds. Defaults to None (the span of the first
+                chunk divided by `points`).
+            points (int, optional): maximum number of buckets. Defaults to None (no limit, `width` is required).
+            origin (float, optional): start of the first bucket, in seconds. Defaults to None (the first sample).
+            track (int, optional): column whose min and max samples are kept (see candidates()). Defaults to None.
+
+        Returns:
+            None
+
+        """
+        assert (
+            width is not None or points is not None
+        ), "Decimator requires a bucket width or a number of points"
+        self.width = width
+        self.points = points
+        self.origin = origin
+        self.track = track
+        self.buckets = None
+        self.first = None
+        self.last = None
+
+    def update(self, t: np.ndarray, values: np.ndarray):
+        """aggregate a chunk of samples
+
+        Args:
+            t (np.ndarray): sample times, in seconds (sorted, and later than the samples of previous chunks)
+            values (np.ndarray): sample values (samples x columns)
+        Returns:
+            None
+
+        """
+        if len(t) == 0:
+            return
+        if self.origin is None:
+            self.origin = t[0]
+        if self.width is None:
+            self.width = (t[-1] - self.origin) / self.points or 1.0
+        if self.track is not None:
+            if self.first is None:
+                self.first = np.r_[t[0], values[0]]
+            self.last = np.r_[t[-1], values[-1]]
+
+        chunk = aggregate(t, values, self._keys(t, self.width), track=self.track)
+        if self.buckets is not None:
+            chunk = reduce_buckets(
+                Buckets(
+                    *[
+                        None if a is None else np.concatenate([a, b])
+                        for a, b in zip(self.buckets, chunk)
+                    ]
+                ),
+                track=self.track,
+            )
+        while self.points is not None and chunk.keys[-1] - chunk.keys[0] >= self.points:
+            self.width *= 2
+            chunk = reduce_buckets(
+                chunk._replace(keys=chunk.keys // 2), track=self.track
+            )
+        self.buckets = chunk
+
+    def _keys(self, t: np.ndarray, width: float) -> np.ndarray:
+        return np.floor((t - self.origin) / width).astype(np.int64)
+
+    def candidates(self) -> np.ndarray:
+        """samples holding the min and max of the tracked column in each bucket, and the first and last samples
+
+        Returns:
+            np.ndarray: samples ([T, columns...]), sorted by time
+
+        """
+        assert self.track is not None, "Decimator was not created with a tracked column"
+        rows = np.concatenate(
+            [[self.first], self.buckets.lo_rows, self.buckets.hi_rows, [self.last]]
+        )
+        _, unique = np.unique(rows[:, 0], return_index=True)
+        return rows[unique]
+
+
+def bucket_frame(
+    buckets: Buckets, origin: float, width: float, columns: list, fill: bool = False
+) -> pd.DataFrame:
+    """table of bucket aggregates
+
+    Args:
+        buckets (Buckets): bucket aggregates
+        origin (float): start of bucket 0, in seconds
+        width (float): bucket width, in seconds
+        columns (list): names of the aggregated columns
+        fill (bool, optional): return the mean of each column, for every bucket between the first and the last
+            (empty buckets as NaN). Defaults to False (count, mean, min and max of each column, for non-empty buckets)
+    Returns:
+        pandas.DataFrame: T (bucket start, in seconds) and aggregates
+
+    """
+    keys, count = buckets.keys, buckets.count
+    mean = buckets.total / count[:, np.newaxis]
+    if fill:
+        grid = np.arange(keys[0], keys[-1] + 1) if len(keys) else keys
+        filled = np.full((len(grid), len(columns)), np.nan)
+        filled[keys - grid[:1]] = mean
+        return pd.DataFrame(
+            dict(T=origin + grid * width, **dict(zip(columns, filled.T)))
+        )
+
+    data = dict(T=origin + keys * width, count=count)
+    for i, key in enumerate(columns):
+        data["{}_mean".format(key)] = mean[:, i]
+        data["{}_min".format(key)] = buckets.low[:, i]
+        data["{}_max".format(key)] = buckets.high[:, i]
+    return pd.DataFrame(data)
+
+
+class Decimation:
+    """Decimation of curves sampled over time (column T), for plotting and storage of long experiments.
+
+    Mixed into the parsers of ChronoAmperometry and OpenCircuitPotential experiments, ahead of GamryParser.
+    Decimated tables are kept until the next load(), and stored in the parse cache (see GamryParser `cache`), so
+    that a view of a long experiment is computed once.
+    """
+
+    def _reset_props(self):
+        "re-initialize parser properties"
+
+        super()._reset_props()
+        self._decimated = dict()
+
+    def decimate(
+        self,
+        points: int = DECIMATE_POINTS,
+        method: str = "bucket",
+        period: float = None,
+        curve: int = 0,
+        column: str = None,
+        chunksize: int = None,
+    ) -> pd.DataFrame:
+        """reduce a curve to at most `points` samples or buckets
+
+        Methods:
+            bucket: split the curve into `points` time buckets of equal width (or of `period` seconds), and return
+                the sample count and the mean, min and max of each column per non-empty bucket
+            lttb: select the samples that preserve the visual shape of `column` (Largest-Triangle-Three-Buckets)
+            resample: fixed-rate resampling, to the mean of each column over every `period` seconds. The period
+                defaults to the smallest multiple of the sample period (SAMPLETIME) that yields at most `points`
+                samples. Empty periods are returned as NaN.
+
+        Args:
+            points (int, optional): maximum number of output rows. Defaults to 2000.
+            method (str, optional): "bucket", "lttb" or "resample". Defaults to "bucket".
+            period (float, optional): bucket width or resampling period, in seconds. Defaults to None.
+            curve (int, optional): curve to decimate. Defaults to 0.
+            column (str, optional): column used to select samples (lttb). Defaults to None (the last column).
+            chunksize (int, optional): decimate the curve in a streaming pass over chunks of rows (see iter_chunks()),
+                without holding it in memory (lazy=True). Bucket widths (without `period`) are then powers of 2
+                times an initial width, and lttb selects from the min and max samples of 4 * points buckets.
+                Defaults to None (single vectorized pass over the curve).
+
+        Returns:
+            pandas.DataFrame: T (sample or bucket start time, in seconds or Timestamp) and decimated columns
+
+        """
+        assert self.loaded, "DTA file not loaded. Run {}.load()".format(
+            type(self).__name__
+        )
+        assert method in METHODS, "Unknown decimation method '{}'".format(method)
+        assert points > 0, "points must be positive"
+        curve = curve + self.curve_count if curve < 0 else curve
+        options = dict(
+            points=points,
+            method=method,
+            period=period,
+            curve=curve,
+            column=column,
+            chunksize=chunksize,
+        )
+        key = tuple(options.values())
+        if key in self._decimated:
+            return self._decimated[key]
+
+        table = None
+        cache_options = dict(self._cache_options, decimate=options)
+        if self.cache is not None:
+            data = self.cache.get(self.fname, cache_options)
+            table = None if data is None else data["curves"][0]
+        if table is None:
+            with self._phase("decimate"):
+                table = self._decimate(**options)
+            if self.cache is not None:
+                self.cache.put(
+                    self.fname,
+                    dict(
+                        header=self._header,
+                        header_length=self.header_length,
+                        curve_units=self._curve_units,
+                        curves=[table],
+                        ocv=None,
+                    ),
+                    cache_options,
+                )
+
+        if self.to_timestamp:
+            table = self._to_timestamp(table)
+        self._decimated[key] = table
+        return table
+
+    def _decimate(
+        self,
+        points: int,
+        method: str,
+        period: float,
+        curve: int,
+        column: str,
+        chunksize: int,
+    ) -> pd.DataFrame:
+        """helper function to decimate a curve, with sample times in seconds (see decimate())"""
+        if method == "resample" and period is None:
+            sample_time = self._header.get("SAMPLETIME", None)
+            assert (
+                sample_time
+            ), "resample requires a period, or SAMPLETIME in the header"
+
+        if chunksize is None:
+            t, values, columns = self._samples(self._view(curve))
+            span = t[-1] - t[0] if len(t) else 0.0
+            if method == "lttb":
+                track = self._track(columns, column)
+                selected = lttb(t, values[:, track], points)
+                return self._sample_frame(t[selected], values[selected], columns)
+
+            origin = 0.0 if method == "resample" else (t[0] if len(t) else 0.0)
+            width = period
+            if width is None and method == "resample":
+                # smallest multiple of the sample period with at most `points` periods between the first and last sample
+                factor = np.floor(span / (sample_time * points)) + 1
+                while len(t) and (
+                    np.floor(t[-1] / (sample_time * factor))
+                    - np.floor(t[0] / (sample_time * factor))
+                    >= points
+                ):
+                    factor += 1
+                width = sample_time * factor
+            elif width is None:
+                width = span / points or 1.0
+            keys = np.floor((t - origin) / width).astype(np.int64)
+            if method == "bucket" and period is None:
+                # the last sample closes the last bucket
+                keys = np.minimum(keys, points - 1)
+            buckets = aggregate(t, values, keys)
+            return bucket_frame(
+                buckets, origin, width, columns, fill=method == "resample"
+            )
+
+        decimator = None
+        columns = None
+        for chunk in self.iter_chunks(curve, chunksize=chunksize):
+            t, values, columns = self._samples(chunk)
+            if decimator is None:
+                decimator = self._decimator(
+                    points, method, period, self._track(columns, column)
+                )
+            decimator.update(t, values)
+        if decimator is None:
+            return self._decimate(points, method, period, curve, column, None)
+        if method == "lttb":
+            rows = decimator.candidates()
+            selected = lttb(rows[:, 0], rows[:, 1 + decimator.track], points)
+            return self._sample_frame(rows[selected, 0], rows[selected, 1:], columns)
+        return bucket_frame(
+            decimator.buckets,
+            decimator.origin,
+            decimator.width,
+            columns,
+            fill=method == "resample",
+        )
+
+    def _decimator(
+        self, points: int, method: str, period: float, track: int
+    ) -> Decimator:
+        """helper function to create the Decimator of a streaming decimate()"""
+        if method == "lttb":
+            return Decimator(points=LTTB_CANDIDATES * points, track=track)
+        if method == "resample":
+            if period is not None:
+                return Decimator(width=period, origin=0.0)
+            return Decimator(
+                width=self._header["SAMPLETIME"], points=points, origin=0.0
+            )
+        return Decimator(width=period, points=None if period else points)
+
+    def _samples(self, df: pd.DataFrame) -> tuple:
+        """helper function to retrieve sample times (in seconds) and numeric columns of a curve or chunk
+
+        Args:
+            df (DataFrame): curve data, with T as a column or index (time_index)
+        Returns:
+            tuple: times (np.ndarray), values (np.ndarray, samples x columns), column names (list)
+
+        """
+        if "T" in df.columns:
+            t = df["T"]
+        else:
+            assert df.index.name == "T", "Curve has no sample times (T)"
+            t = df.index.to_series()
+        if t.dtype.kind == "M":
+            t = (pd.DatetimeIndex(t) - self.start_time).total_seconds()
+        columns = [
+            key
+            for key in df.columns
+            if key not in ("T", "Pt") and df[key].dtype.kind in "biuf"
+        ]
+        return (
+            np.asarray(t, dtype=float),
+            df[columns].to_numpy(dtype=float),
+            columns,
+        )
+
+    @staticmethod
+    def _track(columns: list, column: str) -> int:
+        """helper function to locate the column used to select samples (lttb)"""
+        if column is None:
+            return len(columns) - 1
+        assert column in columns, "Unknown column '{}'".format(column)
+        return columns.index(column)
+
+    @staticmethod
+    def _sample_frame(t: np.ndarray, values: np.ndarray, columns: list) -> pd.DataFrame:
+        return pd.DataFrame(dict(T=t, **dict(zip(columns, values.T))))
@@ -1,9 +1,14 @@
 import gamry_parser as parser
+import numpy as np
+import pandas as pd
+from gamry_parser.circuits import BATCH_SIZE, fit_spectra
 
 
 class Impedance(parser.GamryParser):
     """Load a Potentiostatic EIS experiment generated in Gamry EXPLAIN format."""
 
+    COLUMNS: tuple = ("Freq", "Zreal", "Zimag", "Zmod", "Zphz")
+
     def curve(self, curve: int = 0):
         """retrieve potentiostatic eis-relevant data
 
@@ -16,10 +21,184 @@ class Impedance(parser.GamryParser):
                 - Zreal (float): Real Impedance, in ohms
                 - Zimag (float): Imaginary Impedance, in ohms
                 - Zmod (float): Impedance magnitude, in ohms
-                - Zmod (float): Impedance phase angle, in degrees
+                - Zphz (float): Impedance phase angle, in degrees
+
+        """
+
+        assert self.loaded, "DTA file not loaded. Run Impedance.load()"
+        return self._view(curve)
+
+    def impedance(self, curve: int = 0) -> np.ndarray:
+        """retrieve the complex impedance of a curve
+
+        Args:
+            curve (int, optional): curve number. Defaults to 0.
+
+        Returns:
+            np.ndarray: Zreal + 1j * Zimag, in ohms
+
+        """
+        assert self.loaded, "DTA file not loaded. Run Impedance.load()"
+        df = self._curve(curve)
+        return df["Zreal"].to_numpy(np.float64) + 1j * df["Zimag"].to_numpy(np.float64)
+
+    def derived(self) -> pd.DataFrame:
+        """compute admittance and capacitance of every curve, in one vectorized pass
+
+        Returns:
+            pandas.DataFrame: all curves in long format (see curves_long), with columns:
+                - Curve (int): curve index
+                - Freq (float): frequency, in Hz
+                - Zreal, Zimag (float): impedance, in ohms
+                - Zmod (float): impedance magnitude, in ohms
+                - Zphz (float): impedance phase angle, in degrees
+                - Yreal, Yimag (float): admittance (1 / Z), in S
+                - Ymod (float): admittance magnitude, in S
+                - Cs (float): series capacitance (-1 / (w Zimag)), in F
+                - Creal, Cimag (float): complex capacitance (1 / (j w Z)), in F
 
         """
+        assert self.loaded, "DTA file not loaded. Run Impedance.load()"
+        curves = self.curves
+        lengths = [len(curve) for curve in curves]
+        freq = self._concat_column(curves, "Freq")
+        z = self._concat_column(curves, "Zreal") + 1j * self._concat_column(
+            curves, "Zimag"
+        )
+        omega = 2 * np.pi * freq
+        with np.errstate(divide="ignore", invalid="ignore"):
+            y = 1 / z
+            capacitance = y / (1j * omega)
+            series = -1 / (omega * z.imag)
+        df = pd.DataFrame(
+            dict(
+                Curve=np.repeat(np.arange(len(curves)), lengths),
+                Freq=freq,
+                Zreal=z.real,
+                Zimag=z.imag,
+                Zmod=np.abs(z),
+                Zphz=np.degrees(np.angle(z)),
+                Yreal=y.real,
+                Yimag=y.imag,
+                Ymod=np.abs(y),
+                Cs=series,
+                Creal=capacitance.real,
+                Cimag=capacitance.imag,
+            ),
+            index=(
+                pd.Index(
+                    np.concatenate([curve.index.to_numpy() for curve in curves]),
+                    name=curves[0].index.name,
+                )
+                if len(curves)
+                else None
+            ),
+        )
+        return df
+
+    def features(self) -> pd.DataFrame:
+        """extract Bode and Nyquist features of every curve, in one vectorized pass
 
+        Returns:
+            pandas.DataFrame: one row per curve, indexed by curve index:
+                - points (int): number of frequencies
+                - f_min, f_max (float): frequency range, in Hz
+                - R_hf (float): Zreal at the highest frequency (series resistance), in ohms
+                - R_lf (float): Zreal at the lowest frequency, in ohms
+                - dR (float): R_lf - R_hf (polarization resistance), in ohms
+                - Zmod_lf, Zmod_hf (float): impedance magnitude at the lowest and highest frequency, in ohms
+                - phase_min (float): most negative phase angle, in degrees
+                - f_phase_min (float): frequency of phase_min, in Hz
+                - Zimag_apex (float): maximum of -Zimag (top of the Nyquist arc), in ohms
+                - f_apex (float): frequency of Zimag_apex, in Hz
+                - C_apex (float): capacitance of the Nyquist arc (1 / (2 pi f_apex dR)), in F
+
+        """
         assert self.loaded, "DTA file not loaded. Run Impedance.load()"
-        df = self._curves[curve]
-        return df[["Freq", "Zreal", "Zimag", "Zmod", "Zphz"]]
+        curves = self.curves
+        index = pd.RangeIndex(len(curves), name="Curve")
+        if len(curves) == 0:
+            return pd.DataFrame(index=index)
+
+        freq = self._stack(curves, "Freq")
+        z = self._stack(curves, "Zreal") + 1j * self._stack(curves, "Zimag")
+        valid = ~(np.isnan(freq) | np.isnan(z))
+        rows = np.arange(len(curves))
+        high = np.where(valid, freq, -np.inf).argmax(axis=1)
+        low = np.where(valid, freq, np.inf).argmin(axis=1)
+        phase = np.degrees(np.angle(z))
+        phase_min = np.where(valid, phase, np.inf).argmin(axis=1)
+        apex = np.where(valid, -z.imag, -np.inf).argmax(axis=1)
+
+        features = pd.DataFrame(
+            dict(
+                points=valid.sum(axis=1),
+                f_min=freq[rows, low],
+                f_max=freq[rows, high],
+                R_hf=z.real[rows, high],
+                R_lf=z.real[rows, low],
+                dR=z.real[rows, low] - z.real[rows, high],
+                Zmod_lf=np.abs(z[rows, low]),
+                Zmod_hf=np.abs(z[rows, high]),
+                phase_min=phase[rows, phase_min],
+                f_phase_min=freq[rows, phase_min],
+                Zimag_apex=-z.imag[rows, apex],
+                f_apex=freq[rows, apex],
+            ),
+            index=index,
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            features["C_apex"] = 1 / (2 * np.pi * features["f_apex"] * features["dR"])
+        return features
+
+    def fit(
+        self,
+        circuit: str = "randles",
+        x0=None,
+        warm_start: bool = True,
+        batch_size: int = BATCH_SIZE,
+        **kwargs
+    ) -> pd.DataFrame:
+        """fit an equivalent circuit to every curve (spectrum) at once
+
+        Spectra are stacked and fitted together with a batched Levenberg-Marquardt solver, each starting from an
+        estimate of its own data or (warm_start) from the parameters of the previous batch. See
+        gamry_parser.circuits.fit_spectra().
+
+        Args:
+            circuit (str, optional): equivalent circuit, one of gamry_parser.circuits.CIRCUITS: "R-RC",
+                "R-RQ" or "randles". Defaults to "randles".
+            x0 (array-like, optional): initial parameters, e.g. the results of a previous file. Defaults to None.
+            warm_start (bool, optional): start from the parameters fitted to the previous batch of spectra.
+                Defaults to True.
+            batch_size (int, optional): number of spectra fitted together. Defaults to
+                gamry_parser.circuits.BATCH_SIZE.
+            **kwargs: additional options passed to fit_spectra() (max_iter, tol, xtol)
+
+        Returns:
+            pandas.DataFrame: one row per curve, indexed by curve index, with the fitted parameters, chi2,
+                iterations and converged. attrs holds the circuit name, elapsed_s and spectra_per_s.
+
+        """
+        assert self.loaded, "DTA file not loaded. Run Impedance.load()"
+        curves = self.curves
+        freq = self._stack(curves, "Freq")
+        z = self._stack(curves, "Zreal") + 1j * self._stack(curves, "Zimag")
+        results = fit_spectra(
+            freq,
+            z,
+            circuit=circuit,
+            x0=x0,
+            warm_start=warm_start,
+            batch_size=batch_size,
+            **kwargs
+        )
+        results.index = pd.RangeIndex(len(curves), name="Curve")
+        return results
+
+    @staticmethod
+    def _concat_column(curves: list, key: str) -> np.ndarray:
+        """helper function to join a column of every curve into a single float64 array"""
+        if len(curves) == 0:
+            return np.empty(0)
+        return np.concatenate([curve[key].to_numpy(np.float64) for curve in curves])
@@ -0,0 +1,208 @@
+import json
+import numpy as np
+import os
+from .gamryparser import GamryParser
+from .batch import EXPERIMENT_CLASSES
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency: pip install gamry_parser[arrow]
+    pa = None
+    pq = None
+
+# version of the metadata layout written by to_arrow()
+EXPORT_FORMAT = 1
+# schema metadata key holding the experiment header, units and curve layout
+METADATA_KEY = b"gamry_parser"
+# schema metadata key holding the OCV curve, as an Arrow IPC stream
+OCV_KEY = b"gamry_parser.ocv"
+# file formats of write_experiment(), by file extension
+FORMATS = {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+
+PARSER_CLASSES = {
+    cls.__name__: cls for cls in [GamryParser] + list(EXPERIMENT_CLASSES.values())
+}
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError(
+            "pyarrow is required to export experiments: pip install gamry_parser[arrow]"
+        )
+
+
+def _serialize(table: "pa.Table") -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def to_arrow(gp: GamryParser) -> "pa.Table":
+    """convert a loaded experiment to an Arrow table
+
+    All curves are stored in a single table, in long format (see GamryParser.curves_long): the "Curve" column holds
+    the curve index of each row, and the curve index column (e.g. Pt) is kept as a column. The header and curve
+    layout are stored as json in the schema metadata (the OCV curve as an Arrow IPC stream), and the unit of each column as field metadata ("unit").
+
+    Args:
+        gp (GamryParser): loaded experiment
+    Returns:
+        pyarrow.Table: experiment data
+
+    """
+    _require_pyarrow()
+    assert gp.loaded, "DTA file not loaded. Run GamryParser.load()"
+    curves = gp.curves
+    block = gp.curves_long
+    table = pa.Table.from_pandas(block, preserve_index=True)
+
+    fields = []
+    for field in table.schema:
+        unit = gp._curve_units.get(field.name, None)
+        fields.append(
+            field if unit is None else field.with_metadata({b"unit": unit.encode()})
+        )
+    meta = dict(
+        format=EXPORT_FORMAT,
+        parser=type(gp).__name__,
+        filename=gp.fname,
+        header=gp.header,
+        header_length=gp.header_length,
+        curve_units=gp._curve_units,
+        curve_rows=[len(curve) for curve in curves],
+        to_timestamp=gp.to_timestamp,
+        time_index=gp.time_index,
+    )
+    metadata = dict(table.schema.metadata or {})
+    metadata[METADATA_KEY] = json.dumps(meta, default=str).encode()
+    if gp._ocv is not None:
+        metadata[OCV_KEY] = _serialize(pa.Table.from_pandas(gp._ocv))
+    return pa.Table.from_arrays(
+        table.columns, schema=pa.schema(fields, metadata=metadata)
+    )
+
+
+def from_arrow(table: "pa.Table") -> GamryParser:
+    """rebuild a loaded experiment from a table written by to_arrow()
+
+    The parser is returned with storage="block": curve(n) returns slices of a single DataFrame, whose columns share
+    memory with the table where Arrow allows it (numeric columns without missing values).
+
+    Args:
+        table (pyarrow.Table): experiment data
+    Returns:
+        GamryParser: loaded experiment (the parser class it was exported from)
+
+    """
+    _require_pyarrow()
+    metadata = table.schema.metadata or {}
+    assert METADATA_KEY in metadata, "Table was not written by gamry_parser.to_arrow()"
+    meta = json.loads(metadata[METADATA_KEY])
+    assert meta["format"] == EXPORT_FORMAT, "Unsupported export format ({})".format(
+        meta["format"]
+    )
+
+    gp = PARSER_CLASSES.get(meta["parser"], GamryParser)(
+        filename=meta["filename"], storage="block"
+    )
+    gp._set_separators(".")
+    gp._header.update(meta["header"])
+    gp.header_length = meta["header_length"]
+    gp._curve_units.update(meta["curve_units"])
+    gp.to_timestamp = meta["to_timestamp"]
+    gp.time_index = meta["time_index"]
+    if OCV_KEY in metadata:
+        gp._ocv = pa.ipc.open_stream(metadata[OCV_KEY]).read_pandas()
+
+    gp._block = table.to_pandas(split_blocks=True)
+    gp._offsets = np.cumsum([0] + meta["curve_rows"])
+    gp._slice_block()
+    gp.curve_count = len(gp._curves)
+    gp.loaded = True
+    return gp
+
+
+def write_experiment(gp: GamryParser, path: str, format: str = None) -> str:
+    """write a loaded experiment to a Parquet or Arrow IPC file (see to_arrow())
+
+    Args:
+        gp (GamryParser): loaded experiment
+        path (str): output filepath
+        format (str, optional): "parquet" or "arrow" (uncompressed Arrow IPC, which read_experiment() memory-maps
+            without decoding). Defaults to None (from the file extension: .parquet, .arrow or .feather)
+    Returns:
+        str: output filepath
+
+    """
+    _require_pyarrow()
+    format = format or FORMATS.get(os.path.splitext(path)[1].lower(), None)
+    assert format in FORMATS.values(), "Unknown export format for '{}'".format(path)
+
+    table = to_arrow(gp)
+    if format == "parquet":
+        pq.write_table(table, path)
+    else:
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    return path
+
+
+def write_experiments(
+    parsers, directory: str, partition_by: str = "TAG", format: str = "parquet"
+) -> list:
+    """write many loaded experiments as a dataset, one file per experiment
+
+    Files are named after the source DTA file, and grouped in hive-style partition directories by a header entry
+    (e.g. directory/TAG=CV/experiment.parquet), so the dataset can be read with pyarrow.dataset or any other
+    hive-aware reader.
+
+    Args:
+        parsers (iterable): loaded experiments (e.g. the parser of each gamry_parser.load_batch() result)
+        directory (str): dataset location. Created if it does not exist.
+        partition_by (str, optional): header entry used to partition the dataset. Defaults to "TAG". None writes
+            every file to `directory`.
+        format (str, optional): "parquet" or "arrow". Defaults to "parquet".
+    Returns:
+        list: output filepaths
+
+    """
+    assert format in FORMATS.values(), "Unknown export format '{}'".format(format)
+    paths = []
+    for gp in parsers:
+        folder = directory
+        if partition_by is not None:
+            folder = os.path.join(
+                directory,
+                "{}={}".format(partition_by, gp.header.get(partition_by, None)),
+            )
+        os.makedirs(folder, exist_ok=True)
+        name = os.path.splitext(os.path.basename(gp.fname))[0]
+        paths.append(
+            write_experiment(
+                gp, os.path.join(folder, "{}.{}".format(name, format)), format=format
+            )
+        )
+    return paths
+
+
+def read_experiment(path: str, memory_map: bool = True) -> GamryParser:
+    """reopen an experiment written by write_experiment(), without reading the original DTA file
+
+    Args:
+        path (str): Parquet or Arrow IPC filepath
+        memory_map (bool, optional): memory-map the file. Columns of Arrow IPC files are then used in place, without
+            copying them into memory. Defaults to True.
+    Returns:
+        GamryParser: loaded experiment (see from_arrow())
+
+    """
+    _require_pyarrow()
+    if FORMATS.get(os.path.splitext(path)[1].lower(), None) == "parquet":
+        table = pq.read_table(path, memory_map=memory_map)
+    else:
+        source = pa.memory_map(path, "r") if memory_map else pa.OSFile(path, "rb")
+        table = pa.ipc.open_file(source).read_all()
+    return from_arrow(table)
@@ -1,9 +1,43 @@
+import numpy as np
 import pandas as pd
-from pandas.api.types import is_numeric_dtype
 import re
 import os
 import locale
-from io import StringIO
+import mmap
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from io import StringIO, TextIOWrapper
+from .header import parse_header, read_header
+from .cache import ParseCache
+from .stats import ParseStats
+from .scanner import (
+    CHUNKSIZE,
+    TableSpan,
+    iter_table,
+    map_file,
+    scan_tables,
+    read_columns,
+    read_table,
+)
+
+
+@contextmanager
+def _no_phase():
+    """no-op context manager used in place of ParseStats.phase() when not profiling"""
+    yield
+
+
+def _copy_on_write() -> bool:
+    """whether pandas copies shared data on write (always since pandas 3.0, optional in pandas 2.x)
+
+    Without copy-on-write, DataFrames that share memory with a stored curve would write through to it.
+    """
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    if int(pd.__version__.split(".")[0]) < 2:
+        return False
+    return pd.get_option("mode.copy_on_write") is True
 
 
 class GamryParser:
@@ -11,6 +45,17 @@ class GamryParser:
 
     fname: str = None
     to_timestamp: bool = False
+    date_format: str = None
+    time_index: bool = False
+    engine: str = "python"
+    decimal: str = None
+    lazy: bool = False
+    cache: ParseCache = None
+    storage: str = "list"
+    columns: list = None
+    compact: bool = False
+    profile = False
+    stats: ParseStats = None
     loaded: bool = False
     curve_count: int = 0
     header_length: int = 0
@@ -19,15 +64,69 @@ class GamryParser:
     _curves: list = []
     _curve_units: dict = dict()
     _ocv: pd.DataFrame = None
+    _decimal: str = "."
+    _thousands: str = None
+    _tables: list = None
+    _cached: OrderedDict = None
+    # contents of the file, when read ahead of load() (see gamry_parser.aio). Not reset by _reset_props()
+    _buffer: bytes = None
+    _block: pd.DataFrame = None
+    _views: dict = None
+    _offsets: np.ndarray = None
+    _start: pd.Timestamp = None
 
     REQUIRED_UNITS: dict = dict(CV=dict(Vf="V vs. Ref.", Im="A"))
+    ENGINES: tuple = ("python", "scan", "mmap")
+    STORAGES: tuple = ("list", "block")
+    INDEX_COL: int = 0
+    NONNUMERIC_KEYS: tuple = ("Over",)
+    # columns returned by curve() (None for all columns)
+    COLUMNS: tuple = None
+    CURVE_CACHE_SIZE: int = 8
+    # dtypes used by compact=True. Integer columns are only narrowed if their values fit
+    COMPACT_DTYPES: dict = dict(Pt="int32", IERange="int8", Over="category")
+    # float columns kept as float64 by compact=True (all other float columns are stored as float32)
+    PRECISE_KEYS: tuple = ("T", "Time")
 
-    def __init__(self, filename: str = None, to_timestamp: bool = None):
+    def __init__(
+        self,
+        filename: str = None,
+        to_timestamp: bool = None,
+        engine: str = None,
+        decimal: str = None,
+        lazy: bool = None,
+        cache=None,
+        storage: str = None,
+        columns=None,
+        compact: bool = None,
+        profile=None,
+        date_format: str = None,
+        time_index: bool = None,
+    ):
         """GamryParser.__init__
 
         Args:
             filename (str, optional): filepath to experiment data. Defaults to None
             to_timestamp (bool, optional): Convert sample times from elapsed seconds to pandas.Timestamp(). Defaults to False
+            engine (str, optional): table reader used by load(), one of GamryParser.ENGINES. Defaults to "python"
+            decimal (str, optional): decimal separator used in the file ("." or ","), or "auto" to detect it from the
+                file header. Defaults to None (use the separators of the current locale)
+            lazy (bool, optional): index the location of each curve at load, and only parse curves when requested.
+                Defaults to False
+            cache (ParseCache or str, optional): persistent cache of parsed experiments (or its directory). Loads
+                reuse the cached header and curves (memory-mapped) while the file is unchanged. Defaults to None
+            storage (str, optional): curve storage, one of GamryParser.STORAGES. "list" keeps one DataFrame per
+                curve, "block" keeps all curves in a single DataFrame (see curves_long). Defaults to "list"
+            columns (list or str, optional): curve columns to parse, "default" for the columns returned by curve()
+                (see COLUMNS), or "all". The index column is always parsed. Defaults to None (all columns)
+            compact (bool, optional): store curves with compact dtypes (see COMPACT_DTYPES and PRECISE_KEYS).
+                Defaults to False
+            profile (bool or callable, optional): record parse timings and counters in GamryParser.stats. A
+                callable is also used as the ParseStats hook. Defaults to False
+            date_format (str, optional): strftime format of the experiment start time ("DATE TIME" header entries,
+                e.g. "%m/%d/%Y %H:%M:%S"). Defaults to None (guess the day/month order from the DATE entry)
+            time_index (bool, optional): use the converted sample times (T) as a DatetimeIndex (requires
+                to_timestamp). Defaults to False
 
         Returns:
             None
@@ -38,12 +137,58 @@ class GamryParser:
         self.to_timestamp = (
             to_timestamp if to_timestamp is not None else self.to_timestamp
         )
+        self.engine = engine if engine is not None else self.engine
+        assert (
+            self.engine in self.ENGINES
+        ), "Unknown engine '{}'. Expected one of {}".format(self.engine, self.ENGINES)
+        self.decimal = decimal if decimal is not None else self.decimal
+        assert self.decimal in [
+            None,
+            "auto",
+            ".",
+            ",",
+        ], "Unknown decimal separator '{}'".format(self.decimal)
+        self.lazy = lazy if lazy is not None else self.lazy
+        cache = cache if cache is not None else self.cache
+        self.cache = ParseCache(cache) if isinstance(cache, str) else cache
+        self.storage = storage if storage is not None else self.storage
+        assert (
+            self.storage in self.STORAGES
+        ), "Unknown storage '{}'. Expected one of {}".format(
+            self.storage, self.STORAGES
+        )
+        assert not (
+            self.lazy and self.storage == "block"
+        ), "Block storage is not available for lazily loaded files"
+        columns = columns if columns is not None else self.columns
+        if isinstance(columns, str):
+            assert columns in ["default", "all"], "Unknown columns '{}'".format(columns)
+            columns = self.COLUMNS if columns == "default" else None
+        self.columns = None if columns is None else list(columns)
+        self.compact = compact if compact is not None else self.compact
+        self.profile = profile if profile is not None else self.profile
+        self.date_format = date_format if date_format is not None else self.date_format
+        self.time_index = time_index if time_index is not None else self.time_index
+        assert (
+            self.to_timestamp or not self.time_index
+        ), "time_index requires to_timestamp=True"
 
     def _reset_props(self):
         "re-initialize parser properties"
 
         self.fname = None
         self.to_timestamp = False
+        self.date_format = None
+        self.time_index = False
+        self.engine = "python"
+        self.decimal = None
+        self.lazy = False
+        self.cache = None
+        self.storage = "list"
+        self.columns = None
+        self.compact = False
+        self.profile = False
+        self.stats = None
         self.loaded = False
         self.curve_count = 0
         self.header_length = 0
@@ -52,12 +197,65 @@ class GamryParser:
         self._curves = []
         self._curve_units = dict()
         self._ocv = None
+        self._decimal = "."
+        self._thousands = None
+        self._tables = None
+        self._cached = OrderedDict()
+        self._block = None
+        self._offsets = None
+        self._views = dict()
+        self._start = None
 
-    def load(self, filename: str = None, to_timestamp: bool = None):
+    def load(
+        self,
+        filename: str = None,
+        to_timestamp: bool = None,
+        engine: str = None,
+        decimal: str = None,
+        lazy: bool = None,
+        cache=None,
+        storage: str = None,
+        columns=None,
+        compact: bool = None,
+        profile=None,
+        date_format: str = None,
+        time_index: bool = None,
+    ):
         """save experiment information to \"header\", then save curve data to \"curves\"
 
         Args:
             filename (str, optional): file containing EXPLAIN-formatted data. defaults to None.
+            to_timestamp (bool, optional): Convert sample times from elapsed seconds to pandas.Timestamp(). Defaults to None (keep current setting)
+            engine (str, optional): table reader, one of GamryParser.ENGINES. "python" reads tables line-by-line,
+                "scan" locates tables by byte offset in a single pass and parses each table in one vectorized call.
+                "mmap" runs the "scan" reader on a memory map of the file instead of a copy of its contents in
+                memory. All engines produce identical curves. Defaults to None (keep current setting)
+            decimal (str, optional): decimal separator used in the file: ".", "," or "auto" (detect from the file header).
+                The thousands separator is taken to be the other character. Defaults to None (keep current setting,
+                initially the separators of the current locale)
+            lazy (bool, optional): only index where each curve starts and ends in the file. Curves are parsed on first
+                access (using the "scan" reader), and the most recently used curves are kept in a cache of
+                GamryParser.CURVE_CACHE_SIZE entries. Defaults to None (keep current setting)
+            cache (ParseCache or str, optional): persistent cache of parsed experiments (or its directory). Not used
+                when lazy=True. Defaults to None (keep current setting)
+            storage (str, optional): curve storage, one of GamryParser.STORAGES. With "block", all curves are stored
+                in a single DataFrame, curve(n) returns a slice of it, and curves_long returns it without copying.
+                Defaults to None (keep current setting)
+            columns (list or str, optional): curve columns to parse, "default" for the columns returned by curve()
+                (see COLUMNS), or "all" to parse every column again. Other columns are never converted, and their
+                units are not validated. Defaults to None (keep current setting, initially all columns)
+            compact (bool, optional): store measured channels as float32 (except the time columns listed in
+                PRECISE_KEYS), Pt and IERange as small integers, and Over as a categorical column, which reduces the
+                memory held by loaded curves to about a quarter. Defaults to None (keep current setting)
+            profile (bool or callable, optional): record per-phase wall time, bytes read, rows per curve and
+                fallback counts in GamryParser.stats (see ParseStats). A callable is called as hook(event, data) for
+                each measurement. Defaults to None (keep current setting)
+            date_format (str, optional): strftime format of the experiment start time ("DATE TIME" header
+                entries, e.g. "%d.%m.%Y %H:%M:%S"), used by to_timestamp instead of guessing the day/month order.
+                Defaults to None (keep current setting)
+            time_index (bool, optional): with to_timestamp, move the converted sample times (T) to the index of
+                each curve (a DatetimeIndex named "T"). The point index (Pt) is kept as a column. Defaults to None
+                (keep current setting)
         Returns:
             None
 
@@ -65,38 +263,273 @@ class GamryParser:
 
         self.__init__(
             filename=filename if filename else self.fname,
-            to_timestamp=to_timestamp if to_timestamp else self.to_timestamp,
+            to_timestamp=(
+                to_timestamp if to_timestamp is not None else self.to_timestamp
+            ),
+            engine=engine if engine is not None else self.engine,
+            decimal=decimal if decimal is not None else self.decimal,
+            lazy=lazy if lazy is not None else self.lazy,
+            cache=cache if cache is not None else self.cache,
+            storage=storage if storage is not None else self.storage,
+            columns=columns if columns is not None else self.columns,
+            compact=compact if compact is not None else self.compact,
+            profile=profile if profile is not None else self.profile,
+            date_format=date_format if date_format is not None else self.date_format,
+            time_index=time_index if time_index is not None else self.time_index,
         )
         self.loaded = False
+        self.stats = (
+            ParseStats(hook=self.profile if callable(self.profile) else None)
+            if self.profile
+            else None
+        )
+        start = time.perf_counter()
         assert self.fname is not None, "GamryParser needs to know what file to parse."
         assert os.path.exists(self.fname), "The file '{}' was not found.".format(
             self.fname
         )
 
-        self.read_header()
-        self.read_curves()
+        # the header and curves share a single file handle (python), buffered read (scan) or memory map (mmap)
+        cached = False
+        if self.lazy:
+            self._index_curves()
+        elif self.cache is not None and self._restore_cache():
+            cached = True
+        elif self.engine != "python" or self._buffer is not None:
+            with self._read_buffer() as buf:
+                self._count_bytes(len(buf))
+                self._set_separators()
+                with self._phase("header"):
+                    self._store_header(*parse_header(buf, atof=self._atof))
+                self._scan_curves(buf)
+        else:
+            with open(file=self.fname, mode="rb") as f:
+                self._read_header(f)
+                f.seek(self.header_length)
+                text = TextIOWrapper(f, encoding="utf8", errors="ignore")
+                self._read_curves(text)
+                self._count_bytes(f.tell())
+        if self.cache is not None and not (self.lazy or cached):
+            self._store_cache()
         if self.to_timestamp:
-            self._convert_T_to_Timestamp()
+            with self._phase("timestamps"):
+                self._convert_T_to_Timestamp()
+        if self.storage == "block":
+            with self._phase("block"):
+                self._store_block()
 
         self.loaded = True
+        if self.stats is not None:
+            self.stats.finish(time.perf_counter() - start)
+
+    @contextmanager
+    def _read_buffer(self):
+        """helper function to provide the raw file contents to the "scan" reader: the buffer set by
+        AsyncGamryParser, a memory map of the file (engine="mmap"), or the file contents read into memory
+        """
+        if self._buffer is not None:
+            yield self._buffer
+        elif self.engine == "mmap":
+            with open(file=self.fname, mode="rb") as f, map_file(f) as buf:
+                yield buf
+        else:
+            with self._phase("read"), open(file=self.fname, mode="rb") as f:
+                buf = f.read()
+            yield buf
+
+    def _phase(self, name: str):
+        """helper function to time a parsing phase, when profiling (see ParseStats)"""
+        return _no_phase() if self.stats is None else self.stats.phase(name)
+
+    def _count_bytes(self, count: int):
+        """helper function to record bytes read from the file, when profiling"""
+        if self.stats is not None:
+            self.stats.add_bytes(count)
+
+    @property
+    def _cache_options(self) -> dict:
+        """parser options that affect the parsed curves, used to key cache entries"""
+        return dict(
+            parser=type(self).__name__,
+            decimal=self.decimal,
+            columns=self.columns,
+            compact=self.compact,
+            locale=(
+                locale.localeconv()["decimal_point"] if self.decimal is None else None
+            ),
+        )
+
+    def _restore_cache(self) -> bool:
+        """helper function to load the header and curves from the cache
+
+        Args:
+            None
+        Returns:
+            bool: True if the cache held a valid entry for the file
+
+        """
+        with self._phase("cache"):
+            data = self.cache.get(self.fname, self._cache_options)
+        if data is None:
+            if self.stats is not None:
+                self.stats.add_fallback("cache_miss")
+            return False
+
+        self._set_separators(".")
+        self._header.update(data["header"])
+        self.header_length = data["header_length"]
+        self._curve_units.update(data["curve_units"])
+        self._ocv = data["ocv"]
+        self._curves = data["curves"]
+        self.curve_count = len(self._curves)
+        return True
+
+    def _store_cache(self):
+        """helper function to save the parsed header and curves to the cache
+
+        Args:
+            None
+        Returns:
+            None
+
+        """
+        data = dict(
+            header=self._header,
+            header_length=self.header_length,
+            curve_units=self._curve_units,
+            curves=self._curves,
+            ocv=self._ocv,
+        )
+        with self._phase("cache"):
+            self.cache.put(self.fname, data, self._cache_options)
 
     def _convert_T_to_Timestamp(self):
         """convert experiment sample elapsed time to absolute time (pd.Timestamp)"
 
+        The sample times of all loaded curves are converted in a single vectorized pass.
+
         Args:
             None
         Returns:
             None
         """
 
-        start_time = pd.to_datetime(
-            self._header["DATE"] + " " + self._header["TIME"],
-            dayfirst=bool(
-                re.search(r"[0-9]+\-[0-9]+\-[0-2]{1}[0-9]{3}", self._header["DATE"])
-            ),
+        loaded = [
+            i
+            for i, curve in enumerate(self._curves)
+            if curve is not None and "T" in curve.columns
+        ]
+        if len(loaded) == 0:
+            return
+
+        stamps = self._timestamps(
+            np.concatenate([self._curves[i]["T"].to_numpy() for i in loaded])
         )
-        for curve in self._curves:
-            curve["T"] = start_time + pd.to_timedelta(curve["T"], "s")
+        start = 0
+        for i in loaded:
+            end = start + len(self._curves[i])
+            self._curves[i] = self._set_timestamps(self._curves[i], stamps[start:end])
+            start = end
+
+    def _to_timestamp(self, curve: pd.DataFrame) -> pd.DataFrame:
+        """helper function to convert the elapsed time column of a curve (T, if loaded) to pd.Timestamp
+
+        Args:
+            curve (DataFrame): table data
+        Returns:
+            curve (DataFrame): table data
+
+        """
+        if "T" in curve.columns:
+            curve = self._set_timestamps(curve, self._timestamps(curve["T"].to_numpy()))
+        return curve
+
+    def _timestamps(self, elapsed: np.ndarray) -> pd.DatetimeIndex:
+        """helper function to convert sample elapsed times (in seconds) to absolute times"""
+        return self.start_time + pd.to_timedelta(elapsed, "s")
+
+    def _set_timestamps(
+        self, curve: pd.DataFrame, stamps: pd.DatetimeIndex
+    ) -> pd.DataFrame:
+        """helper function to replace the elapsed time column of a curve (or move it to the index, see time_index)"""
+        if not self.time_index:
+            curve["T"] = stamps
+            return curve
+
+        curve = curve.drop(columns="T")
+        if curve.index.name is not None:
+            # keep the point index (Pt) as a column
+            curve = curve.reset_index()
+        curve.index = stamps.rename("T")
+        return curve
+
+    @property
+    def start_time(self) -> pd.Timestamp:
+        """experiment start time, from the DATE and TIME header entries (parsed once per file)"""
+        if self._start is None:
+            start = self._header["DATE"] + " " + self._header["TIME"]
+            if self.date_format is not None:
+                self._start = pd.to_datetime(start, format=self.date_format)
+            else:
+                self._start = pd.to_datetime(
+                    start,
+                    dayfirst=bool(
+                        re.search(
+                            r"[0-9]+\-[0-9]+\-[0-2]{1}[0-9]{3}", self._header["DATE"]
+                        )
+                    ),
+                )
+        return self._start
+
+    def _set_separators(self, decimal: str = None):
+        """resolve the decimal and thousands separators used to convert numeric values
+
+        Args:
+            decimal (str, optional): decimal separator found in the file, used when decimal="auto". Defaults to None.
+        Returns:
+            None
+
+        """
+        if self.decimal is None:
+            conv = locale.localeconv()
+            self._decimal = conv["decimal_point"]
+            self._thousands = conv["thousands_sep"] or None
+        elif self.decimal == "auto" and decimal is None:
+            # resolved by the first numeric header value that contains a separator
+            self._decimal = None
+            self._thousands = None
+        else:
+            self._decimal = decimal if self.decimal == "auto" else self.decimal
+            self._thousands = "," if self._decimal == "." else "."
+
+    def _atof(self, value: str) -> float:
+        """locale-friendly alternative to float, using the separators of the loaded file"""
+        if self._decimal is None:
+            if "." in value:
+                self._set_separators(".")
+            elif "," in value:
+                self._set_separators(",")
+            else:
+                return float(value)
+        if self._thousands:
+            value = value.replace(self._thousands, "")
+        return float(value.replace(self._decimal, "."))
+
+    @property
+    def _csv_separators(self) -> dict:
+        """separators passed to the csv reader. In locale mode (decimal=None), values are first read with pandas
+        defaults, and only the columns left as text are converted using the locale separators.
+        """
+        if self.decimal is None:
+            return dict()
+        return dict(decimal=self._decimal, thousands=self._thousands)
+
+    def _to_numeric(self, values: pd.Series) -> pd.Series:
+        """vectorized, locale-friendly conversion of a text column to numeric values"""
+        values = values.astype(str)
+        if self._thousands:
+            values = values.str.replace(self._thousands, "", regex=False)
+        return pd.to_numeric(values.str.replace(self._decimal, ".", regex=False))
 
     @property
     def curve_indices(self) -> tuple:
@@ -124,18 +557,262 @@ class GamryParser:
         ), "Invalid curve ({}). File contains {} total curves.".format(
             curve, self.curve_count
         )
+        return self._view(curve)
+
+    def iter_chunks(
+        self, curve: int = 0, chunksize: int = CHUNKSIZE, columns: list = None
+    ):
+        """iterate over a curve in chunks of rows
+
+        For lazily loaded files (lazy=True), rows are parsed from the file chunk by chunk, so the curve is never held
+        in memory as a whole. Otherwise, chunks are slices of the loaded curve.
+
+        Args:
+            curve (int, optional): curve number to return. Defaults to 0.
+            chunksize (int, optional): number of rows per chunk. Defaults to 65536.
+            columns (list, optional): columns to return. Defaults to None (the columns returned by curve())
+
+        Returns:
+            generator: pandas.DataFrame chunks (multiple columns)
+
+        """
+        assert self.loaded, "DTA file not loaded. Run GamryParser.load()"
+        assert (
+            curve < self.curve_count
+        ), "Invalid curve ({}). File contains {} total curves.".format(
+            curve, self.curve_count
+        )
+        curve = curve + self.curve_count if curve < 0 else curve
+        if columns is None:
+            columns = self.COLUMNS if self.COLUMNS is not None else self.columns
+            if columns is not None and self.columns is not None:
+                columns = [key for key in columns if key in self.columns]
+        columns = None if columns is None else list(columns)
+
+        if not self.lazy or self._curves[curve] is not None:
+            df = self._curve(curve)
+            if columns is not None:
+                df = df[self._loaded(columns, df)]
+            for start in range(0, len(df), chunksize):
+                yield df.iloc[start : start + chunksize]
+            return
+
+        with open(file=self.fname, mode="rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                for chunk in iter_table(
+                    buf,
+                    self._tables[curve],
+                    chunksize=chunksize,
+                    index_col=self.INDEX_COL,
+                    usecols=columns,
+                    **self._csv_separators,
+                ):
+                    chunk = self._convert_curve(chunk)
+                    if self.to_timestamp:
+                        chunk = self._to_timestamp(chunk)
+                    yield (
+                        chunk
+                        if columns is None
+                        else chunk[self._loaded(columns, chunk)]
+                    )
+
+    def _view(self, curve: int) -> pd.DataFrame:
+        """helper function to retrieve the columns of a curve returned by curve() (see COLUMNS)
+
+        With copy-on-write (pandas 3, or pandas 2 with mode.copy_on_write enabled), views are built once per curve
+        and share memory with the stored curve, whose arrays are marked read-only. Each call returns a shallow copy
+        of the view: columns can be added or replaced on the returned DataFrame without affecting the stored curve
+        or later calls, and writing values in place copies them. Otherwise, the columns listed in COLUMNS are selected
+        from the stored curve on every call, which copies them.
+
+        Args:
+            curve (int): curve index (negative values count from the last curve)
+        Returns:
+            pandas.DataFrame: (multiple columns)
+
+        """
+        curve = curve + self.curve_count if curve < 0 else curve
+        df = self._curve(curve)
+        if not _copy_on_write():
+            return df if self.COLUMNS is None else df[self._loaded(self.COLUMNS, df)]
+
+        view = self._views.get(curve, None)
+        if view is None:
+            view = df if self.COLUMNS is None else df[self._loaded(self.COLUMNS, df)]
+            self._freeze(view)
+            self._views[curve] = view
+
+        return view.copy(deep=False)
+
+    @staticmethod
+    def _freeze(curve: pd.DataFrame):
+        """helper function to mark the arrays holding the data of a curve read-only (copy-on-write only)"""
+        for _, values in curve.items():
+            values = values.to_numpy(copy=False)
+            # the column may be a view of a larger (block) array: protect the array that owns the data
+            while isinstance(values, np.ndarray):
+                values.flags.writeable = False
+                values = values.base
+
+    def _loaded(self, columns: list, curve: pd.DataFrame) -> list:
+        """helper function to drop columns that were not loaded (see columns) from a column selection
+
+        Columns are only dropped when a projection is active (columns), or when they were moved to the index
+        (T, see time_index). Other missing columns are kept, so that selecting them raises a KeyError.
+        """
+        return [
+            key
+            for key in columns
+            if (self.columns is None or key in self.columns)
+            and (key in curve.columns or key != curve.index.name)
+        ]
+
+    def _curve(self, curve: int) -> pd.DataFrame:
+        """helper function to retrieve a stored curve, parsing it first if the file was loaded lazily
+
+        Args:
+            curve (int): curve index (negative values count from the last curve)
+        Returns:
+            pandas.DataFrame: (multiple columns)
+
+        """
+        if not self.lazy:
+            return self._curves[curve]
+
+        curve = curve + self.curve_count if curve < 0 else curve
+        if self._curves[curve] is None:
+            self._curves[curve] = self._fetch_curve(self._tables[curve])
+            if self.stats is not None:
+                self.stats.add_rows(curve, len(self._curves[curve]))
+        self._cached[curve] = None
+        self._cached.move_to_end(curve)
+        while len(self._cached) > self.CURVE_CACHE_SIZE:
+            evicted, _ = self._cached.popitem(last=False)
+            self._curves[evicted] = None
+            self._views.pop(evicted, None)
+
         return self._curves[curve]
 
     @property
     def curves(self) -> list:
         """return all loaded curves as a list of pandas DataFrames"""
         # assert self.loaded, "DTA file not loaded. Run GamryParser.load()"
+        if self.lazy and self.loaded:
+            return [self._curve(curve) for curve in range(self.curve_count)]
         return self._curves
 
     @curves.setter
     def curves(self, val: list):
         self._curves = val
 
+    @property
+    def curves_long(self) -> pd.DataFrame:
+        """return all curves as a single DataFrame, in long format
+
+        The first column ("Curve") holds the curve index of each row (zero-based, as in curve()). With
+        storage="block", this is the stored DataFrame itself (treat as read-only); otherwise, the curves are
+        concatenated on every call.
+        """
+        if self._block is not None:
+            return self._block
+        return self._concat_curves(self.curves)
+
+    def _concat_curves(self, curves: list) -> pd.DataFrame:
+        """helper function to join curves into a long-format DataFrame, with a leading "Curve" column"""
+        if len(curves) == 0:
+            return pd.DataFrame(columns=["Curve"])
+
+        block = self._concat(curves)
+        block.insert(
+            0,
+            "Curve",
+            np.repeat(np.arange(len(curves)), [len(curve) for curve in curves]),
+        )
+        return block
+
+    @staticmethod
+    def _concat(frames: list) -> pd.DataFrame:
+        """helper function to concatenate curves (or parts of a curve), keeping categorical columns (compact=True)
+        whose categories differ between frames"""
+        df = pd.concat(frames)
+        for key, dtype in frames[0].dtypes.items():
+            if isinstance(dtype, pd.CategoricalDtype) and key in df.columns:
+                df[key] = df[key].astype("category")
+        return df
+
+    @staticmethod
+    def _stack(curves: list, key: str) -> np.ndarray:
+        """helper function to stack a column of every curve into a 2D array, one row per curve, padded with NaN
+
+        Args:
+            curves (list): curves, as returned by curves
+            key (str): column identifier (T may also be the index of the curves, see time_index)
+        Returns:
+            np.ndarray: float64 array of shape (number of curves, length of the longest curve). Sample times
+                converted with to_timestamp are returned as seconds since the start of the experiment.
+
+        """
+
+        def column(curve: pd.DataFrame) -> pd.Series:
+            if key in curve.columns:
+                return curve[key]
+            if curve.index.name == key:
+                return curve.index
+            raise KeyError(
+                "Column '{}' is not loaded (see the columns option of load())".format(
+                    key
+                )
+            )
+
+        lengths = np.array([len(curve) for curve in curves])
+        values = np.concatenate([column(curve).to_numpy() for curve in curves])
+        if values.dtype.kind == "M":
+            values = (values - values.min()) / np.timedelta64(1, "s")
+        offsets = np.cumsum(lengths) - lengths
+        stacked = np.full((len(curves), lengths.max(initial=0)), np.nan)
+        stacked[
+            np.repeat(np.arange(len(curves)), lengths),
+            np.arange(lengths.sum()) - np.repeat(offsets, lengths),
+        ] = values
+        return stacked
+
+    def _store_block(self):
+        """helper function to move all loaded curves into a single DataFrame (storage="block")
+
+        Each entry in self._curves is replaced by a slice of the block, which shares its memory (see _slice_block).
+
+        Args:
+            None
+        Returns:
+            None
+
+        """
+        self._offsets = np.cumsum([0] + [len(curve) for curve in self._curves])
+        self._block = self._concat_curves(self._curves)
+        self._slice_block()
+
+    def _slice_block(self):
+        """helper function to set each curve to its rows of the stored block (between consecutive self._offsets)
+
+        Slices are built from the arrays of each column, since positional slices (iloc) of a DataFrame with
+        several dtypes are copies in pandas < 3.
+
+        Args:
+            None
+        Returns:
+            None
+
+        """
+        arrays = [(key, values.array) for key, values in self._block.items()][1:]
+        self._curves = [
+            pd.DataFrame(
+                {key: values[start:end] for key, values in arrays},
+                index=self._block.index[start:end],
+                copy=False,
+            )
+            for start, end in zip(self._offsets[:-1], self._offsets[1:])
+        ]
+
     @property
     def header(self) -> list:
         """return the experiment configuration dictionary"""
@@ -175,60 +852,52 @@ class GamryParser:
 
         """
 
-        pos = 0
-        with open(file=self.fname, mode="r", encoding="utf8", errors="ignore") as f:
-            cur_line = f.readline().split("\t")
-            while not re.search(r"(^|Z|VFP|EFM)CURVE", cur_line[0]):
-                if f.tell() == pos:
-                    break
-
-                pos = f.tell()
-                cur_line = f.readline().strip().split("\t")
-                if len(cur_line[0]) == 0:
-                    pass
-
-                if len(cur_line) > 1:
-                    # data format: key, type, value
-                    if cur_line[1] in ["LABEL", "PSTAT"]:
-                        self._header[cur_line[0]] = cur_line[2]
-                    elif cur_line[1] in ["QUANT", "IQUANT", "POTEN"]:
-                        # locale-friendly alternative to float
-                        self._header[cur_line[0]] = locale.atof(cur_line[2])
-                    elif cur_line[1] in ["IQUANT", "SELECTOR"]:
-                        self._header[cur_line[0]] = int(cur_line[2])
-                    elif cur_line[1] in ["TOGGLE"]:
-                        self._header[cur_line[0]] = cur_line[2] == "T"
-                    elif cur_line[1] == "TWOPARAM":
-                        self._header[cur_line[0]] = {
-                            "enable": cur_line[2] == "T",
-                            # locale-friendly alternative to float
-                            "start": locale.atof(cur_line[3]),
-                            # locale-friendly alternative to float
-                            "finish": locale.atof(cur_line[4]),
-                        }
-                    elif cur_line[0] == "TAG":
-                        self._header["TAG"] = cur_line[1]
-                    elif cur_line[0] == "NOTES":
-                        n_notes = int(cur_line[2])
-                        note = ""
-                        for _ in range(n_notes):
-                            note += f.readline().strip() + "\n"
-                        self._header[cur_line[0]] = note
-                    elif cur_line[0] == "OCVCURVE":
-                        n_points = int(cur_line[2])
-                        ocv = f.readline().strip() + "\n"  # grab header data
-                        f.readline()  # skip second line of header
-                        for _ in range(n_points):
-                            ocv += f.readline().strip() + "\n"
-                        ocv = pd.read_csv(
-                            StringIO(ocv), delimiter="\t", header=0, index_col=0
-                        )
-                        self._ocv = ocv
+        with open(file=self.fname, mode="rb") as f:
+            return self._read_header(f)
+
+    def _read_header(self, f) -> tuple:
+        """helper function to parse the EXPLAIN file header from an open file handle
+
+        Args:
+            f (file): binary file handle, positioned at the start of the file
+        Returns:
+            header (dict): experimental header data in key-value pairs.
+            length (int): length of header text, in # of bytes. Only the first blocks of the file holding the
+                header are read, so `f` must be moved to this offset before reading curves.
+
+        """
 
-            self.header_length = f.tell()
+        self._set_separators()
+        with self._phase("header"):
+            self._store_header(*read_header(f, atof=self._atof))
 
         return self._header, self.header_length
 
+    def _store_header(self, header: dict, ocv: str, length: int):
+        """helper function to save the results of gamry_parser.header.parse_header()
+
+        Args:
+            header (dict): experimental header data in key-value pairs.
+            ocv (str): contents of the OCVCURVE table, or None
+            length (int): length of header text, in # of bytes
+        Returns:
+            None
+
+        """
+        self._header.update(header)
+        self._start = None
+        if ocv is not None:
+            self._ocv = pd.read_csv(
+                StringIO(ocv),
+                delimiter="\t",
+                header=0,
+                index_col=0,
+                **self._csv_separators,
+            )
+        if self._decimal is None:
+            self._set_separators(".")
+        self.header_length = length
+
     def _read_curve_data(self, fid: int) -> tuple:
         """helper function to process an EXPLAIN Table
 
@@ -254,12 +923,39 @@ class GamryParser:
             if fid.tell() == pos:
                 break
 
-        curve = pd.read_csv(StringIO(curve), delimiter="\t", header=0, index_col=0)
+        names = curve[: curve.index("\n")].split("\t")
+        curve = pd.read_csv(
+            StringIO(curve),
+            delimiter="\t",
+            header=0,
+            index_col=0,
+            usecols=self._usecols(names),
+            **self._csv_separators,
+        )
         keys = curve.columns.values.tolist()
         units = units[1:]
+        if self.columns is not None:
+            units = [unit for key, unit in zip(names[1:], units) if key in keys]
 
         return keys, units, curve
 
+    def _usecols(self, names: list) -> list:
+        """helper function to select the table columns to parse (see columns)
+
+        Args:
+            names (list): column identifiers of the table, including the index column
+        Returns:
+            list: column identifiers to parse, or None for all columns
+
+        """
+        if self.columns is None:
+            return None
+        return [
+            key
+            for i, key in enumerate(names)
+            if i == self.INDEX_COL or key in self.columns
+        ]
+
     def read_curves(self) -> list:
         """helper function to iterate through curves in a dta file and save as individual dataframes
 
@@ -270,49 +966,240 @@ class GamryParser:
 
         """
 
+        with open(file=self.fname, mode="r", encoding="utf8", errors="ignore") as f:
+            f.seek(self.header_length)  # skip to end of header
+            return self._read_curves(f)
+
+    def _read_curves(self, f) -> list:
+        """helper function to read every curve from an open file handle, line-by-line (engine="python")
+
+        Args:
+            f (file): text-mode file handle, positioned at the end of the file header
+        Returns:
+            curves (list): list of DataFrames, each element representing an individual curve of experimental data.
+
+        """
+
         assert (
             len(self._header) > 0
         ), "Must read file header before curves can be extracted."
         self._curves = []
         self.curve_count = 0
 
-        with open(file=self.fname, mode="r", encoding="utf8", errors="ignore") as f:
-            f.seek(self.header_length)  # skip to end of header
-
-            while True:
+        while True:
+            with self._phase("tables"):
                 curve_keys, curve_units, curve = self._read_curve_data(f)
-                if curve.empty:
-                    break
-
-                for key in curve_keys:
-                    nonnumeric_keys = [
-                        "Over",
-                    ]
-                    if key in nonnumeric_keys:
-                        continue
-                    elif key == "Pt":
-                        if not is_numeric_dtype(curve.index):
-                            curve.index = curve.index.map(int)
-                    else:
-                        if not is_numeric_dtype(curve[key]):
-                            curve[key] = curve[key].map(locale.atof)
-
-                if not bool(self._curve_units.items()):
-                    exp_type = self._header["TAG"]
-                    for key, unit in zip(curve_keys, curve_units):
-                        if exp_type in self.REQUIRED_UNITS.keys():
-                            if key in self.REQUIRED_UNITS[exp_type].keys():
-                                assert (
-                                    unit == self.REQUIRED_UNITS[exp_type][key]
-                                ), "Unit error for '{}': Expected '{}', found '{}'!".format(
-                                    key, self.REQUIRED_UNITS[exp_type][key], unit
-                                )
-                        self._curve_units[key] = unit
-                else:
-                    for key, unit in zip(curve_keys, curve_units):
-                        assert self._curve_units[key] == unit, "Unit mismatch found!"
-
-                self._curves.append(curve)
-                self.curve_count += 1
+            if len(curve.index) == 0:
+                break
+            self._add_curve(curve_keys, curve_units, curve)
+
+        return self._curves
+
+    def _scan_curves(self, buf: bytes) -> list:
+        """helper function to locate every curve in a dta file with a single pass over the raw bytes, then
+        parse each curve with one vectorized read (engine="scan").
+
+        Args:
+            buf (bytes or mmap): contents of the DTA file
+        Returns:
+            curves (list): list of DataFrames, each element representing an individual curve of experimental data.
+
+        """
+
+        assert (
+            len(self._header) > 0
+        ), "Must read file header before curves can be extracted."
+        self._curves = []
+        self.curve_count = 0
+
+        for span in scan_tables(buf, self.header_length):
+            with self._phase("tables"):
+                curve_keys, curve_units, curve = read_table(
+                    buf,
+                    span,
+                    index_col=self.INDEX_COL,
+                    usecols=self.columns,
+                    **self._csv_separators,
+                )
+            if len(curve.index) == 0:
+                break
+            self._add_curve(curve_keys, curve_units, curve)
 
         return self._curves
+
+    def _add_curve(self, curve_keys: list, curve_units: list, curve: pd.DataFrame):
+        """helper function to convert a parsed table to numeric values, validate its units, and store it
+
+        Args:
+            curve_keys (list): column identifiers (e.g. Vf)
+            curve_units (list): column unit types (e.g. V)
+            curve (DataFrame): table data
+        Returns:
+            None
+
+        """
+
+        self._validate_units(curve_keys, curve_units)
+        with self._phase("convert"):
+            self._curves.append(self._convert_curve(curve))
+        if self.stats is not None:
+            self.stats.add_rows(self.curve_count, len(curve))
+        self.curve_count += 1
+
+    def _convert_curve(self, curve: pd.DataFrame) -> pd.DataFrame:
+        """helper function to convert any text columns left by the csv reader to numeric values
+
+        Args:
+            curve (DataFrame): table data
+        Returns:
+            curve (DataFrame): table data
+
+        """
+
+        # any text columns left by the csv reader are converted in one vectorized pass per column
+        text_keys = curve.select_dtypes(exclude="number").columns
+        text_keys = text_keys[~text_keys.isin(self.NONNUMERIC_KEYS)]
+        if len(text_keys) > 0:
+            curve[text_keys] = curve[text_keys].apply(self._to_numeric)
+            if self.stats is not None:
+                self.stats.add_fallback("locale_columns", len(text_keys))
+        if self.compact:
+            curve = self._compact_curve(curve)
+
+        return curve
+
+    def _compact_curve(self, curve: pd.DataFrame) -> pd.DataFrame:
+        """helper function to convert a curve to compact dtypes (compact=True)
+
+        Args:
+            curve (DataFrame): table data
+        Returns:
+            curve (DataFrame): table data
+
+        """
+
+        dtypes = dict()
+        for key, dtype in curve.dtypes.items():
+            compact = self.COMPACT_DTYPES.get(key, None)
+            if compact == "category" or (
+                compact is not None and self._fits(curve[key], compact)
+            ):
+                dtypes[key] = compact
+            elif dtype.kind == "f" and key not in self.PRECISE_KEYS:
+                dtypes[key] = "float32"
+        curve = curve.astype(dtypes)
+
+        compact = self.COMPACT_DTYPES.get(curve.index.name, None)
+        if compact is not None and self._fits(curve.index, compact):
+            index = curve.index.astype(compact)
+            # pandas < 2 keeps integer indexes as int64 (Int64Index)
+            if index.dtype == compact:
+                curve.index = index
+
+        return curve
+
+    @staticmethod
+    def _fits(values, dtype: str) -> bool:
+        """helper function to check that integer values can be narrowed to an integer dtype"""
+        if values.dtype.kind not in "iu" or np.dtype(dtype).kind not in "iu":
+            return False
+        if len(values) == 0:
+            return True
+        info = np.iinfo(dtype)
+        return info.min <= values.min() and values.max() <= info.max
+
+    def _validate_units(self, curve_keys: list, curve_units: list):
+        """helper function to check curve units against REQUIRED_UNITS and against previously loaded curves
+
+        Args:
+            curve_keys (list): column identifiers (e.g. Vf)
+            curve_units (list): column unit types (e.g. V)
+        Returns:
+            None
+
+        """
+
+        if not bool(self._curve_units.items()):
+            exp_type = self._header["TAG"]
+            for key, unit in zip(curve_keys, curve_units):
+                if exp_type in self.REQUIRED_UNITS.keys():
+                    if key in self.REQUIRED_UNITS[exp_type].keys():
+                        assert (
+                            unit == self.REQUIRED_UNITS[exp_type][key]
+                        ), "Unit error for '{}': Expected '{}', found '{}'!".format(
+                            key, self.REQUIRED_UNITS[exp_type][key], unit
+                        )
+                self._curve_units[key] = unit
+        else:
+            for key, unit in zip(curve_keys, curve_units):
+                assert self._curve_units[key] == unit, "Unit mismatch found!"
+
+    def _index_curves(self) -> list:
+        """helper function to record where each curve starts and ends in a dta file, without parsing curve data
+        (lazy=True). Curve units are validated while indexing.
+
+        Args:
+            None
+        Returns:
+            tables (list): TableSpan entries, one for each curve
+
+        """
+
+        self._curves = []
+        self._tables = []
+        self.curve_count = 0
+
+        with open(file=self.fname, mode="rb") as f:
+            self._read_header(f)
+            self._count_bytes(self.header_length)
+            size = os.fstat(f.fileno()).st_size
+            if self.header_length == size:
+                return self._tables
+
+            self._count_bytes(size - self.header_length)
+            with self._phase("index"), mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as buf:
+                for span in scan_tables(buf, self.header_length):
+                    curve_keys, curve_units, rows = read_columns(
+                        buf, span, index_col=self.INDEX_COL, usecols=self.columns
+                    )
+                    if not rows:
+                        break
+                    self._validate_units(curve_keys, curve_units)
+                    self._tables.append(span)
+
+        self._curves = [None] * len(self._tables)
+        self.curve_count = len(self._tables)
+        return self._tables
+
+    def _fetch_curve(self, span: TableSpan) -> pd.DataFrame:
+        """helper function to read and parse a single indexed curve (lazy=True)
+
+        Args:
+            span (TableSpan): location of the curve in the dta file
+        Returns:
+            pandas.DataFrame: (multiple columns)
+
+        """
+
+        with self._phase("read"), open(file=self.fname, mode="rb") as f:
+            f.seek(span.start)
+            buf = f.read(span.end - span.start)
+        self._count_bytes(len(buf))
+
+        with self._phase("tables"):
+            _, _, curve = read_table(
+                buf,
+                span._replace(start=0, end=len(buf)),
+                index_col=self.INDEX_COL,
+                usecols=self.columns,
+                **self._csv_separators,
+            )
+        with self._phase("convert"):
+            curve = self._convert_curve(curve)
+        if self.to_timestamp:
+            with self._phase("timestamps"):
+                curve = self._to_timestamp(curve)
+
+        return curve
@@ -0,0 +1,193 @@
+import glob
+import locale
+import pandas as pd
+
+# number of bytes read at a time while looking for the end of the header
+HEADER_BLOCKSIZE = 8192
+
+
+def _is_table_marker(key: str) -> bool:
+    """check whether a line key opens the first table (and ends the header), e.g. CURVE, ZCURVE, VFPCURVE"""
+    return key.startswith("CURVE") or any(
+        marker in key for marker in ("ZCURVE", "VFPCURVE", "EFMCURVE")
+    )
+
+
+def _float_parser(decimal: str = None):
+    """return a function converting header values to float
+
+    Args:
+        decimal (str, optional): decimal separator (".", "," or "auto"). Defaults to None (current locale).
+
+    Returns:
+        callable: str -> float
+
+    """
+    if decimal is None:
+        return locale.atof
+    separators = dict(decimal=decimal)
+
+    def atof(value: str) -> float:
+        if separators["decimal"] == "auto":
+            # resolved by the first value that contains a separator
+            if "." not in value and "," not in value:
+                return float(value)
+            separators["decimal"] = "." if "." in value else ","
+        decimal = separators["decimal"]
+        thousands = "," if decimal == "." else "."
+        return float(value.replace(thousands, "").replace(decimal, "."))
+
+    return atof
+
+
+def parse_header(buf, atof=locale.atof, keys=None, final: bool = True) -> tuple:
+    """parse the header of an EXPLAIN file from its raw bytes
+
+    Args:
+        buf (bytes): the beginning of a DTA file (at least the complete header, if `final` is False)
+        atof (callable, optional): function used to convert numeric values. Defaults to locale.atof.
+        keys (list, optional): only convert these header entries, and stop as soon as all of them are found.
+            Defaults to None (all entries).
+        final (bool, optional): True if `buf` holds the complete file. Defaults to True.
+
+    Returns:
+        header (dict): experimental header data in key-value pairs.
+        ocv (str): contents of the OCVCURVE table (column-name row and data rows), or None
+        length (int): length of header text, in # of bytes. None if `buf` ends before the header does (final=False).
+
+    """
+    size = len(buf)
+    wanted = None if keys is None else set(keys)
+    header = dict()
+    ocv = None
+
+    def readline(pos: int) -> tuple:
+        """return the line starting at pos, stripped, and the offset of the next line (None if incomplete)"""
+        end = buf.find(b"\n", pos)
+        if end < 0:
+            if not final:
+                return "", None
+            end = size - 1
+        return buf[pos : end + 1].decode("utf8", "ignore").strip(), end + 1
+
+    line, pos = readline(0)
+    if pos is None:
+        return header, ocv, None
+    if _is_table_marker(line.split("\t")[0]):
+        return header, ocv, pos
+
+    while pos < size:
+        line, pos = readline(pos)
+        if pos is None:
+            return header, ocv, None
+        cur_line = line.split("\t")
+
+        if len(cur_line) > 1 and (wanted is None or cur_line[0] in wanted):
+            # data format: key, type, value
+            if cur_line[1] in ["LABEL", "PSTAT"]:
+                header[cur_line[0]] = cur_line[2]
+            elif cur_line[1] in ["QUANT", "IQUANT", "POTEN"]:
+                header[cur_line[0]] = atof(cur_line[2])
+            elif cur_line[1] in ["IQUANT", "SELECTOR"]:
+                header[cur_line[0]] = int(cur_line[2])
+            elif cur_line[1] in ["TOGGLE"]:
+                header[cur_line[0]] = cur_line[2] == "T"
+            elif cur_line[1] == "TWOPARAM":
+                header[cur_line[0]] = {
+                    "enable": cur_line[2] == "T",
+                    "start": atof(cur_line[3]),
+                    "finish": atof(cur_line[4]),
+                }
+            elif cur_line[0] == "TAG":
+                header["TAG"] = cur_line[1]
+
+        if len(cur_line) > 2 and cur_line[0] in ["NOTES", "OCVCURVE"]:
+            # multi-line entries: NOTES text, or the OCVCURVE table (column names, units, then data rows)
+            n_lines = int(cur_line[2]) + (2 if cur_line[0] == "OCVCURVE" else 0)
+            lines = []
+            for _ in range(n_lines):
+                if pos >= size and final:
+                    break
+                line, pos = readline(pos)
+                if pos is None:
+                    return header, ocv, None
+                lines.append(line + "\n")
+            if cur_line[0] == "NOTES":
+                if wanted is None or "NOTES" in wanted:
+                    header["NOTES"] = "".join(lines)
+            elif wanted is None or "OCVCURVE" in wanted:
+                # skip the units row
+                ocv = "".join(lines[:1] + lines[2:])
+
+        if _is_table_marker(cur_line[0]):
+            return header, ocv, pos
+        if wanted is not None and wanted.issubset(header):
+            return header, ocv, pos
+
+    return header, ocv, size if final else None
+
+
+def read_header(f, atof=locale.atof, keys=None, blocksize: int = HEADER_BLOCKSIZE):
+    """read and parse the header of an EXPLAIN file, reading only as much of the file as needed
+
+    Args:
+        f (file): binary file handle, positioned at the start of the file
+        atof (callable, optional): function used to convert numeric values. Defaults to locale.atof.
+        keys (list, optional): only convert these header entries (see parse_header). Defaults to None.
+        blocksize (int, optional): size of the first read, in bytes. Defaults to HEADER_BLOCKSIZE.
+
+    Returns:
+        header (dict): experimental header data in key-value pairs.
+        ocv (str): contents of the OCVCURVE table, or None
+        length (int): length of header text, in # of bytes
+
+    """
+    buf = b""
+    while True:
+        block = f.read(blocksize)
+        buf += block
+        header, ocv, length = parse_header(buf, atof=atof, keys=keys, final=not block)
+        if length is not None:
+            return header, ocv, length
+        blocksize *= 2
+
+
+def scan_header(filename: str, keys: list = None, decimal: str = None) -> dict:
+    """read the header of a DTA file, without reading any curve data
+
+    Args:
+        filename (str): filepath to experiment data
+        keys (list, optional): header entries to return (e.g. ["TAG", "DATE", "SCANRATE"]). Defaults to None (all).
+        decimal (str, optional): decimal separator (".", "," or "auto"). Defaults to None (current locale).
+
+    Returns:
+        dict: experimental header data in key-value pairs
+
+    """
+    with open(file=filename, mode="rb") as f:
+        header, _, _ = read_header(f, atof=_float_parser(decimal), keys=keys)
+
+    return header
+
+
+def scan_headers(filenames, keys: list = None, decimal: str = None) -> pd.DataFrame:
+    """build a catalogue of experiments from the headers of many DTA files
+
+    Args:
+        filenames (str or list): glob pattern (e.g. "archive/**/*.DTA") or list of filepaths
+        keys (list, optional): header entries to include as columns. Defaults to None (all).
+        decimal (str, optional): decimal separator (".", "," or "auto"). Defaults to None (current locale).
+
+    Returns:
+        pandas.DataFrame: one row per file, indexed by filepath
+
+    """
+    if isinstance(filenames, str):
+        filenames = sorted(glob.glob(filenames, recursive=True))
+
+    rows = [scan_header(filename, keys=keys, decimal=decimal) for filename in filenames]
+    catalogue = pd.DataFrame(rows, index=pd.Index(filenames, name="filename"))
+    if keys is not None:
+        catalogue = catalogue.reindex(columns=keys)
+
+    return catalogue
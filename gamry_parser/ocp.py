@@ -2,11 +2,14 @@ import gamry_parser as parser
 import pandas as pd
 import os
 import re
+from gamry_parser.decimate import Decimation
 
 
-class OpenCircuitPotential(parser.GamryParser):
+class OpenCircuitPotential(Decimation, parser.GamryParser):
     """Load an Open Circuit Potential (CORPOT) experiment generated in Gamry EXPLAIN format."""
 
+    COLUMNS: tuple = ("T", "Vf")
+
     def curve(self):
         """retrieve OCP data
 
@@ -21,20 +24,20 @@ class OpenCircuitPotential(parser.GamryParser):
         """
 
         assert self.loaded, "DTA file not loaded. Run OpenCircuitPotential.load()"
-        df = self._curves[0]
-        return df[["T", "Vf"]]
+        return self._view(0)
 
-    def load(self, filename: str = None, to_timestamp: bool = None):
+    def load(self, filename: str = None, to_timestamp: bool = None, **kwargs):
         """save experiment information to \"header\", then save curve data to \"curves\"
 
         Args:
             filename (str, optional): file containing EXPLAIN-formatted data. defaults to None.
             to_timestamp (bool, optional): Convert sample times from seconds to datetime.datetime.isoformat(). Defaults to True
+            **kwargs: additional options passed to GamryParser.load() (e.g. engine)
         Returns:
             None
 
         """
-        super().load(filename=filename, to_timestamp=to_timestamp)
+        super().load(filename=filename, to_timestamp=to_timestamp, **kwargs)
 
         assert (
             self._header.get("TAG", "NOTFOUND") == "CORPOT"
@@ -42,5 +45,5 @@ class OpenCircuitPotential(parser.GamryParser):
             Experiment file (looking for CORPOT, received {})".format(
             self.header.get("TAG", None)
         )
-        self._ocv = self._curves[0]
+        self._ocv = self._curve(0)
         self.loaded = True
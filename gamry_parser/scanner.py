@@ -0,0 +1,428 @@
+import mmap
+import numpy as np
+import os
+import pandas as pd
+import re
+from collections import namedtuple
+from contextlib import contextmanager
+from io import RawIOBase, TextIOWrapper
+
+# any line containing one of these tokens terminates the table that precedes it
+TABLE_MARKER = re.compile(rb"CURVE|EXPERIMENTABORTED")
+NONBLANK = re.compile(rb"\S")
+# a table row that does not start with a tab
+IRREGULAR_ROW = re.compile(rb"\n[^\t\n]")
+# a line break that is not followed by a tab (i.e. a line that is blank or does not start with a tab)
+UNINDENTED_LINE = re.compile(rb"\n(?!\t)")
+
+# column dtypes implied by the units row of a table; all other units are parsed as floats
+UNIT_DTYPES = {"#": np.int64, "bits": object}
+
+# number of rows converted per read_csv() call when filling preallocated columns
+CHUNKSIZE = 1 << 16
+# number of bytes copied at a time when counting lines of a memory-mapped file
+COUNT_BLOCKSIZE = 1 << 20
+
+TableSpan = namedtuple("TableSpan", ["name", "points", "start", "end"])
+TableSpan.__doc__ = """location of a single EXPLAIN table within a DTA file
+
+    name (str): table identifier, taken from the line that opens the table (e.g. CURVE1, ZCURVE)
+    points (int): number of points declared on the opening line (None if not declared)
+    start (int): byte offset of the table's column-name line
+    end (int): byte offset of the first byte after the table's last data line
+"""
+
+
+def _line_end(buf, pos: int, end: int) -> int:
+    """return the offset of the newline terminating the line at `pos` (or `end`)"""
+    nl = buf.find(b"\n", pos, end)
+    return end if nl < 0 else nl
+
+
+def _is_tab_indented(buf, start: int, end: int) -> bool:
+    """check whether every line in a block of table rows starts with a tab"""
+    if start >= end:
+        return True
+    last = end - 1 if buf[end - 1 : end] == b"\n" else end
+    return (
+        buf[start : start + 1] == b"\t"
+        and UNINDENTED_LINE.search(buf, start, last) is None
+    )
+
+
+def _count_lines(buf, start: int, end: int) -> int:
+    """count the line breaks in buf[start:end] (mmap objects have no count(), so they are counted in blocks)"""
+    if isinstance(buf, bytes):
+        return buf.count(b"\n", start, end)
+    return sum(
+        buf[pos : min(pos + COUNT_BLOCKSIZE, end)].count(b"\n")
+        for pos in range(start, end, COUNT_BLOCKSIZE)
+    )
+
+
+@contextmanager
+def map_file(f):
+    """memory-map an open binary file for reading
+
+    Args:
+        f (file): binary file handle
+
+    Returns:
+        context manager: read-only mmap of the whole file (empty bytes for an empty file, which cannot be mapped)
+
+    """
+    if os.fstat(f.fileno()).st_size == 0:
+        yield b""
+        return
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        yield buf
+
+
+class _RegionReader(RawIOBase):
+    """read-only file object over a region of a buffer, without copying the region"""
+
+    def __init__(self, buf, start: int, end: int):
+        self._view = memoryview(buf)[start:end]
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        size = min(len(b), len(self._view) - self._pos)
+        b[:size] = self._view[self._pos : self._pos + size]
+        self._pos += size
+        return size
+
+    def close(self):
+        # release the buffer, so that an underlying mmap can be closed
+        self._view.release()
+        super().close()
+
+
+def _text_region(buf, start: int, end: int) -> TextIOWrapper:
+    """text file object over a region of a buffer, decoded as it is read (undecodable bytes are dropped)"""
+    return TextIOWrapper(
+        _RegionReader(buf, start, end), encoding="utf8", errors="ignore"
+    )
+
+
+def _table_span(marker: bytes, start: int, end: int) -> TableSpan:
+    """build a TableSpan from the line that opened the table"""
+    fields = marker.decode("utf8", "ignore").strip().split("\t")
+    points = None
+    if len(fields) > 2 and fields[2].isdigit():
+        points = int(fields[2])
+    return TableSpan(fields[0], points, start, end)
+
+
+def scan_tables(buf, offset: int) -> list:
+    """locate every table in an EXPLAIN file in a single pass over its raw bytes
+
+    Args:
+        buf (bytes or mmap): contents of the DTA file
+        offset (int): byte offset of the end of the file header (see GamryParser.header_length)
+
+    Returns:
+        list: TableSpan entries, in file order. Table boundaries are detected exactly as in GamryParser._read_curve_data().
+
+    """
+    size = len(buf)
+    marker_start = buf.rfind(b"\n", 0, max(offset - 1, 0)) + 1
+    marker = bytes(buf[marker_start:offset])
+
+    spans = []
+    start = offset
+    for match in TABLE_MARKER.finditer(buf, offset):
+        if match.start() < start:
+            # additional token on a line that has already been handled
+            continue
+        line_start = buf.rfind(b"\n", 0, match.start()) + 1
+        line_end = _line_end(buf, match.end(), size)
+        spans.append(_table_span(marker, start, line_start))
+        marker = bytes(buf[line_start:line_end])
+        start = min(line_end + 1, size)
+    spans.append(_table_span(marker, start, size))
+
+    return spans
+
+
+def read_table(
+    buf,
+    span: TableSpan,
+    index_col: int = 0,
+    usecols: list = None,
+    decimal: str = ".",
+    thousands: str = None,
+) -> tuple:
+    """parse a single EXPLAIN table using the vectorized pandas csv reader
+
+    Args:
+        buf (bytes or mmap): contents of the DTA file
+        span (TableSpan): location of the table in `buf`
+        index_col (int, optional): column to use as the DataFrame index (None for no index). Defaults to 0.
+        usecols (list, optional): columns to parse (the index column is always parsed). Defaults to None (all).
+        decimal (str, optional): decimal separator. Defaults to ".".
+        thousands (str, optional): thousands separator. Defaults to None.
+
+    Returns:
+        keys (list): column identifier (e.g. Vf)
+        units (list): column unit type (e.g. V)
+        curve (DataFrame): Table data saved as a pandas Dataframe
+
+    """
+    names, columns, units, start = _read_column_rows(buf, span)
+    if len(columns) == 0:
+        return [], [], pd.DataFrame()
+
+    end = span.end
+    if names.startswith("\t") and _is_tab_indented(buf, start, end):
+        # rows are written with a leading tab, which adds an empty first field
+        fields = ["_"] + columns
+    else:
+        # irregular rows: strip each line, as GamryParser._read_curve_data() does
+        buf = b"\n".join(line.strip() for line in bytes(buf[start:end]).splitlines())
+        start, end = 0, len(buf)
+        fields = columns
+    regular = fields is not columns
+
+    index = None if index_col is None else columns[index_col]
+    keep = _projection(columns, index_col, usecols)
+    parsed = [columns[i] for i in keep]
+    options = dict(
+        delimiter="\t",
+        header=None,
+        names=fields,
+        # with irregular rows, every field is used (short rows are padded, even if every row is short)
+        usecols=parsed if regular else None,
+        decimal=decimal,
+        thousands=thousands,
+    )
+
+    curve = None
+    if len(units) == len(columns):
+        # never allocate more rows than there are lines in the table
+        capacity = _count_lines(buf, start, end) + 1
+        if span.points is not None:
+            capacity = min(span.points, capacity)
+        with _text_region(buf, start, end) as region:
+            # closed explicitly: TextFileReader is a context manager only from pandas 1.2
+            reader = pd.read_csv(region, chunksize=CHUNKSIZE, **options)
+            try:
+                curve = _fill_columns(
+                    reader, parsed, [units[i] for i in keep], capacity, index=index
+                )
+            finally:
+                reader.close()
+    if curve is None:
+        # untyped table (e.g. mismatched separators): let pandas infer each column
+        with _text_region(buf, start, end) as region:
+            curve = pd.read_csv(region, index_col=index, **options)
+        if usecols is not None and not regular:
+            curve = curve[[key for key in parsed if key != index]]
+
+    keys = curve.columns.values.tolist()
+    if usecols is not None:
+        units = [units[i] for i in keep if i != index_col and i < len(units)]
+    elif index_col is not None:
+        units = units[:index_col] + units[index_col + 1 :]
+
+    return keys, units, curve
+
+
+def iter_table(
+    buf,
+    span: TableSpan,
+    chunksize: int = CHUNKSIZE,
+    index_col: int = 0,
+    usecols: list = None,
+    decimal: str = ".",
+    thousands: str = None,
+):
+    """parse a single EXPLAIN table in chunks of rows, without reading the whole table into memory
+
+    Args:
+        buf (bytes or mmap): contents of the DTA file
+        span (TableSpan): location of the table in `buf`
+        chunksize (int, optional): number of rows per chunk. Defaults to CHUNKSIZE.
+        index_col (int, optional): column to use as the DataFrame index (None for no index). Defaults to 0.
+        usecols (list, optional): columns to parse (the index column is always parsed). Defaults to None (all).
+        decimal (str, optional): decimal separator. Defaults to ".".
+        thousands (str, optional): thousands separator. Defaults to None.
+
+    Returns:
+        generator: DataFrame chunks. Columns with non-integer units (see UNIT_DTYPES) are parsed as floats.
+
+    """
+    names, columns, units, start = _read_column_rows(buf, span)
+    if len(columns) == 0:
+        return
+
+    end = span.end
+    if (
+        names.startswith("\t")
+        and buf[start : start + 1] in (b"\t", b"")
+        and IRREGULAR_ROW.search(buf, start, end) is None
+    ):
+        fields = ["_"] + columns
+    else:
+        # irregular rows: strip each line, as GamryParser._read_curve_data() does
+        buf = b"\n".join(line.strip() for line in bytes(buf[start:end]).splitlines())
+        start, end = 0, len(buf)
+        fields = columns
+
+    regular = fields is not columns
+    index = None if index_col is None else columns[index_col]
+    floats = [
+        key
+        for key, unit in zip(columns, units)
+        if key != index and unit not in UNIT_DTYPES
+    ]
+    if usecols is not None:
+        columns = [key for key in columns if key in usecols or key == index]
+        floats = [key for key in floats if key in columns]
+    region = _text_region(buf, start, end)
+    reader = pd.read_csv(
+        region,
+        delimiter="\t",
+        header=None,
+        names=fields,
+        # with irregular rows, every field is parsed (short rows are padded, even if every row is short)
+        usecols=columns if regular else None,
+        index_col=index,
+        chunksize=chunksize,
+        decimal=decimal,
+        thousands=thousands,
+    )
+    try:
+        for chunk in reader:
+            for key in floats:
+                if chunk[key].dtype.kind in "iu":
+                    chunk[key] = chunk[key].astype(np.float64)
+            yield chunk
+    finally:
+        reader.close()
+        region.close()
+
+
+def read_columns(
+    buf, span: TableSpan, index_col: int = 0, usecols: list = None
+) -> tuple:
+    """read the column-name and units rows of a table, without parsing its data
+
+    Args:
+        buf (bytes or mmap): contents of the DTA file
+        span (TableSpan): location of the table in `buf`
+        index_col (int, optional): column used as the DataFrame index (None for no index). Defaults to 0.
+        usecols (list, optional): columns that will be parsed (see read_table). Defaults to None (all).
+
+    Returns:
+        keys (list): column identifier (e.g. Vf), excluding the index column
+        units (list): column unit type (e.g. V), excluding the index column
+        rows (bool): True if the table contains data rows
+
+    """
+    _, columns, units, start = _read_column_rows(buf, span)
+    if len(columns) == 0:
+        return [], [], False
+
+    rows = NONBLANK.search(buf, start, span.end) is not None
+    if usecols is not None:
+        keep = _projection(columns, index_col, usecols)
+        columns = [columns[i] for i in keep if i != index_col]
+        units = [units[i] for i in keep if i != index_col and i < len(units)]
+    elif index_col is not None:
+        columns = columns[:index_col] + columns[index_col + 1 :]
+        units = units[:index_col] + units[index_col + 1 :]
+
+    return columns, units, rows
+
+
+def _projection(columns: list, index_col: int, usecols: list) -> list:
+    """positions of the table columns to parse: the index column, and any column listed in `usecols`"""
+    return [
+        i
+        for i, key in enumerate(columns)
+        if usecols is None or i == index_col or key in usecols
+    ]
+
+
+def _read_column_rows(buf, span: TableSpan) -> tuple:
+    """split the column-name and units rows of a table
+
+    Returns:
+        names (str): raw column-name row
+        columns (list): column identifiers (empty if the table has no column-name row)
+        units (list): column unit types
+        start (int): byte offset of the first data row
+    """
+    names_end = _line_end(buf, span.start, span.end)
+    names = bytes(buf[span.start : names_end]).decode("utf8", "ignore")
+    if len(names.strip()) == 0:
+        return names, [], [], span.end
+
+    units_end = _line_end(buf, names_end + 1, span.end)
+    units = bytes(buf[names_end + 1 : units_end]).decode("utf8", "ignore")
+
+    return (
+        names,
+        names.strip().split("\t"),
+        units.strip().split("\t"),
+        min(units_end + 1, span.end),
+    )
+
+
+def _fill_columns(
+    reader, columns: list, units: list, capacity: int, index: str = None
+) -> pd.DataFrame:
+    """convert table rows into preallocated column arrays, with dtypes chosen from the units row
+
+    Args:
+        reader (TextFileReader): chunked pandas reader over the table rows
+        columns (list): column identifiers
+        units (list): column unit types, used to select each column's dtype (see UNIT_DTYPES)
+        capacity (int): expected number of rows. Arrays are grown if the table turns out to be longer.
+        index (str, optional): column to use as the DataFrame index. Defaults to None.
+
+    Returns:
+        pandas.DataFrame: table data, or None if a column does not match the dtype implied by its unit
+
+    """
+    arrays = [
+        np.empty(capacity, dtype=UNIT_DTYPES.get(unit, np.float64)) for unit in units
+    ]
+    integral = [True] * len(columns)
+    rows = 0
+    for chunk in reader:
+        size = len(chunk)
+        if rows + size > capacity:
+            capacity = max(2 * capacity, rows + size)
+            for i, array in enumerate(arrays):
+                arrays[i] = np.empty(capacity, dtype=array.dtype)
+                arrays[i][:rows] = array[:rows]
+
+        for i, key in enumerate(columns):
+            values = chunk[key]
+            kind = arrays[i].dtype.kind
+            if kind == "i" and values.dtype.kind != "i":
+                return None
+            if kind == "f" and values.dtype.kind not in "if":
+                return None
+            if kind == "O" and values.dtype.kind != "O":
+                return None
+            integral[i] = integral[i] and values.dtype.kind == "i"
+            arrays[i][rows : rows + size] = values.to_numpy()
+        rows += size
+
+    curve = {}
+    for i, key in enumerate(columns):
+        array = arrays[i][:rows]
+        if integral[i] and array.dtype.kind == "f":
+            # match pandas type inference for float columns that only hold integers
+            array = array.astype(np.int64)
+        curve[key] = array
+
+    if index is None:
+        return pd.DataFrame(curve, copy=False)
+    index = pd.Index(curve.pop(index), name=index)
+    return pd.DataFrame(curve, index=index, copy=False)
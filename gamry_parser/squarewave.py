@@ -4,17 +4,20 @@ import gamry_parser as parser
 class SquareWaveVoltammetry(parser.GamryParser):
     """Load a Square Wave Voltammetry (SWV) experiment generated in Gamry EXPLAIN format."""
 
-    def load(self, filename: str = None, to_timestamp: bool = None):
+    COLUMNS: tuple = ("T", "Vfwd", "Vrev", "Vstep", "Ifwd", "Irev", "Idif")
+
+    def load(self, filename: str = None, to_timestamp: bool = None, **kwargs):
         """save experiment information to \"header\", then save curve data to \"curves\"
 
         Args:
             filename (str, optional): file containing VFP600 data. defaults to None.
+            **kwargs: additional options passed to GamryParser.load() (e.g. engine)
         Returns:
             None
 
         """
         super(SquareWaveVoltammetry, self).load(
-            filename=filename, to_timestamp=to_timestamp
+            filename=filename, to_timestamp=to_timestamp, **kwargs
         )
         typecheck = self.header.get("TAG", None)
         assert (
@@ -75,6 +78,4 @@ class SquareWaveVoltammetry(parser.GamryParser):
         ), "Invalid curve ({}). File contains {} total curves.".format(
             curve, self.curve_count
         )
-        df = self._curves[curve]
-
-        return df[["T", "Vfwd", "Vrev", "Vstep", "Ifwd", "Irev", "Idif"]]
+        return self._view(curve)
@@ -0,0 +1,111 @@
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+
+class ParseStats:
+    """Timings and counters recorded while a GamryParser loads a file (see the `profile` option of load()).
+
+    Wall time is accumulated per parsing phase:
+        header: parsing the file header (including the OCVCURVE table)
+        read: reading the file contents into memory (scan engine)
+        index: locating curves in the file (lazy=True)
+        tables: parsing curve tables (line-by-line reads and pd.read_csv)
+        convert: converting text columns to numeric values (locale separators)
+        timestamps: converting sample times to pd.Timestamp (to_timestamp=True)
+        cache: reading or writing the parse cache
+        block: joining curves into a single DataFrame (storage="block")
+        decimate: decimating curves (see ChronoAmperometry.decimate(), after load())
+
+    Each measurement is also passed to `hook` (if set) as hook(event, data), where event is one of "phase"
+    (data: name, seconds), "curve" (data: curve, rows), "fallback" (data: name, count) or "load" (data: as_dict()).
+    """
+
+    def __init__(self, hook=None):
+        """ParseStats.__init__
+
+        Args:
+            hook (callable, optional): called with (event, data) for each measurement, e.g. to forward stats to a
+                logger or metrics pipeline. Defaults to None.
+
+        Returns:
+            None
+
+        """
+        self.hook = hook
+        self.elapsed = 0.0
+        self.phases = OrderedDict()
+        self.bytes_read = 0
+        self.rows = OrderedDict()
+        self.fallbacks = Counter()
+
+    @contextmanager
+    def phase(self, name: str):
+        """time a parsing phase (accumulated over repeated calls)
+
+        Args:
+            name (str): phase name
+        Returns:
+            context manager
+
+        """
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            seconds = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+            self._emit("phase", dict(name=name, seconds=seconds))
+
+    def add_bytes(self, count: int):
+        """record bytes read from the file"""
+        self.bytes_read += count
+
+    def add_rows(self, curve: int, rows: int):
+        """record the number of rows parsed for a curve (zero-based curve index)"""
+        self.rows[curve] = rows
+        self._emit("curve", dict(curve=curve, rows=rows))
+
+    def add_fallback(self, name: str, count: int = 1):
+        """record use of a slower parsing path (e.g. locale_columns: columns converted with locale separators)"""
+        if count > 0:
+            self.fallbacks[name] += count
+            self._emit("fallback", dict(name=name, count=count))
+
+    def finish(self, elapsed: float):
+        """record the total wall time of load()"""
+        self.elapsed = elapsed
+        self._emit("load", self.as_dict())
+
+    def as_dict(self) -> dict:
+        """return the recorded stats as plain python types (e.g. for json export)
+
+        Args:
+            None
+        Returns:
+            dict: elapsed, phases, bytes_read, rows (per curve), fallbacks
+
+        """
+        return dict(
+            elapsed=self.elapsed,
+            phases=dict(self.phases),
+            bytes_read=self.bytes_read,
+            rows=dict(self.rows),
+            fallbacks=dict(self.fallbacks),
+        )
+
+    def _emit(self, event: str, data: dict):
+        if self.hook is not None:
+            self.hook(event, data)
+
+    def __repr__(self) -> str:
+        phases = ", ".join(
+            "{}={:.4f}s".format(name, seconds) for name, seconds in self.phases.items()
+        )
+        return "ParseStats(elapsed={:.4f}s, {}, bytes_read={}, rows={}, fallbacks={})".format(
+            self.elapsed,
+            phases,
+            self.bytes_read,
+            sum(self.rows.values()),
+            dict(self.fallbacks),
+        )
@@ -0,0 +1,413 @@
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import uuid
+from collections import namedtuple
+import pandas as pd
+from .gamryparser import GamryParser
+from .batch import load_batch
+from .cache import _load_table, _save_table
+from .export import PARSER_CLASSES
+
+# version of the store layout; stores written with another version must be rebuilt
+STORE_FORMAT = 1
+
+# header entries indexed by default, as columns of the index (see ExperimentStore.query())
+INDEX_KEYS = (
+    "TAG",
+    "TITLE",
+    "DATE",
+    "TIME",
+    "PSTAT",
+    "SCANRATE",
+    "VINIT",
+    "VLIMIT1",
+    "VLIMIT2",
+    "VFINAL",
+    "CYCLES",
+    "SAMPLETIME",
+    "FREQINIT",
+    "FREQFINAL",
+    "PTSPERDEC",
+    "VDC",
+    "VAC",
+    "AREA",
+)
+
+# columns of the index that do not hold header entries
+STORE_COLUMNS = (
+    "path",
+    "mtime",
+    "size",
+    "parser",
+    "start",
+    "curve_count",
+    "entry",
+    "data",
+)
+
+# number of ingested files written to the index per transaction
+COMMIT_INTERVAL = 1000
+
+IngestResult = namedtuple("IngestResult", ["added", "updated", "unchanged", "failed"])
+IngestResult.__doc__ = """outcome of ExperimentStore.ingest()
+
+    added (list): filepaths added to the store
+    updated (list): filepaths re-ingested, because their mtime or size changed
+    unchanged (int): number of files skipped, because they were ingested before and are unchanged
+    failed (dict): exception raised while loading each file that could not be ingested, by filepath
+"""
+
+
+class ExperimentStore:
+    """Store of many experiments: header entries are indexed in a SQLite database, and curves are stored as one
+    .npy file per column (loaded as memory maps, see ParseCache).
+
+    Files are ingested once (ingest()), and found with queries on their header entries (query()), without opening
+    the original DTA files. Each indexed file records its mtime and size: ingesting it again only re-parses it when
+    either has changed.
+    """
+
+    def __init__(self, directory: str, keys: list = None):
+        """ExperimentStore.__init__
+
+        Args:
+            directory (str): store location. Created if it does not exist.
+            keys (list, optional): header entries to index, in addition to those of an existing store. Entries
+                added to an existing store are filled in from the stored headers. Defaults to None (INDEX_KEYS).
+
+        Returns:
+            None
+
+        """
+        self.directory = directory
+        os.makedirs(os.path.join(self.directory, "curves"), exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(self.directory, "index.sqlite"))
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        meta = dict(self._db.execute("SELECT key, value FROM meta"))
+        if meta:
+            assert (
+                int(meta["format"]) == STORE_FORMAT
+            ), "Unsupported store format ({})".format(meta["format"])
+            self.keys = json.loads(meta["keys"])
+        else:
+            self._db.execute(
+                "CREATE TABLE experiments (path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, parser TEXT, "
+                "start TEXT, curve_count INTEGER, entry TEXT, data TEXT)"
+            )
+            self._db.execute("CREATE INDEX experiments_start ON experiments (start)")
+            self._db.execute(
+                "INSERT INTO meta VALUES ('format', ?)", (str(STORE_FORMAT),)
+            )
+            self.keys = []
+        self._add_keys(INDEX_KEYS if keys is None and not meta else keys or [])
+        self._db.commit()
+
+    def _add_keys(self, keys: list):
+        """helper function to add header entries to the index, filled in from the stored headers"""
+        keys = [key for key in keys if key not in self.keys]
+        for key in keys:
+            assert re.fullmatch(r"\w+", key), "Invalid header entry '{}'".format(key)
+            assert (
+                key.lower() not in STORE_COLUMNS
+            ), "Reserved header entry '{}'".format(key)
+            self._db.execute("ALTER TABLE experiments ADD COLUMN {}".format(key))
+            self._db.execute(
+                "CREATE INDEX experiments_{0} ON experiments ({0})".format(key)
+            )
+        if len(keys) == 0:
+            return
+
+        rows = self._db.execute("SELECT path, data FROM experiments").fetchall()
+        self._db.executemany(
+            "UPDATE experiments SET {} WHERE path = ?".format(
+                ", ".join("{} = ?".format(key) for key in keys)
+            ),
+            [
+                [
+                    _index_value(json.loads(data)["header"].get(key, None))
+                    for key in keys
+                ]
+                + [path]
+                for path, data in rows
+            ],
+        )
+        self.keys = self.keys + keys
+        self._db.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('keys', ?)", (json.dumps(self.keys),)
+        )
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM experiments").fetchone()[0]
+
+    def close(self):
+        """close the index database"""
+        self._db.close()
+
+    def ingest(
+        self, filenames, executor: str = "thread", max_workers: int = None, **kwargs
+    ) -> IngestResult:
+        """parse and store DTA files that are not in the store, or that changed since they were ingested
+
+        Args:
+            filenames (str or list): glob pattern (e.g. "archive/**/*.DTA") or list of filepaths
+            executor (str, optional): "thread" or "process" pool used to parse files (see load_batch()). Defaults
+                to "thread".
+            max_workers (int, optional): number of workers. Defaults to None (number of CPUs).
+            **kwargs: options passed to the load() method of each parser (e.g. engine, decimal). Curves are stored
+                with sample times in seconds (see open() to convert them).
+
+        Returns:
+            IngestResult: added, updated, unchanged and failed files
+
+        """
+        if isinstance(filenames, str):
+            filenames = sorted(glob.glob(filenames, recursive=True))
+
+        known = {
+            path: (mtime, size, entry)
+            for path, mtime, size, entry in self._db.execute(
+                "SELECT path, mtime, size, entry FROM experiments"
+            )
+        }
+        stats = dict()
+        failed = dict()
+        unchanged = 0
+        for filename in filenames:
+            try:
+                stat = os.stat(filename)
+            except OSError as error:
+                failed[filename] = error
+                continue
+            previous = known.get(os.path.abspath(filename), None)
+            if previous is not None and previous[:2] == (
+                stat.st_mtime_ns,
+                stat.st_size,
+            ):
+                unchanged += 1
+            else:
+                stats[filename] = stat
+
+        added = []
+        updated = []
+        obsolete = []
+        options = dict(kwargs, to_timestamp=False, lazy=False)
+        results = load_batch(
+            list(stats), executor=executor, max_workers=max_workers, **options
+        )
+        for result in results:
+            if result.error is not None:
+                failed[result.filename] = result.error
+                continue
+            path = os.path.abspath(result.filename)
+            entry = self._store(result.parser, path, stats[result.filename])
+            if path in known:
+                updated.append(result.filename)
+                if known[path][2] != entry:
+                    obsolete.append(known[path][2])
+            else:
+                added.append(result.filename)
+            if (len(added) + len(updated)) % COMMIT_INTERVAL == 0:
+                self._commit(obsolete)
+
+        self._commit(obsolete)
+        return IngestResult(added, updated, unchanged, failed)
+
+    def _store(self, gp: GamryParser, path: str, stat: os.stat_result) -> str:
+        """helper function to write the curves of a loaded experiment, and add it to the index
+
+        Returns:
+            str: side-file directory of the experiment (unique to this write)
+        """
+        entry = "{}.{}".format(
+            hashlib.sha1(path.encode()).hexdigest(), uuid.uuid4().hex
+        )
+        target = os.path.join(self.directory, "curves", entry)
+        staging = tempfile.mkdtemp(
+            dir=os.path.join(self.directory, "curves"), prefix=".tmp"
+        )
+        try:
+            data = dict(
+                header=gp.header,
+                header_length=gp.header_length,
+                curve_units=gp._curve_units,
+                curves=[
+                    _save_table(staging, "curve{}".format(i), curve)
+                    for i, curve in enumerate(gp.curves)
+                ],
+                ocv=None if gp._ocv is None else _save_table(staging, "ocv", gp._ocv),
+            )
+            os.replace(staging, target)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        try:
+            start = str(gp.start_time)
+        except (KeyError, ValueError):
+            start = None
+        values = dict(
+            path=path,
+            mtime=stat.st_mtime_ns,
+            size=stat.st_size,
+            parser=type(gp).__name__,
+            start=start,
+            curve_count=gp.curve_count,
+            entry=entry,
+            data=json.dumps(data, default=str),
+        )
+        values.update(
+            {key: _index_value(gp.header.get(key, None)) for key in self.keys}
+        )
+        self._db.execute(
+            "INSERT OR REPLACE INTO experiments ({}) VALUES ({})".format(
+                ", ".join(values), ", ".join("?" * len(values))
+            ),
+            list(values.values()),
+        )
+        return entry
+
+    def _commit(self, obsolete: list):
+        """helper function to commit the index, then remove side files that it no longer refers to"""
+        self._db.commit()
+        while obsolete:
+            shutil.rmtree(
+                os.path.join(self.directory, "curves", obsolete.pop()),
+                ignore_errors=True,
+            )
+
+    def remove(self, filenames):
+        """remove experiments from the store
+
+        Args:
+            filenames (str or list): filepath or list of filepaths (as ingested)
+        Returns:
+            None
+
+        """
+        if isinstance(filenames, str):
+            filenames = [filenames]
+        obsolete = []
+        for filename in filenames:
+            path = os.path.abspath(filename)
+            row = self._db.execute(
+                "SELECT entry FROM experiments WHERE path = ?", (path,)
+            ).fetchone()
+            if row is not None:
+                self._db.execute("DELETE FROM experiments WHERE path = ?", (path,))
+                obsolete.append(row[0])
+        self._commit(obsolete)
+
+    def query(self, where: str = None, params: tuple = (), **filters) -> pd.DataFrame:
+        """find experiments by their header entries
+
+        Filters are given as keyword arguments, on indexed header entries (see `keys`) or the columns parser,
+        start (experiment start time, e.g. "2024-03-01 12:00:00") and curve_count. A filter value is matched
+        as follows:
+            tuple (low, high): low <= value < high (either bound may be None)
+            list: value is one of the list
+            other: value is equal
+
+        e.g. store.query(TAG="CV", PSTAT="REF600-13010", SCANRATE=(50, None), start=("2024-03", "2024-04"))
+
+        Args:
+            where (str, optional): additional SQL condition, e.g. "SCANRATE > ? OR AREA < ?". Defaults to None.
+            params (tuple, optional): values of the ? placeholders in `where`. Defaults to ().
+            **filters: conditions on indexed columns
+
+        Returns:
+            pandas.DataFrame: parser, start, curve_count and indexed header entries of matching experiments,
+                indexed by filepath
+
+        """
+        columns = ["parser", "start", "curve_count"] + self.keys
+        clauses = []
+        values = []
+        for key, value in filters.items():
+            assert key in columns, "Unknown column '{}'. Indexed columns are {}".format(
+                key, columns
+            )
+            if isinstance(value, tuple):
+                low, high = value
+                if low is not None:
+                    clauses.append("{} >= ?".format(key))
+                    values.append(_query_value(key, low))
+                if high is not None:
+                    clauses.append("{} < ?".format(key))
+                    values.append(_query_value(key, high))
+            elif isinstance(value, list):
+                clauses.append("{} IN ({})".format(key, ", ".join("?" * len(value))))
+                values.extend(_query_value(key, item) for item in value)
+            else:
+                clauses.append("{} = ?".format(key))
+                values.append(_query_value(key, value))
+        if where is not None:
+            clauses.append("({})".format(where))
+            values.extend(params)
+
+        sql = "SELECT path AS filename, {} FROM experiments".format(", ".join(columns))
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY start, path"
+        return pd.read_sql_query(sql, self._db, params=values, index_col="filename")
+
+    def open(
+        self, filename: str, to_timestamp: bool = False, time_index: bool = False
+    ) -> GamryParser:
+        """open a stored experiment, without reading the original DTA file
+
+        Curves are memory-mapped from the store: their columns are only read from disk when they are accessed.
+
+        Args:
+            filename (str): filepath (as ingested, or an index entry of query())
+            to_timestamp (bool, optional): convert sample times to pd.Timestamp (read all curves). Defaults to
+                False.
+            time_index (bool, optional): use sample times as the index of each curve (see GamryParser). Defaults
+                to False.
+
+        Returns:
+            GamryParser: loaded experiment (the parser class it was ingested with)
+
+        """
+        path = os.path.abspath(filename)
+        row = self._db.execute(
+            "SELECT parser, entry, data FROM experiments WHERE path = ?", (path,)
+        ).fetchone()
+        assert row is not None, "'{}' is not in the store".format(filename)
+        name, entry, data = row
+        entry = os.path.join(self.directory, "curves", entry)
+        data = json.loads(data)
+
+        gp = PARSER_CLASSES.get(name, GamryParser)(
+            filename=path, to_timestamp=to_timestamp, time_index=time_index
+        )
+        gp._set_separators(".")
+        gp._header.update(data["header"])
+        gp.header_length = data["header_length"]
+        gp._curve_units.update(data["curve_units"])
+        gp._ocv = None if data["ocv"] is None else _load_table(entry, data["ocv"])
+        gp._curves = [_load_table(entry, layout) for layout in data["curves"]]
+        gp.curve_count = len(gp._curves)
+        if gp.to_timestamp:
+            gp._convert_T_to_Timestamp()
+        gp.loaded = True
+        return gp
+
+
+def _index_value(value):
+    """helper function to convert a header entry to a value of the index (nested entries are not indexed)"""
+    return None if isinstance(value, (dict, list)) else value
+
+
+def _query_value(key: str, value):
+    """helper function to convert a query value to a value of the index"""
+    if key == "start" and not isinstance(value, str):
+        return str(pd.Timestamp(value))
+    return value
@@ -0,0 +1,209 @@
+import os
+import time
+from collections import namedtuple
+from .gamryparser import GamryParser
+from .header import parse_header
+from .scanner import TABLE_MARKER, TableSpan, read_table
+
+TailBatch = namedtuple("TailBatch", ["curve", "rows"])
+TailBatch.__doc__ = """rows appended to a DTA file since the previous poll
+
+    curve (int): index of the curve the rows belong to (zero-based, as in GamryParser.curve())
+    rows (DataFrame): new rows, converted as in GamryParser.load()
+"""
+
+
+class TailReader:
+    """Incrementally read a DTA file that is still being written (e.g. a running CHRONOA or CORPOT experiment).
+
+    Each poll reads only the bytes appended since the previous poll, up to the last complete line. The reader keeps
+    track of the current table, so that new rows are parsed with the column names and units of their table, and
+    detects new CURVE tables and EXPERIMENTABORTED markers as they appear.
+    """
+
+    def __init__(self, filename: str, parser=GamryParser, **kwargs):
+        """TailReader.__init__
+
+        Args:
+            filename (str): filepath to experiment data
+            parser (type, optional): GamryParser subclass used to convert and store the data. Defaults to GamryParser.
+            **kwargs: additional options passed to the parser (e.g. to_timestamp, decimal)
+
+        Returns:
+            None
+
+        """
+        self.fname = filename
+        self.offset = 0
+        self.aborted = False
+        self._parser = parser(filename=filename, **kwargs)
+        self._parser._set_separators()
+        self._table = None
+        self._columns = None
+        self._rows = 0
+        self._batches = []
+
+    @property
+    def parser(self) -> GamryParser:
+        """return the parser holding the header and every row read so far"""
+        gp = self._parser
+        for curve, batches in enumerate(self._batches):
+            if len(batches) == 0:
+                continue
+            if curve < len(gp._curves):
+                batches.insert(0, gp._curves[curve])
+                gp._curves[curve] = gp._concat(batches)
+            else:
+                gp._curves.append(gp._concat(batches))
+            gp._views.pop(curve, None)
+            batches.clear()
+        gp.curve_count = len(gp._curves)
+
+        return gp
+
+    @property
+    def curve_count(self) -> int:
+        """return the number of tables found so far"""
+        return len(self._batches)
+
+    def poll(self, final: bool = False) -> list:
+        """read the rows appended to the file since the previous poll
+
+        Args:
+            final (bool, optional): the file is complete, so a last line without a line break is parsed too.
+                Defaults to False.
+        Returns:
+            list: TailBatch entries, one per curve that received new rows (in file order)
+
+        """
+        size = os.path.getsize(self.fname)
+        assert size >= self.offset, "The file '{}' was truncated.".format(self.fname)
+        if self.aborted or size == self.offset:
+            return []
+
+        with open(file=self.fname, mode="rb") as f:
+            f.seek(self.offset)
+            buf = f.read(size - self.offset)
+        if final and not buf.endswith(b"\n"):
+            buf += b"\n"
+        if not self._parser.loaded:
+            batches = self._read_header(buf)
+        else:
+            # only complete lines are parsed; a partially written line is read again by the next poll
+            batches = self._read_tables(buf, buf.rfind(b"\n") + 1)
+
+        return batches
+
+    def follow(self, interval: float = 1.0, timeout: float = None, callback=None):
+        """poll the file until the experiment is aborted, or no data is appended for `timeout` seconds
+
+        Args:
+            interval (float, optional): time between polls, in seconds. Defaults to 1.0.
+            timeout (float, optional): stop after this many seconds without new data. Defaults to None (never).
+            callback (callable, optional): called with each TailBatch as it is read. Defaults to None.
+
+        Returns:
+            generator: TailBatch entries, as they are read
+
+        """
+        idle = time.monotonic()
+        while not self.aborted:
+            batches = self.poll()
+            for batch in batches:
+                if callback is not None:
+                    callback(batch)
+                yield batch
+            if len(batches) > 0:
+                idle = time.monotonic()
+            elif timeout is not None and time.monotonic() - idle >= timeout:
+                break
+            if not self.aborted:
+                time.sleep(interval)
+
+    def _read_header(self, buf: bytes) -> list:
+        """helper function to parse the file header, once it has been completely written"""
+        gp = self._parser
+        header, ocv, length = parse_header(buf, atof=gp._atof, final=False)
+        if length is None:
+            return []
+
+        gp._store_header(header, ocv, length)
+        gp.loaded = True
+        marker = buf[buf.rfind(b"\n", 0, max(length - 1, 0)) + 1 : length]
+        self._table = marker.decode("utf8", "ignore").strip().split("\t")[0]
+        self.offset = length
+        end = buf.rfind(b"\n") + 1
+        return self._read_tables(buf[length:], end - length)
+
+    def _read_tables(self, buf: bytes, end: int) -> list:
+        """helper function to parse complete lines appended to the current table (and any tables that follow)"""
+        batches = []
+        pos = 0
+        while pos < end and not self.aborted:
+            if self._columns is None:
+                # the table's column-name and units lines
+                names_end = buf.find(b"\n", pos, end)
+                units_end = (
+                    buf.find(b"\n", names_end + 1, end) if names_end >= 0 else -1
+                )
+                if units_end < 0:
+                    break
+                self._columns = buf[pos : units_end + 1]
+                keys, units, _ = read_table(
+                    self._columns,
+                    TableSpan(self._table, None, 0, len(self._columns)),
+                    index_col=self._parser.INDEX_COL,
+                    usecols=self._parser.columns,
+                )
+                self._parser._validate_units(keys, units)
+                self._batches.append([])
+                self._rows = 0
+                pos = units_end + 1
+                continue
+
+            marker = TABLE_MARKER.search(buf, pos, end)
+            rows_end = (
+                end if marker is None else buf.rfind(b"\n", 0, marker.start()) + 1
+            )
+            rows_end = max(rows_end, pos)
+            if rows_end > pos:
+                batches.append(self._read_rows(buf[pos:rows_end]))
+            pos = rows_end
+            if marker is None:
+                break
+
+            # a new table, or the end of the experiment
+            line_end = buf.find(b"\n", marker.end(), end)
+            line = buf[pos:line_end].decode("utf8", "ignore").strip()
+            if "EXPERIMENTABORTED" in line:
+                self.aborted = True
+            else:
+                self._table = line.split("\t")[0]
+                self._columns = None
+            pos = line_end + 1
+
+        self.offset += pos
+        return [batch for batch in batches if len(batch.rows) > 0]
+
+    def _read_rows(self, rows: bytes) -> TailBatch:
+        """helper function to parse a block of complete table rows"""
+        gp = self._parser
+        block = self._columns + rows
+        _, _, curve = read_table(
+            block,
+            TableSpan(self._table, None, 0, len(block)),
+            index_col=gp.INDEX_COL,
+            usecols=gp.columns,
+            **gp._csv_separators,
+        )
+        if gp.INDEX_COL is None:
+            # continue the row count of the table
+            curve.index = curve.index + self._rows
+        self._rows += len(curve)
+        curve = gp._convert_curve(curve)
+        if gp.to_timestamp:
+            curve = gp._to_timestamp(curve)
+
+        curve_index = len(self._batches) - 1
+        self._batches[curve_index].append(curve)
+        return TailBatch(curve_index, curve)
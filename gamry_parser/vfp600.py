@@ -7,31 +7,38 @@ from io import StringIO
 class VFP600(parser.GamryParser):
     """Load experiment data generated by Gamry VFP600 software (expected in EXPLAIN format, including header)"""
 
-    def __init__(self, filename: str = None, to_timestamp: bool = None):
+    # VFP600 tables do not include a point index column
+    INDEX_COL: int = None
+    COLUMNS: tuple = ("T", "Voltage", "Current")
+
+    def __init__(self, filename: str = None, to_timestamp: bool = None, **kwargs):
         """VFP600.__init__
 
         Args:
             filename (str, optional): filepath containing CHRONOA experiment data. Defaults to None
             to_timestamp (bool, optional): this argument is ignored by the VFP600 class.
+            **kwargs: additional options passed to GamryParser.__init__()
         Returns:
             None
 
         """
         # No information about experiment time is available with VFP600 files, so no conversion of samples to pd.Timestamp is possible.
-        super().__init__(filename=filename, to_timestamp=False)
+        super().__init__(filename=filename, to_timestamp=False, **kwargs)
 
-    def load(self, filename: str = None):
+    def load(self, filename: str = None, **kwargs):
         """save experiment information to \"header\", then save curve data to \"curves\"
 
         Args:
             filename (str, optional): file containing VFP600 data. defaults to None.
+            **kwargs: additional options passed to GamryParser.load() (e.g. engine)
         Returns:
             None
 
         """
 
         # No information about experiment time is available with VFP600 files, so no conversion of samples to pd.Timestamp is possible.
-        super().load(filename=filename, to_timestamp=False)
+        kwargs.pop("to_timestamp", None)
+        super().load(filename=filename, to_timestamp=False, **kwargs)
 
     def curve(self, curve=0):
         """retrieve chronoamperometry experiment data
@@ -47,9 +54,7 @@ class VFP600(parser.GamryParser):
         """
 
         assert self.loaded, "DTA file not loaded. Run ChronoAmperometry.load()"
-        df = self._curves[curve]
-        df["T"] = df.index * self.sample_time
-        return df[["T", "Voltage", "Current"]]
+        return self._view(curve)
 
     @property
     def sample_time(self):
@@ -78,7 +83,20 @@ class VFP600(parser.GamryParser):
 
         """
 
-        return len(self._curves[curve - 1].index) if len(self._curves) > 0 else 0
+        return len(self._curve(curve - 1).index) if self.curve_count > 0 else 0
+
+    def _convert_curve(self, curve: pd.DataFrame) -> pd.DataFrame:
+        """helper function to convert text columns to numeric values, and add the sample time (T, in seconds)
+
+        Args:
+            curve (DataFrame): table data
+        Returns:
+            curve (DataFrame): table data
+
+        """
+        curve = super()._convert_curve(curve)
+        curve.insert(0, "T", curve.index * self.sample_time)
+        return curve
 
     def _read_curve_data(self, fid: int):
         """helper function to process an EXPLAIN Table
@@ -105,8 +123,16 @@ class VFP600(parser.GamryParser):
             if fid.tell() == pos:
                 break
 
-        curve = pd.read_csv(StringIO(curve), delimiter="\t", header=0)
+        names = curve[: curve.index("\n")].split("\t")
+        curve = pd.read_csv(
+            StringIO(curve),
+            delimiter="\t",
+            header=0,
+            usecols=self._usecols(names),
+            **self._csv_separators,
+        )
         keys = curve.columns.values.tolist()
-        units = units[1:]
+        # VFP600 tables have no index column: each name has a unit
+        units = [unit for key, unit in zip(names, units) if key in keys]
 
         return keys, units, curve
@@ -23,6 +23,7 @@ setup(
     long_description=io.open("README.md", encoding="utf-8").read(),
     long_description_content_type="text/markdown",
     install_requires=get_requirements(),
+    extras_require={"arrow": ["pyarrow"]},
     test_suite="tests",
     classifiers=[
         "License :: OSI Approved :: MIT License",
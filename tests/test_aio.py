@@ -0,0 +1,67 @@
+import asyncio
+import gamry_parser as parser
+import gamry_parser.aio as aio
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pandas.testing import assert_frame_equal
+
+
+class TestAsync(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_load(self):
+        expected = parser.CyclicVoltammetry(filename="tests/cv_data.dta")
+        expected.load()
+
+        async def load_all():
+            agp = parser.AsyncGamryParser(
+                "tests/cv_data.dta", parser=parser.CyclicVoltammetry
+            )
+            gp, ocp = await asyncio.gather(
+                agp.load(),
+                aio.load("tests/ocp_data.dta", parser=parser.OpenCircuitPotential),
+            )
+            curves = [curve async for curve in agp]
+            return gp, ocp, curves
+
+        gp, ocp, curves = self.loop.run_until_complete(load_all())
+        self.assertTrue(gp.loaded)
+        self.assertEqual(gp.header, expected.header)
+        self.assertEqual(len(curves), 5)
+        for curve in range(5):
+            assert_frame_equal(curves[curve], expected.curve(curve))
+        self.assertEqual(ocp.experiment_type, "CORPOT")
+        self.assertEqual(len(ocp.curve()), 21)
+
+    def test_executors(self):
+        async def load_lazy():
+            agp = parser.AsyncGamryParser("tests/cv_data.dta", lazy=True)
+            await agp.load()
+            return [curve async for curve in agp.curves()]
+
+        curves = self.loop.run_until_complete(load_lazy())
+        self.assertEqual([len(curve) for curve in curves], [10] * 5)
+
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            gp = self.loop.run_until_complete(
+                aio.load("tests/chronoa_data.dta", executor=executor, engine="scan")
+            )
+        self.assertEqual(gp.curve_count, 1)
+        self.assertIsNone(gp._buffer)
+
+    def test_tail(self):
+        async def follow():
+            return [
+                batch
+                async for batch in aio.tail(
+                    "tests/eispot_data_curveaborted.dta", interval=0
+                )
+            ]
+
+        batches = self.loop.run_until_complete(follow())
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(batches[0].rows.shape, (5, 10))
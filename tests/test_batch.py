@@ -0,0 +1,43 @@
+import gamry_parser as parser
+import unittest
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def test_experiment_class(self):
+        self.assertEqual(
+            parser.experiment_class("tests/cv_data.dta"), parser.CyclicVoltammetry
+        )
+        self.assertEqual(
+            parser.experiment_class("tests/ocp_data.dta"), parser.OpenCircuitPotential
+        )
+        self.assertEqual(
+            parser.experiment_class("tests/vfp600_data.dta"), parser.VFP600
+        )
+
+    def test_load_batch(self):
+        files = [
+            "tests/cv_data.dta",
+            "tests/missing_data.dta",
+            "tests/eispot_data.dta",
+            "tests/squarewave_data.dta",
+        ]
+        results = list(parser.load_batch(files, max_workers=2))
+        self.assertEqual([result.filename for result in results], files)
+        self.assertIsInstance(results[0].parser, parser.CyclicVoltammetry)
+        self.assertEqual(results[0].parser.curve_count, 5)
+        self.assertIsNone(results[0].error)
+        self.assertIsNone(results[1].parser)
+        self.assertIsInstance(results[1].error, FileNotFoundError)
+        self.assertIsInstance(results[2].parser, parser.Impedance)
+        self.assertIsInstance(results[3].parser, parser.SquareWaveVoltammetry)
+
+        results = parser.load_batch(
+            "tests/cv_data*.dta", executor="process", ordered=False, engine="scan"
+        )
+        results = {result.filename: result for result in results}
+        self.assertEqual(len(results), 2)
+        self.assertTrue(results["tests/cv_data.dta"].parser.loaded)
+        self.assertEqual(results["tests/cv_data.dta"].parser.engine, "scan")
@@ -0,0 +1,103 @@
+import gamry_parser as parser
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from pandas.testing import assert_frame_equal
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_load(self):
+        expected = parser.CyclicVoltammetry(filename="tests/cv_data.dta")
+        expected.load()
+
+        cache = parser.ParseCache(os.path.join(self.directory, "cache"))
+        gp = parser.CyclicVoltammetry(filename="tests/cv_data.dta", cache=cache)
+        gp.load()
+        self.assertEqual(len(os.listdir(cache.directory)), 1)
+
+        gp = parser.CyclicVoltammetry(filename="tests/cv_data.dta", cache=cache)
+        self.assertIsNotNone(cache.get(gp.fname, gp._cache_options))
+        with mock.patch.object(cache, "put") as put:
+            gp.load(to_timestamp=True)
+            put.assert_not_called()
+        self.assertEqual(gp.header, expected.header)
+        self.assertEqual(gp.header_length, expected.header_length)
+        self.assertEqual(gp.curve_count, 5)
+        assert_frame_equal(gp.curve(1), expected.curve(1))
+        self.assertEqual(gp.curves[1]["T"].iloc[0].year, 2019)
+
+    def test_compact(self):
+        cache = parser.ParseCache(os.path.join(self.directory, "cache"))
+        expected = parser.GamryParser(filename="tests/cv_data.dta", compact=True)
+        expected.load()
+        gp = parser.GamryParser(filename="tests/cv_data.dta", cache=cache)
+        gp.load()
+        gp.load(compact=True)
+        self.assertEqual(len(os.listdir(cache.directory)), 2)
+
+        gp = parser.GamryParser(filename="tests/cv_data.dta", cache=cache, compact=True)
+        with mock.patch.object(cache, "put") as put:
+            gp.load()
+            put.assert_not_called()
+        assert_frame_equal(gp.curve(3), expected.curve(3))
+
+    def test_invalidation(self):
+        fname = os.path.join(self.directory, "cv_data.dta")
+        shutil.copyfile("tests/cv_data.dta", fname)
+        cache = parser.ParseCache(os.path.join(self.directory, "cache"))
+        gp = parser.GamryParser(filename=fname, cache=cache)
+        gp.load()
+
+        # touched, but unchanged
+        os.utime(fname, ns=(0, 0))
+        self.assertIsNotNone(cache.get(fname, gp._cache_options))
+
+        with open(fname, "a") as f:
+            f.write("\n")
+        self.assertIsNone(cache.get(fname, gp._cache_options))
+
+    def test_eviction(self):
+        cache = parser.ParseCache(os.path.join(self.directory, "cache"), max_size=1)
+        gp = parser.GamryParser(filename="tests/cv_data.dta", cache=cache)
+        gp.load()
+        self.assertEqual(len(os.listdir(cache.directory)), 0)
+        self.assertIsNone(cache.get(gp.fname, gp._cache_options))
+
+    def test_decimate(self):
+        cache = parser.ParseCache(os.path.join(self.directory, "cache"))
+        gp = parser.ChronoAmperometry(filename="tests/chronoa_data.dta", cache=cache)
+        gp.load()
+        expected = gp.decimate(points=4, method="lttb")
+        self.assertEqual(len(os.listdir(cache.directory)), 2)
+
+        gp = parser.ChronoAmperometry(
+            filename="tests/chronoa_data.dta", cache=cache, to_timestamp=True
+        )
+        gp.load()
+        with mock.patch.object(gp, "_decimate") as decimate:
+            decimated = gp.decimate(points=4, method="lttb")
+            decimate.assert_not_called()
+        self.assertEqual(decimated["T"].iloc[-1], gp.curve()["T"].iloc[-1])
+        assert_frame_equal(decimated.drop(columns="T"), expected.drop(columns="T"))
+
+    def test_clear(self):
+        directory = os.path.join(self.directory, "shared")
+        cache = parser.ParseCache(directory)
+        gp = parser.GamryParser(filename="tests/cv_data.dta", cache=cache)
+        gp.load()
+        os.makedirs(os.path.join(directory, ".tmpstaging"))
+        os.makedirs(os.path.join(directory, "other"))
+        with open(os.path.join(directory, "notes.txt"), "w") as f:
+            f.write("unrelated")
+
+        cache.clear()
+        self.assertEqual(sorted(os.listdir(directory)), ["notes.txt", "other"])
+        self.assertIsNone(cache.get(gp.fname, gp._cache_options))
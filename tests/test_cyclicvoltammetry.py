@@ -1,10 +1,25 @@
 import gamry_parser as parser
+import numpy as np
+import os
+import shutil
+import tempfile
 import unittest
+from gamry_parser.gamryparser import _copy_on_write as copy_on_write
+from pandas.testing import assert_frame_equal
+
+
+def trapezoid(y, x) -> float:
+    """trapezoidal integral of y over x (np.trapezoid requires numpy 2, np.trapz was removed in numpy 2)"""
+    y, x = np.asarray(y, dtype=float), np.asarray(x, dtype=float)
+    return float(np.sum((y[1:] + y[:-1]) / 2 * np.diff(x)))
 
 
 class TestCyclicVoltammetry(unittest.TestCase):
     def setUp(self):
-        pass
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
 
     def test_is_loaded(self):
         gp = parser.CyclicVoltammetry()
@@ -25,3 +40,184 @@ class TestCyclicVoltammetry(unittest.TestCase):
         self.assertEqual(gp.scan_rate, 1.23456)
         curve = gp.curve(curve=1)
         self.assertTrue((curve.columns == ["Vf", "Im"]).all())
+
+    def test_lazy(self):
+        gp = parser.CyclicVoltammetry(filename="tests/cv_data.dta", lazy=True)
+        gp.load()
+        self.assertEqual(gp.curve_count, 5)
+        curve = gp.curve(curve=4)
+        self.assertTrue((curve.columns == ["Vf", "Im"]).all())
+        self.assertEqual(curve["Vf"].iloc[-1], 0.889001)
+        self.assertEqual(sum(c is not None for c in gp._curves), 1)
+
+    def test_views(self):
+        gp = parser.CyclicVoltammetry(filename="tests/cv_data.dta")
+        gp.load()
+        stored = gp.curves[2].copy()
+        curve = gp.curve(curve=2)
+        assert_frame_equal(curve, stored[["Vf", "Im"]])
+        self.assertEqual(len(gp.curves[2].columns), 8)
+        if copy_on_write():
+            # views are built once, and share memory with the read-only stored curve
+            view = gp._views[2]
+            self.assertTrue(
+                np.shares_memory(
+                    gp.curve(curve=2)["Vf"].to_numpy(), curve["Vf"].to_numpy()
+                )
+            )
+            self.assertIs(gp._views[2], view)
+            self.assertFalse(gp.curves[2]["Vf"].to_numpy().flags.writeable)
+
+        # changes to a returned curve do not reach the stored curve or later calls
+        curve["Im"] = 0.0
+        curve["extra"] = 1
+        assert_frame_equal(gp.curve(curve=2), stored[["Vf", "Im"]])
+        curve = gp.curve(curve=2)
+        curve.iloc[0, 0] = 5.0
+        self.assertEqual(curve["Vf"].iloc[0], 5.0)
+        assert_frame_equal(gp.curves[2], stored)
+        assert_frame_equal(gp.curve(curve=2), stored[["Vf", "Im"]])
+
+        gp = parser.CyclicVoltammetry(filename="tests/cv_data.dta", lazy=True)
+        gp.CURVE_CACHE_SIZE = 1
+        gp.load()
+        curve = gp.curve(curve=2)
+        self.assertTrue(gp.curve(curve=2).equals(curve))
+        gp.curve(curve=3)
+        # views are released with their curves
+        self.assertEqual(list(gp._views), [3] if copy_on_write() else [])
+        self.assertTrue(gp.curve(curve=2).equals(curve))
+
+    def test_columns(self):
+        gp = parser.CyclicVoltammetry(filename="tests/cv_data.dta", columns="default")
+        gp.load()
+        self.assertEqual(gp.columns, ["Vf", "Im"])
+        self.assertEqual(gp.curves[0].columns.tolist(), ["Vf", "Im"])
+        self.assertEqual(gp.curve(curve=4)["Vf"].iloc[-1], 0.889001)
+
+    def test_peak_metrics(self):
+        gp = parser.CyclicVoltammetry(filename="tests/cv_data.dta")
+        self.assertRaises(AssertionError, gp.peak_metrics)
+        gp.load()
+        metrics = gp.peak_metrics()
+        self.assertEqual(metrics.shape, (5, 10))
+        self.assertEqual(metrics.columns.tolist(), list(gp.METRICS))
+        self.assertEqual(metrics.index.name, "Curve")
+        for index, curve in enumerate(gp.curves):
+            row = metrics.loc[index]
+            self.assertEqual(row["Epa"], curve["Vf"].loc[curve["Im"].idxmax()])
+            self.assertEqual(row["Ipa"], curve["Im"].max())
+            self.assertEqual(row["Epc"], curve["Vf"].loc[curve["Im"].idxmin()])
+            self.assertEqual(row["Ipc"], curve["Im"].min())
+            self.assertAlmostEqual(row["dEp"], row["Epa"] - row["Epc"])
+            self.assertAlmostEqual(row["E12"], (row["Epa"] + row["Epc"]) / 2)
+            self.assertAlmostEqual(row["Q"], trapezoid(curve["Im"], curve["T"]))
+            self.assertAlmostEqual(row["Q"], row["Qa"] + row["Qc"])
+        self.assertEqual(metrics.loc[0, "Epa"], 0.49)
+        self.assertEqual(metrics.loc[0, "Ipc"], -2.41658e-09)
+
+        # peaks outside the potential window are ignored
+        windowed = gp.peak_metrics(window=(0.3, 0.6))
+        self.assertEqual(windowed.loc[0, "Epa"], 0.49)
+        self.assertTrue(windowed.loc[1:, "Epa"].isna().all())
+        assert_frame_equal(windowed[["Qa", "Qc", "Q"]], metrics[["Qa", "Qc", "Q"]])
+
+        # timestamps, time index and block storage
+        for options in [
+            dict(to_timestamp=True),
+            dict(to_timestamp=True, time_index=True),
+            dict(storage="block"),
+            dict(lazy=True),
+        ]:
+            gp = parser.CyclicVoltammetry(filename="tests/cv_data.dta", **options)
+            gp.load()
+            assert_frame_equal(gp.peak_metrics(), metrics)
+
+        # without sample times, charges are integrated at the programmed scan rate
+        gp = parser.CyclicVoltammetry(filename="tests/cv_data.dta", columns="default")
+        gp.load()
+        charge = gp.peak_metrics().loc[0, "Q"]
+        curve = gp.curve(0)
+        time = np.abs(curve["Vf"].diff()).cumsum().fillna(0) / (gp.scan_rate / 1000)
+        self.assertAlmostEqual(charge, trapezoid(curve["Im"], time))
+
+        # metrics require the potential and current columns
+        gp = parser.CyclicVoltammetry(filename="tests/cv_data.dta", columns=["Im"])
+        gp.load()
+        self.assertRaises(KeyError, gp.peak_metrics)
+
+    def _write_cycles(self, fname: str, noise: float = 0.0) -> np.ndarray:
+        """write two triangle-wave cycles (0.1 -> 0.9 -> 0.1 V, 81 points per sweep) after the cv_data header"""
+        with open("tests/cv_data.dta", "r") as f:
+            header = f.read().split("CURVE1")[0]
+        sweep = np.linspace(0.1, 0.9, 81)
+        signal = np.concatenate([sweep, sweep[::-1][1:], sweep[1:], sweep[::-1][1:]])
+        vf = signal + np.random.default_rng(0).normal(0, noise, len(signal))
+        with open(fname, "w") as f:
+            f.write(header)
+            f.write("CURVE1\tTABLE\n\tPt\tT\tVf\tIm\tSig\n\t#\ts\tV vs. Ref.\tA\tV\n")
+            for pt, (v, sig) in enumerate(zip(vf, signal)):
+                f.write(
+                    "\t{}\t{}\t{:.6E}\t{:.6E}\t{:.6E}\n".format(
+                        pt, pt, v, v * 1e-6, sig
+                    )
+                )
+        return signal
+
+    def test_sweeps(self):
+        fname = os.path.join(self.directory, "cycles.dta")
+        signal = self._write_cycles(fname, noise=0.005)
+
+        gp = parser.CyclicVoltammetry(filename=fname)
+        self.assertRaises(AssertionError, gp.sweep)
+        gp.load()
+        self.assertEqual(gp.sweep_count(), 4)
+        self.assertEqual(gp.sweep_count(direction="anodic"), 2)
+        self.assertEqual(gp.sweep_count(direction="cathodic"), 2)
+        self.assertEqual(list(gp._sweeps), [0])
+
+        # turning points are shared by adjacent sweeps
+        sweep = gp.sweep(0, 1)
+        self.assertEqual(len(sweep), 81)
+        self.assertEqual(sweep.index[0], 80)
+        self.assertEqual(sweep.index[-1], 160)
+        assert_frame_equal(gp.sweep(0, 0, direction="cathodic"), sweep)
+        assert_frame_equal(gp.sweep(0, -1), gp.sweep(0, -1, direction="cathodic"))
+        assert_frame_equal(gp.sweep(0, 1, direction="anodic"), gp.sweep(0, 2))
+        if copy_on_write():
+            self.assertTrue(
+                np.shares_memory(sweep["Vf"].values, gp.curve(0)["Vf"].values)
+            )
+        self.assertIs(gp._sweep_index(0), gp._sweeps[0])
+        self.assertRaises(AssertionError, gp.sweep, 0, 2, "anodic")
+        self.assertRaises(AssertionError, gp.sweep, 0, 0, "up")
+        self.assertRaises(AssertionError, gp.sweep_count, 0, "up")
+        self.assertRaises(AssertionError, gp.sweep, 1)
+
+        sweeps = gp.sweeps
+        self.assertEqual(
+            sweeps.columns.tolist(), ["Curve", "Sweep", "Direction", "Start", "Stop"]
+        )
+        self.assertEqual(sweeps["Direction"].tolist(), [1, -1, 1, -1])
+        self.assertEqual(sweeps["Start"].tolist(), [0, 80, 160, 240])
+        self.assertEqual(sweeps["Stop"].tolist(), [81, 161, 241, 321])
+
+        # without the applied signal, noisy reversals of Vf are merged into the surrounding sweep
+        self.assertGreater(
+            len(parser.CyclicVoltammetry._segment(gp.curve(0)["Vf"].to_numpy(), 0)), 4
+        )
+        for options in [dict(columns="default"), dict(columns="default", lazy=True)]:
+            gp = parser.CyclicVoltammetry(filename=fname, **options)
+            gp.load()
+            assert_frame_equal(gp.sweeps, sweeps, check_exact=False, atol=3)
+            self.assertEqual(gp.sweep_count(), 4)
+
+        # the index is reset by load()
+        gp.load(filename="tests/cv_data.dta")
+        self.assertEqual(gp._sweeps, {})
+        # the first Vf reading of curve 0 is low (noise): overall, its potential increases
+        self.assertEqual(gp.sweeps["Direction"].tolist(), [1] + [-1] * 4)
+        self.assertEqual(len(gp.sweep(4)), 10)
+        gp = parser.CyclicVoltammetry(filename="tests/cv_data.dta")
+        gp.load()
+        self.assertEqual(gp.sweeps["Direction"].tolist(), [-1] * 5)
@@ -0,0 +1,69 @@
+import gamry_parser as parser
+import os
+import shutil
+import tempfile
+import unittest
+from gamry_parser.export import pa
+from pandas.testing import assert_frame_equal
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_roundtrip(self):
+        for filename, cls, options in [
+            ("cv_data.dta", parser.CyclicVoltammetry, dict(to_timestamp=True)),
+            ("chronoa_data.dta", parser.ChronoAmperometry, dict(compact=True)),
+            ("ocp_data.dta", parser.OpenCircuitPotential, dict()),
+        ]:
+            expected = cls(filename=os.path.join("tests", filename), **options)
+            expected.load()
+            for extension in ["parquet", "arrow"]:
+                path = os.path.join(self.directory, "experiment." + extension)
+                self.assertEqual(parser.write_experiment(expected, path), path)
+                gp = parser.read_experiment(path)
+                self.assertIsInstance(gp, cls)
+                self.assertTrue(gp.loaded)
+                self.assertEqual(gp.header, expected.header)
+                self.assertEqual(gp.curve_count, expected.curve_count)
+                self.assertEqual(gp._curve_units, expected._curve_units)
+                assert_frame_equal(gp.curves_long, expected.curves_long)
+                for curve in range(expected.curve_count):
+                    assert_frame_equal(gp._curve(curve), expected._curve(curve))
+                if expected._ocv is not None:
+                    assert_frame_equal(gp.ocv_curve, expected.ocv_curve)
+
+    def test_metadata(self):
+        gp = parser.CyclicVoltammetry(filename="tests/cv_data.dta")
+        gp.load()
+        table = parser.to_arrow(gp)
+        self.assertEqual(table.num_rows, 50)
+        self.assertEqual(table.schema.field("Vf").metadata, {b"unit": b"V vs. Ref."})
+
+        with self.assertRaises(AssertionError):
+            parser.from_arrow(pa.table(dict(x=[1, 2])))
+        with self.assertRaises(AssertionError):
+            parser.write_experiment(gp, os.path.join(self.directory, "cv.csv"))
+
+    def test_dataset(self):
+        parsers = []
+        for filename in ["cv_data.dta", "chronoa_data.dta"]:
+            gp = parser.GamryParser(filename=os.path.join("tests", filename))
+            gp.load()
+            parsers.append(gp)
+        paths = parser.write_experiments(parsers, self.directory)
+        self.assertEqual(
+            paths,
+            [
+                os.path.join(self.directory, "TAG=CV", "cv_data.parquet"),
+                os.path.join(self.directory, "TAG=CHRONOA", "chronoa_data.parquet"),
+            ],
+        )
+        gp = parser.read_experiment(paths[1])
+        self.assertEqual(gp.header["TAG"], "CHRONOA")
+        assert_frame_equal(gp.curve(0), parsers[1].curve(0))
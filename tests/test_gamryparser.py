@@ -2,7 +2,15 @@ import pandas as pd
 import gamry_parser as parser
 import numpy as np
 import unittest
+from unittest import mock
 import locale
+from pandas.testing import assert_frame_equal
+
+
+def index_dtype(dtype) -> np.dtype:
+    """dtype of an index narrowed by compact=True (pandas < 2 keeps integer indexes as int64)"""
+    dtype = np.dtype(dtype)
+    return dtype if pd.Index([0], dtype=dtype).dtype == dtype else np.dtype(np.int64)
 
 
 class TestGamryParser(unittest.TestCase):
@@ -67,6 +75,44 @@ class TestGamryParser(unittest.TestCase):
         self.assertEqual(curve5["Sig"].iloc[-1], 0.890)
         self.assertEqual(curve5["IERange"].iloc[-1], 5)
 
+    def test_engines(self):
+        gp = parser.GamryParser()
+        self.assertRaises(AssertionError, gp.load, "tests/cv_data.dta", engine="bogus")
+
+        for fname in [
+            "tests/cv_data.dta",
+            "tests/chronoa_data.dta",
+            "tests/eispot_data.dta",
+            "tests/eispot_data_curveaborted.dta",
+            "tests/ocvcurve_data.dta",
+        ]:
+            expected = parser.GamryParser(filename=fname, engine="python")
+            expected.load()
+            for engine in ["scan", "mmap"]:
+                gp = parser.GamryParser(filename=fname, engine=engine)
+                gp.load()
+                self.assertEqual(gp.engine, engine)
+                self.assertEqual(gp.curve_count, expected.curve_count)
+                self.assertEqual(gp._curve_units, expected._curve_units)
+                for curve, expected_curve in zip(gp.curves, expected.curves):
+                    assert_frame_equal(curve, expected_curve)
+
+    def test_single_open(self):
+        expected = parser.GamryParser(filename="tests/cv_data.dta")
+        expected.read_header()
+        expected.read_curves()
+        self.assertEqual(expected.header_length, 789)
+
+        for engine in parser.GamryParser.ENGINES:
+            gp = parser.GamryParser(filename="tests/cv_data.dta", engine=engine)
+            with mock.patch("builtins.open", wraps=open) as mock_open:
+                gp.load()
+            self.assertEqual(mock_open.call_count, 1)
+            self.assertEqual(gp.header, expected.header)
+            self.assertEqual(gp.header_length, expected.header_length)
+            self.assertEqual(gp.curve_count, expected.curve_count)
+            assert_frame_equal(gp.curve(4), expected.curves[4])
+
     def test_use_datetime(self):
         gp = parser.GamryParser(filename="tests/chronoa_data.dta", to_timestamp=False)
         gp.load()
@@ -82,6 +128,56 @@ class TestGamryParser(unittest.TestCase):
         self.assertEqual(curve["T"][0], pd.to_datetime("3/10/2019 12:00:00"))
         self.assertEqual(curve["T"].iloc[-1], pd.to_datetime("3/10/2019 12:04:30"))
 
+    def test_time_index(self):
+        expected = parser.GamryParser(filename="tests/cv_data.dta", to_timestamp=True)
+        expected.load()
+        for options in [dict(), dict(lazy=True), dict(storage="block")]:
+            gp = parser.GamryParser(
+                filename="tests/cv_data.dta",
+                to_timestamp=True,
+                time_index=True,
+                **options
+            )
+            gp.load()
+            curve = gp.curve(3)
+            self.assertIsInstance(curve.index, pd.DatetimeIndex)
+            self.assertEqual(curve.index.name, "T")
+            self.assertEqual(curve.columns[0], "Pt")
+            assert_frame_equal(
+                curve, expected.curve(3).reset_index().set_index("T")[curve.columns]
+            )
+        self.assertEqual(gp.curves_long.index[-1], expected.curve(4)["T"].iloc[-1])
+        gp.load(time_index=False)
+        assert_frame_equal(gp.curve(3), expected.curve(3))
+        gp.load(to_timestamp=False)
+        self.assertEqual(gp.curve(3)["T"].dtype, np.float64)
+        self.assertRaises(
+            AssertionError,
+            parser.GamryParser,
+            filename="tests/cv_data.dta",
+            time_index=True,
+        )
+
+    def test_date_format(self):
+        gp = parser.GamryParser(filename="tests/ocp_data.dta", to_timestamp=True)
+        gp.load()
+        # DATE (10-2-2020) is read day-first by default
+        self.assertEqual(gp.start_time, pd.Timestamp("2020-02-10 17:18:00"))
+        self.assertEqual(
+            gp.curve()["T"].iloc[0], gp.start_time + pd.Timedelta(5.00833, "s")
+        )
+
+        gp.load(date_format="%m-%d-%Y %H:%M:%S")
+        self.assertEqual(gp.start_time, pd.Timestamp("2020-10-02 17:18:00"))
+        self.assertEqual(
+            gp.curve()["T"].iloc[0], gp.start_time + pd.Timedelta(5.00833, "s")
+        )
+
+        # the start time is parsed once per file
+        with mock.patch("pandas.to_datetime") as to_datetime:
+            self.assertEqual(gp.start_time, pd.Timestamp("2020-10-02 17:18:00"))
+            to_datetime.assert_not_called()
+
     def test_aborted_experiment(self):
         gp = parser.GamryParser(filename="tests/eispot_data_curveaborted.dta")
         gp.load()
@@ -153,3 +249,205 @@ class TestGamryParser(unittest.TestCase):
         self.assertEqual(curve["Vf"].iloc[0], -50)
         self.assertEqual(curve["Vf"].iloc[-1], 40000)
         self.assertEqual(curve["Im"].iloc[0], -0.002)
+
+    def test_decimal(self):
+        gp = parser.GamryParser()
+        self.assertRaises(AssertionError, gp.load, "tests/cv_data.dta", decimal=";")
+
+        for engine in parser.GamryParser.ENGINES:
+            for decimal in [",", "auto"]:
+                gp = parser.GamryParser(
+                    filename="tests/chronoa_de_data.dta", engine=engine, decimal=decimal
+                )
+                gp.load()
+                self.assertEqual(gp.header["SAMPLETIME"], 30)
+                self.assertEqual(gp.header["DELAY"]["finish"], 0.1)
+                curve = gp.curve()
+                self.assertEqual(curve["T"].iloc[3], 90.0001)
+                self.assertEqual(curve["T"].iloc[-1], 270)
+                self.assertEqual(curve["Vf"].iloc[0], -5e-004)
+                self.assertEqual(curve["Im"].iloc[-1], 3e-009)
+
+            # auto-detection also handles "." decimals
+            gp = parser.GamryParser(
+                filename="tests/chronoa_data.dta", engine=engine, decimal="auto"
+            )
+            gp.load()
+            self.assertEqual(gp.header["SAMPLETIME"], 30)
+            self.assertEqual(gp.curve()["Vf"].iloc[0], -5.4e-004)
+
+    def test_locale_separators(self):
+        # locale mode (decimal=None): text columns are converted with the locale separators
+        de_DE = {"decimal_point": ",", "thousands_sep": "."}
+        for engine in parser.GamryParser.ENGINES:
+            with mock.patch("locale.localeconv", return_value=de_DE):
+                gp = parser.GamryParser(
+                    filename="tests/chronoa_de_data.dta", engine=engine
+                )
+                gp.load()
+            curve = gp.curve()
+            self.assertEqual(curve["T"].iloc[3], 90.0001)
+            self.assertEqual(curve["Vf"].iloc[0], -5e-004)
+            self.assertEqual(curve["Im"].iloc[-1], 3e-009)
+            self.assertFalse(pd.api.types.is_numeric_dtype(curve["Over"]))
+
+    def test_lazy(self):
+        expected = parser.GamryParser(filename="tests/cv_data.dta")
+        expected.load()
+
+        gp = parser.GamryParser(filename="tests/cv_data.dta", lazy=True)
+        gp.CURVE_CACHE_SIZE = 2
+        gp.load()
+        # curves are indexed, but not parsed
+        self.assertEqual(gp.curve_count, 5)
+        self.assertEqual(gp.curve_indices, (0, 1, 2, 3, 4))
+        self.assertEqual(gp.curve_numbers, (1, 2, 3, 4, 5))
+        self.assertEqual(gp._curves, [None] * 5)
+        self.assertEqual(gp._curve_units, expected._curve_units)
+
+        assert_frame_equal(gp.curve(4), expected.curve(4))
+        self.assertTrue(
+            np.shares_memory(gp.curve(4)["Vf"].to_numpy(), gp.curve(4)["Vf"].to_numpy())
+        )
+        for curve in [0, 1, 2]:
+            assert_frame_equal(gp.curve(curve), expected.curve(curve))
+        # least recently used curves are evicted from the cache
+        self.assertEqual([c is not None for c in gp._curves], [0, 1, 1, 0, 0])
+        for curve, expected_curve in zip(gp.curves, expected.curves):
+            assert_frame_equal(curve, expected_curve)
+
+        gp = parser.GamryParser(filename="tests/eispot_data_curveaborted.dta")
+        gp.load(lazy=True)
+        self.assertEqual(gp.curve_count, 1)
+        self.assertEqual(gp.curve().shape, (5, 10))
+        # options of a reused parser can be switched off again
+        gp.load(lazy=False)
+        self.assertFalse(gp.lazy)
+        self.assertEqual(gp.curve().shape, (5, 10))
+
+        gp = parser.GamryParser(filename="tests/chronoa_data.dta", to_timestamp=True)
+        gp.load(lazy=True)
+        self.assertEqual(gp.curve()["T"][0], pd.to_datetime("3/10/2019 12:00:00"))
+
+    def test_block_storage(self):
+        expected = parser.GamryParser(filename="tests/cv_data.dta")
+        expected.load()
+
+        gp = parser.GamryParser(filename="tests/cv_data.dta", storage="block")
+        gp.load()
+        self.assertEqual(gp.curve_count, 5)
+        long = gp.curves_long
+        self.assertIs(long, gp.curves_long)
+        self.assertEqual(long.shape, (50, 9))
+        self.assertEqual(
+            long["Curve"].tolist(), [i for i in range(5) for _ in range(10)]
+        )
+        assert_frame_equal(long, expected.curves_long)
+        for curve in range(5):
+            assert_frame_equal(gp.curve(curve), expected.curve(curve))
+        # curves are slices of the stored block
+        self.assertTrue(
+            np.shares_memory(gp.curve(3)["Vf"].to_numpy(), long["Vf"].to_numpy())
+        )
+
+        with self.assertRaises(AssertionError):
+            parser.GamryParser(filename="tests/cv_data.dta", storage="block", lazy=True)
+
+    def test_iter_chunks(self):
+        expected = parser.GamryParser(filename="tests/cv_data.dta")
+        expected.load()
+        chunks = list(expected.iter_chunks(curve=2, chunksize=4))
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 4, 2])
+        assert_frame_equal(pd.concat(chunks), expected.curve(2))
+
+        gp = parser.GamryParser(filename="tests/cv_data.dta", lazy=True)
+        gp.load()
+        chunks = list(gp.iter_chunks(curve=4, chunksize=3, columns=["Vf", "Im"]))
+        # rows are parsed from the file, without caching the curve
+        self.assertEqual(gp._curves, [None] * 5)
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 3, 1])
+        assert_frame_equal(pd.concat(chunks), expected.curve(4)[["Vf", "Im"]])
+        # columns with non-integer units are typed as floats in every chunk
+        self.assertEqual(chunks[0]["Vf"].dtype, np.float64)
+
+    def test_columns(self):
+        expected = parser.GamryParser(filename="tests/cv_data.dta")
+        expected.load()
+
+        for options in [dict(engine="python"), dict(engine="scan"), dict(lazy=True)]:
+            gp = parser.GamryParser(
+                filename="tests/cv_data.dta", columns=["Vf", "Im", "Over"], **options
+            )
+            gp.load(to_timestamp=True)
+            self.assertEqual(gp.curve_count, 5)
+            self.assertEqual(list(gp._curve_units), ["Vf", "Im", "Over"])
+            # T was not loaded, so there is nothing to convert to timestamps
+            assert_frame_equal(gp.curve(3), expected.curve(3)[["Vf", "Im", "Over"]])
+
+        # units of columns that are not loaded are not validated
+        gp = parser.GamryParser(filename="tests/cv_data.dta", columns=["T"])
+        gp.REQUIRED_UNITS = dict(CV=dict(Vf="mV"))
+        gp.load()
+        self.assertEqual(gp.curve(0).columns.tolist(), ["T"])
+        self.assertRaises(AssertionError, gp.load, columns=["T", "Vf"])
+
+        # a projection is kept by later loads, until it is replaced or cleared
+        gp = parser.GamryParser(filename="tests/cv_data.dta", columns=["Vf", "Im"])
+        gp.load()
+        gp.load()
+        self.assertEqual(gp.curve(0).columns.tolist(), ["Vf", "Im"])
+        gp.load(columns="all")
+        self.assertIsNone(gp.columns)
+        assert_frame_equal(gp.curve(0), expected.curve(0))
+        self.assertRaises(AssertionError, gp.load, columns="none")
+
+    def test_compact(self):
+        expected = parser.GamryParser(filename="tests/cv_data.dta")
+        expected.load()
+
+        for options in [
+            dict(engine="python"),
+            dict(engine="scan"),
+            dict(lazy=True),
+            dict(storage="block"),
+        ]:
+            gp = parser.GamryParser(
+                filename="tests/cv_data.dta", compact=True, **options
+            )
+            gp.load()
+            curve = gp.curve(2)
+            self.assertEqual(curve.index.dtype, index_dtype(np.int32))
+            self.assertEqual(curve["T"].dtype, np.float64)
+            self.assertEqual(curve["Vf"].dtype, np.float32)
+            self.assertEqual(curve["IERange"].dtype, np.int8)
+            self.assertIsInstance(curve["Over"].dtype, pd.CategoricalDtype)
+            assert_frame_equal(
+                curve,
+                expected.curve(2),
+                check_dtype=False,
+                check_categorical=False,
+                check_index_type=False,
+                rtol=1e-6,
+            )
+
+        # categorical columns are kept when curves are joined
+        self.assertIsInstance(gp.curves_long["Over"].dtype, pd.CategoricalDtype)
+        # columns take about a quarter of the memory on long curves (under a third on these short ones). The index
+        # is left out, since pandas < 2 keeps it as int64
+        self.assertLess(
+            gp.curves_long.memory_usage(deep=True, index=False).sum(),
+            expected.curves_long.memory_usage(deep=True, index=False).sum() / 3,
+        )
+
+        # only integer values that fit the compact dtype are narrowed
+        gp = parser.GamryParser(filename="tests/cv_data.dta", compact=True)
+        gp.COMPACT_DTYPES = dict(Pt="uint8", Vf="int8")
+        gp.load()
+        self.assertEqual(gp.curve(4).index.dtype, index_dtype(np.uint8))
+        self.assertEqual(gp.curve(4)["Vf"].dtype, np.float32)
+        self.assertEqual(gp.curve(4)["IERange"].dtype, np.int64)
+        self.assertEqual(gp.curve(4)["Over"].dtype, expected.curve(4)["Over"].dtype)
+        gp.load(compact=False)
+        assert_frame_equal(gp.curve(4), expected.curve(4))
+        self.assertFalse(gp._fits(pd.Series([0, 300]), "int8"))
+        self.assertTrue(gp._fits(pd.Series([0, 300]), "int16"))
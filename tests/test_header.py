@@ -0,0 +1,52 @@
+import gamry_parser as parser
+from gamry_parser.header import parse_header, read_header
+import unittest
+
+
+class TestHeader(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def test_scan_header(self):
+        gp = parser.GamryParser(filename="tests/cv_data.dta")
+        header, length = gp.read_header()
+        self.assertEqual(parser.scan_header("tests/cv_data.dta", decimal="."), header)
+
+        header = parser.scan_header(
+            "tests/cv_data.dta", keys=["TAG", "SCANRATE"], decimal="."
+        )
+        self.assertEqual(header, dict(TAG="CV", SCANRATE=1.23456))
+
+    def test_blocks(self):
+        gp = parser.GamryParser(filename="tests/ocvcurve_data.dta")
+        header, length = gp.read_header()
+        with open("tests/ocvcurve_data.dta", "rb") as f:
+            result = read_header(f, atof=float, blocksize=16)
+        with open("tests/ocvcurve_data.dta", "rb") as f:
+            buf = f.read()
+        self.assertEqual(result[0], header)
+        self.assertEqual(result[2], length)
+        self.assertEqual(len(result[1].splitlines()), 41)
+
+        # an incomplete buffer does not report the header length
+        self.assertGreater(length, 100)
+        _, _, partial = parse_header(buf[:100], atof=float, final=False)
+        self.assertIsNone(partial)
+        # ... until it holds the complete header
+        _, _, complete = parse_header(buf[:length], atof=float, final=False)
+        self.assertEqual(complete, length)
+
+    def test_scan_headers(self):
+        files = ["tests/cv_data.dta", "tests/chronoa_data.dta", "tests/vfp600_data.dta"]
+        catalogue = parser.scan_headers(
+            files, keys=["TAG", "DATE", "SCANRATE"], decimal="auto"
+        )
+        self.assertEqual(catalogue.index.tolist(), files)
+        self.assertEqual(catalogue.columns.tolist(), ["TAG", "DATE", "SCANRATE"])
+        self.assertEqual(catalogue.loc["tests/cv_data.dta", "TAG"], "CV")
+        self.assertEqual(catalogue.loc["tests/chronoa_data.dta", "TAG"], "CHRONOA")
+
+        catalogue = parser.scan_headers(
+            "tests/*_data.dta", keys=["TAG"], decimal="auto"
+        )
+        self.assertIn("tests/eispot_data.dta", catalogue.index)
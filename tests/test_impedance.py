@@ -1,10 +1,18 @@
 import gamry_parser as parser
+import numpy as np
+import os
+import shutil
+import tempfile
 import unittest
+from gamry_parser.circuits import CIRCUITS, fit_spectra
 
 
 class TestImpedance(unittest.TestCase):
     def setUp(self):
-        pass
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
 
     def test_is_loaded(self):
         gp = parser.Impedance(filename="tests/eispot_data.dta")
@@ -22,3 +30,119 @@ class TestImpedance(unittest.TestCase):
         self.assertTrue(
             (curve.columns == ["Freq", "Zreal", "Zimag", "Zmod", "Zphz"]).all()
         )
+
+    def test_missing_columns(self):
+        # columns of another experiment type are not silently dropped
+        gp = parser.Impedance(filename="tests/cv_data.dta")
+        gp.load()
+        self.assertRaises(KeyError, gp.curve, 0)
+
+        gp = parser.Impedance(
+            filename="tests/eispot_data.dta", columns=["Zreal", "Zimag"]
+        )
+        gp.load()
+        self.assertRaises(KeyError, gp.features)
+        self.assertRaises(KeyError, gp.fit)
+
+    def _write_spectra(self, fname: str, params: np.ndarray, freq: np.ndarray):
+        """write one ZCURVE table per row of Randles circuit parameters, after the eispot_data header"""
+        with open("tests/eispot_data_curveaborted.dta", "r") as f:
+            header = f.read().split("ZCURVE")[0]
+        omega = 2 * np.pi * np.broadcast_to(freq, (len(params), len(freq)))
+        spectra = CIRCUITS["randles"].model(params, omega)
+        with open(fname, "w") as f:
+            f.write(header)
+            for n, z in enumerate(spectra):
+                f.write("ZCURVE{}\tTABLE\n".format(n + 1))
+                f.write("\tPt\tFreq\tZreal\tZimag\tZmod\tZphz\n")
+                f.write("\t#\tHz\tohm\tohm\tohm\t°\n")
+                for pt, (fr, value) in enumerate(zip(freq, z)):
+                    f.write(
+                        "\t{}\t{:.9E}\t{:.9E}\t{:.9E}\t{:.9E}\t{:.9E}\n".format(
+                            pt,
+                            fr,
+                            value.real,
+                            value.imag,
+                            abs(value),
+                            np.degrees(np.angle(value)),
+                        )
+                    )
+
+    def test_derived(self):
+        gp = parser.Impedance(filename="tests/eispot_data_curveaborted.dta")
+        gp.load()
+        curve = gp.curve()
+        z = gp.impedance()
+        self.assertEqual(z.dtype, np.complex128)
+        np.testing.assert_array_equal(z.real, curve["Zreal"])
+        np.testing.assert_array_equal(z.imag, curve["Zimag"])
+
+        derived = gp.derived()
+        self.assertEqual(len(derived), 5)
+        self.assertEqual(derived.index.name, "Pt")
+        np.testing.assert_allclose(derived["Zmod"], curve["Zmod"], rtol=1e-6)
+        np.testing.assert_allclose(derived["Zphz"], curve["Zphz"], rtol=1e-5)
+        np.testing.assert_allclose(derived["Yreal"] + 1j * derived["Yimag"], 1 / z)
+        omega = 2 * np.pi * curve["Freq"]
+        np.testing.assert_allclose(derived["Cs"], -1 / (omega * curve["Zimag"]))
+        np.testing.assert_allclose(
+            derived["Creal"] + 1j * derived["Cimag"], 1 / (1j * omega * z)
+        )
+
+        features = gp.features()
+        self.assertEqual(features.loc[0, "points"], 5)
+        self.assertEqual(features.loc[0, "f_max"], 10000)
+        self.assertEqual(features.loc[0, "R_hf"], 224.6075)
+        self.assertEqual(features.loc[0, "R_lf"], 226.2954)
+        self.assertAlmostEqual(features.loc[0, "phase_min"], -1.553282, places=6)
+        self.assertEqual(features.loc[0, "f_apex"], 100)
+
+    def test_fit(self):
+        # a slowly drifting cell, measured 20 times (e.g. during a long-term test)
+        drift = np.linspace(0, 1, 20)[:, None]
+        params = np.array([20.0, 200.0, 1e-5, 50.0]) * (1 + 0.5 * drift)
+        freq = np.logspace(5, -1, 40)
+        fname = os.path.join(self.directory, "spectra.dta")
+        self._write_spectra(fname, params, freq)
+
+        gp = parser.Impedance(filename=fname)
+        gp.load()
+        self.assertEqual(gp.curve_count, 20)
+        results = gp.fit("randles", batch_size=4)
+        self.assertEqual(
+            results.columns.tolist(),
+            ["Rs", "Rct", "Cdl", "sigma", "chi2", "iterations", "converged"],
+        )
+        self.assertEqual(results.index.name, "Curve")
+        self.assertTrue(results["converged"].all())
+        np.testing.assert_allclose(
+            results[["Rs", "Rct", "Cdl", "sigma"]], params, rtol=1e-4
+        )
+        self.assertLess(results["chi2"].max(), 1e-12)
+        self.assertEqual(results.attrs["circuit"], "randles")
+        self.assertGreater(results.attrs["spectra_per_s"], 0)
+
+        # warm starts from the previous spectrum take fewer iterations than independent estimates
+        warm = fit_spectra(freq, gp.impedance(0)[None].repeat(3, 0), batch_size=1)
+        cold = fit_spectra(
+            freq, gp.impedance(0)[None].repeat(3, 0), batch_size=1, warm_start=False
+        )
+        self.assertEqual(cold["iterations"].nunique(), 1)
+        self.assertLess(warm["iterations"].iloc[-1], cold["iterations"].iloc[-1])
+
+        # a previous result as initial parameters
+        results = gp.fit("randles", x0=params[0])
+        np.testing.assert_allclose(
+            results[["Rs", "Rct", "Cdl", "sigma"]], params, rtol=1e-4
+        )
+
+    def test_fit_padded(self):
+        # spectra of different lengths (e.g. an aborted sweep) are padded with NaN, which is ignored
+        circuit = CIRCUITS["R-RC"]
+        freq = np.logspace(5, -1, 30)
+        params = np.array([[10.0, 100.0, 1e-6], [30.0, 300.0, 2e-6]])
+        z = circuit.model(params, 2 * np.pi * freq[None].repeat(2, 0))
+        z[1, 20:] = np.nan
+        results = fit_spectra(freq, z, circuit="R-RC")
+        np.testing.assert_allclose(results[["Rs", "Rct", "Cdl"]], params, rtol=1e-4)
+        self.assertRaises(KeyError, fit_spectra, freq, z, circuit="bogus")
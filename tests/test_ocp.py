@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import gamry_parser as parser
 import unittest
@@ -68,3 +69,67 @@ class TestOpenCircuit(unittest.TestCase):
 
         # pandas equivalence check
         assert_frame_equal(gp.ocv_curve, gp.curves[0])
+
+    def test_decimate(self):
+        gp = parser.OpenCircuitPotential(
+            filename="tests/ocp_data.dta", to_timestamp=False
+        )
+        gp.load()
+        curve = gp.curve()
+        t = curve["T"].to_numpy()
+
+        # time buckets
+        buckets = gp.decimate(points=5)
+        self.assertEqual(
+            list(buckets.columns), ["T", "count", "Vf_mean", "Vf_min", "Vf_max"]
+        )
+        self.assertLessEqual(len(buckets), 5)
+        self.assertEqual(buckets["count"].sum(), 21)
+        self.assertEqual(buckets["T"].iloc[0], t[0])
+        self.assertAlmostEqual(
+            (buckets["Vf_mean"] * buckets["count"]).sum(), curve["Vf"].sum()
+        )
+        self.assertEqual(buckets["Vf_min"].min(), curve["Vf"].min())
+        self.assertEqual(buckets["Vf_max"].max(), curve["Vf"].max())
+        self.assertIs(gp.decimate(points=5), buckets)
+
+        # fixed rate, in multiples of SAMPLETIME (5 s)
+        resampled = gp.decimate(points=10, method="resample")
+        self.assertLessEqual(len(resampled), 10)
+        period = resampled["T"].diff().iloc[1:].unique()
+        self.assertEqual(len(period), 1)
+        self.assertAlmostEqual(period[0] % 5, 0)
+        expected = curve.groupby(np.floor(t / period[0]))["Vf"].mean()
+        np.testing.assert_allclose(
+            resampled["Vf"].dropna(), expected.to_numpy(), rtol=1e-12
+        )
+
+        # LTTB keeps the first and last samples
+        selected = gp.decimate(points=7, method="lttb")
+        self.assertEqual(len(selected), 7)
+        self.assertEqual(selected["T"].iloc[0], t[0])
+        self.assertEqual(selected["T"].iloc[-1], t[-1])
+        self.assertTrue(selected["T"].isin(t).all())
+
+        # streaming pass over chunks of rows
+        for method in ["bucket", "resample"]:
+            assert_frame_equal(
+                gp.decimate(period=15, method=method, chunksize=4),
+                gp.decimate(period=15, method=method),
+            )
+        streamed = gp.decimate(points=5, chunksize=4)
+        self.assertLessEqual(len(streamed), 5)
+        self.assertEqual(streamed["count"].sum(), 21)
+        streamed = gp.decimate(points=7, method="lttb", chunksize=4)
+        self.assertEqual(len(streamed), 7)
+        self.assertEqual(streamed["T"].iloc[-1], t[-1])
+
+        # timestamps
+        gp = parser.OpenCircuitPotential(
+            filename="tests/ocp_data.dta", to_timestamp=True, lazy=True
+        )
+        gp.load()
+        selected = gp.decimate(points=7, method="lttb", chunksize=8)
+        self.assertEqual(
+            selected["T"].iloc[-1], pd.to_datetime("2020-02-10 17:19:45.175000")
+        )
@@ -0,0 +1,135 @@
+import gamry_parser as parser
+from gamry_parser import scanner
+from gamry_parser.scanner import map_file, scan_tables, read_table
+import numpy as np
+import unittest
+from unittest import mock
+from pandas.api.types import is_numeric_dtype
+from pandas.testing import assert_frame_equal
+
+
+class TestScanner(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def test_scan_tables(self):
+        gp = parser.GamryParser(filename="tests/cv_data.dta")
+        _, offset = gp.read_header()
+        with open("tests/cv_data.dta", "rb") as f:
+            buf = f.read()
+
+        spans = scan_tables(buf, offset)
+        self.assertEqual(len(spans), 5)
+        self.assertEqual(
+            [span.name for span in spans],
+            ["CURVE1", "CURVE2", "CURVE3", "CURVE4", "CURVE5"],
+        )
+        self.assertEqual(spans[0].start, offset)
+        self.assertIsNone(spans[0].points)
+        self.assertEqual(spans[-1].end, len(buf))
+        for prev, span in zip(spans[:-1], spans[1:]):
+            self.assertTrue(buf[prev.end :].startswith(span.name.encode()))
+
+        keys, units, curve = read_table(buf, spans[-1])
+        self.assertEqual(keys, ["T", "Vf", "Im", "Vu", "Sig", "Ach", "IERange", "Over"])
+        self.assertEqual(units[:3], ["s", "V vs. Ref.", "A"])
+        self.assertEqual(curve.index[-1], 49)
+        self.assertEqual(curve["Vf"].iloc[-1], 0.889001)
+
+    def test_declared_points(self):
+        gp = parser.GamryParser(filename="tests/chronoa_data.dta")
+        _, offset = gp.read_header()
+        with open("tests/chronoa_data.dta", "rb") as f:
+            buf = f.read()
+
+        spans = scan_tables(buf, offset)
+        self.assertEqual(len(spans), 1)
+        self.assertEqual(spans[0].name, "CURVE")
+        self.assertEqual(spans[0].points, 5258)
+
+    def test_aborted_experiment(self):
+        gp = parser.GamryParser(filename="tests/eispot_data_curveaborted.dta")
+        _, offset = gp.read_header()
+        with open("tests/eispot_data_curveaborted.dta", "rb") as f:
+            buf = f.read()
+
+        spans = scan_tables(buf, offset)
+        self.assertEqual(len(spans), 2)
+        self.assertEqual(spans[1].name, "EXPERIMENTABORTED")
+        _, _, curve = read_table(buf, spans[0])
+        self.assertEqual(curve.shape, (5, 10))
+        _, _, curve = read_table(buf, spans[1])
+        self.assertTrue(curve.empty)
+
+    def test_preallocated_columns(self):
+        gp = parser.GamryParser(filename="tests/ocp_data.dta")
+        _, offset = gp.read_header()
+        with open("tests/ocp_data.dta", "rb") as f:
+            buf = f.read()
+
+        # the table declares 99999 points, but only holds 21
+        span = scan_tables(buf, offset)[0]
+        self.assertEqual(span.points, 99999)
+        _, _, curve = read_table(buf, span)
+        self.assertEqual(len(curve), 21)
+        self.assertEqual(curve.index.dtype, np.int64)
+        self.assertEqual(curve["T"].dtype, np.float64)
+        self.assertFalse(is_numeric_dtype(curve["Over"]))
+
+        # declared count that is too small, or missing: arrays are grown as needed
+        for points in [2, None]:
+            _, _, grown = read_table(buf, span._replace(points=points))
+            assert_frame_equal(grown, curve)
+
+    def test_memory_map(self):
+        for fname in [
+            "tests/cv_data.dta",
+            "tests/chronoa_data.dta",
+            "tests/eispot_data_curveaborted.dta",
+            "tests/vfp600_data.dta",
+        ]:
+            gp = parser.GamryParser(filename=fname)
+            _, offset = gp.read_header()
+            with open(fname, "rb") as f:
+                buf = f.read()
+            expected = [read_table(buf, span) for span in scan_tables(buf, offset)]
+
+            # line counts are taken in blocks from the memory map
+            with mock.patch.object(scanner, "COUNT_BLOCKSIZE", 100):
+                with open(fname, "rb") as f, map_file(f) as mapped:
+                    spans = scan_tables(mapped, offset)
+                    tables = [read_table(mapped, span) for span in spans]
+            self.assertEqual(spans, scan_tables(buf, offset))
+            for (keys, units, curve), (exp_keys, exp_units, exp_curve) in zip(
+                tables, expected
+            ):
+                self.assertEqual(keys, exp_keys)
+                self.assertEqual(units, exp_units)
+                assert_frame_equal(curve, exp_curve)
+
+        for rows, expected in [
+            (b"\t1\t2\n\t3\t4\n", True),
+            (b"\t1\t2\n\t3\t4", True),
+            (b"\t1\t2\n\n\t3\t4\n", False),
+            (b"\t1\t2\n3\t4\n", False),
+        ]:
+            self.assertEqual(scanner._is_tab_indented(rows, 0, len(rows)), expected)
+
+    def test_undecodable_bytes(self):
+        gp = parser.GamryParser(filename="tests/cv_data.dta")
+        _, offset = gp.read_header()
+        with open("tests/cv_data.dta", "rb") as f:
+            buf = f.read()
+        span = scan_tables(buf, offset)[0]
+        keys, units, expected = read_table(buf, span)
+
+        # bytes that are not valid utf8 are dropped from text fields
+        row = buf.index(b"...........", span.start)
+        buf = buf[:row] + b"\xb0" + buf[row:]
+        keys, units, curve = read_table(buf, span._replace(end=span.end + 1))
+        assert_frame_equal(curve, expected)
+        chunks = list(
+            scanner.iter_table(buf, span._replace(end=span.end + 1), chunksize=4)
+        )
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(chunks[0]["Over"].iloc[0], expected["Over"].iloc[0])
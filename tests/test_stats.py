@@ -0,0 +1,75 @@
+import gamry_parser as parser
+import os
+import unittest
+from unittest import mock
+
+
+class TestParseStats(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def test_load(self):
+        gp = parser.GamryParser(filename="tests/cv_data.dta")
+        gp.load()
+        self.assertIsNone(gp.stats)
+
+        size = os.path.getsize("tests/cv_data.dta")
+        for options in [dict(engine="python"), dict(engine="scan")]:
+            gp = parser.GamryParser(
+                filename="tests/cv_data.dta", profile=True, to_timestamp=True, **options
+            )
+            gp.load()
+            self.assertIsInstance(gp.stats, parser.ParseStats)
+            self.assertEqual(
+                set(gp.stats.phases),
+                {"header", "tables", "convert", "timestamps"}
+                | ({"read"} if options["engine"] == "scan" else set()),
+            )
+            self.assertEqual(gp.stats.bytes_read, size)
+            self.assertEqual(gp.stats.rows, {0: 10, 1: 10, 2: 10, 3: 10, 4: 10})
+            self.assertEqual(dict(gp.stats.fallbacks), {})
+            self.assertGreaterEqual(gp.stats.elapsed, sum(gp.stats.phases.values()))
+
+        # curves of lazily loaded files are recorded as they are parsed
+        gp = parser.GamryParser(filename="tests/cv_data.dta", profile=True, lazy=True)
+        gp.load()
+        self.assertEqual(gp.stats.rows, {})
+        self.assertEqual(gp.stats.bytes_read, size)
+        gp.curve(2)
+        self.assertEqual(gp.stats.rows, {2: 10})
+        self.assertIn("index", gp.stats.phases)
+        self.assertGreater(gp.stats.bytes_read, size)
+
+    def test_hook(self):
+        events = []
+        gp = parser.CyclicVoltammetry(
+            filename="tests/cv_data.dta",
+            profile=lambda event, data: events.append((event, data)),
+        )
+        gp.load()
+        self.assertEqual(events[0], ("phase", dict(name="header", seconds=mock.ANY)))
+        self.assertEqual(
+            [data for event, data in events if event == "curve"],
+            [dict(curve=curve, rows=10) for curve in range(5)],
+        )
+        self.assertEqual(events[-1], ("load", gp.stats.as_dict()))
+        self.assertEqual(sum(1 for event, _ in events if event == "load"), 1)
+
+    def test_fallbacks(self):
+        # comma-decimal file, read with the separators of the locale
+        with mock.patch(
+            "locale.localeconv",
+            return_value=dict(decimal_point=",", thousands_sep="."),
+        ):
+            gp = parser.ChronoAmperometry(
+                filename="tests/chronoa_de_data.dta", profile=True
+            )
+            gp.load()
+        self.assertEqual(gp.stats.fallbacks["locale_columns"], 6)
+        self.assertEqual(gp.curve()["T"].iloc[1], 30.0)
+
+        gp = parser.ChronoAmperometry(
+            filename="tests/chronoa_de_data.dta", profile=True, decimal=","
+        )
+        gp.load()
+        self.assertEqual(dict(gp.stats.fallbacks), {})
@@ -0,0 +1,124 @@
+import gamry_parser as parser
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from pandas.testing import assert_frame_equal
+
+
+class TestExperimentStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.files = []
+        for name in [
+            "cv_data.dta",
+            "ocvcurve_data.dta",
+            "eispot_data.dta",
+            "ocp_data.dta",
+        ]:
+            self.files.append(os.path.join(self.directory, name))
+            shutil.copyfile(os.path.join("tests", name), self.files[-1])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_ingest(self):
+        store = parser.ExperimentStore(os.path.join(self.directory, "store"))
+        result = store.ingest(self.files + ["tests/missing_data.dta"], decimal=".")
+        self.assertEqual(result.added, self.files)
+        self.assertEqual(result.updated, [])
+        self.assertEqual(result.unchanged, 0)
+        self.assertEqual(list(result.failed), ["tests/missing_data.dta"])
+        self.assertEqual(len(store), 4)
+
+        # unchanged files are not parsed again
+        with mock.patch("gamry_parser.store.load_batch") as load_batch:
+            load_batch.return_value = []
+            result = store.ingest(os.path.join(self.directory, "*.dta"))
+            load_batch.assert_called_once()
+            self.assertEqual(load_batch.call_args[0][0], [])
+        self.assertEqual(result.unchanged, 4)
+
+        os.utime(self.files[0], ns=(0, 0))
+        result = store.ingest(self.files, decimal=".")
+        self.assertEqual(result.updated, self.files[:1])
+        self.assertEqual(result.unchanged, 3)
+        self.assertEqual(len(os.listdir(os.path.join(store.directory, "curves"))), 4)
+
+        # rewritten with another size, but the same mtime
+        stat = os.stat(self.files[2])
+        with open(self.files[2], "a") as f:
+            f.write("\n")
+        os.utime(self.files[2], ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        result = store.ingest(self.files, decimal=".")
+        self.assertEqual(result.updated, self.files[2:3])
+        self.assertEqual(len(os.listdir(os.path.join(store.directory, "curves"))), 4)
+        self.assertEqual(store.open(self.files[2]).curve_count, 1)
+
+        store.remove(self.files[1])
+        self.assertEqual(len(store), 3)
+        self.assertEqual(len(os.listdir(os.path.join(store.directory, "curves"))), 3)
+        store.close()
+
+    def test_query(self):
+        store = parser.ExperimentStore(os.path.join(self.directory, "store"))
+        store.ingest(self.files, decimal=".")
+
+        catalogue = store.query()
+        self.assertEqual(catalogue.index.name, "filename")
+        self.assertEqual(len(catalogue), 4)
+        self.assertEqual(
+            catalogue.loc[
+                self.files[0], ["parser", "TAG", "start", "curve_count"]
+            ].tolist(),
+            ["CyclicVoltammetry", "CV", "2019-03-06 16:35:22", 5],
+        )
+
+        self.assertEqual(store.query(TAG="CV").index.tolist(), self.files[:2])
+        self.assertEqual(
+            store.query(TAG="CV", SCANRATE=(10, None)).index.tolist(), self.files[1:2]
+        )
+        self.assertEqual(
+            store.query(start=("2019-08", "2019-09")).index.tolist(), self.files[1:2]
+        )
+        self.assertEqual(
+            store.query(TAG=["EISPOT", "CORPOT"]).index.tolist(), self.files[2:]
+        )
+        self.assertEqual(
+            store.query(where="FREQINIT > ?", params=(1e4,)).index.tolist(),
+            self.files[2:3],
+        )
+
+        # header entries added to an existing store are filled in from the stored headers
+        store.close()
+        store = parser.ExperimentStore(
+            os.path.join(self.directory, "store"), keys=["STEPSIZE"]
+        )
+        self.assertEqual(store.keys[-1], "STEPSIZE")
+        self.assertEqual(
+            store.query(STEPSIZE=(0, None)).index.tolist(), self.files[1:2]
+        )
+        store.close()
+
+    def test_open(self):
+        store = parser.ExperimentStore(os.path.join(self.directory, "store"))
+        store.ingest(self.files, decimal=".")
+        for filename in self.files:
+            expected = parser.experiment_class(filename)(filename=filename)
+            expected.load(decimal=".")
+            gp = store.open(filename)
+            self.assertIsInstance(gp, type(expected))
+            self.assertEqual(gp.header, expected.header)
+            self.assertEqual(gp.curve_count, expected.curve_count)
+            for i in range(gp.curve_count):
+                assert_frame_equal(gp.curves[i], expected.curves[i])
+            if expected.ocv_curve is not None:
+                assert_frame_equal(gp.ocv_curve, expected.ocv_curve)
+
+        gp = store.open(self.files[0], to_timestamp=True)
+        expected = parser.CyclicVoltammetry(filename=self.files[0], to_timestamp=True)
+        expected.load(decimal=".")
+        assert_frame_equal(gp.curve(2), expected.curve(2))
+        self.assertEqual(gp.sweep_count(), expected.sweep_count())
+        store.close()
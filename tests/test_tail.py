@@ -0,0 +1,64 @@
+import gamry_parser as parser
+import os
+import shutil
+import tempfile
+import unittest
+from pandas.testing import assert_frame_equal
+
+
+class TestTail(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def write(self, fname: str, data: bytes):
+        with open(fname, "ab") as f:
+            f.write(data)
+
+    def test_poll(self):
+        with open("tests/cv_data.dta", "rb") as f:
+            data = f.read()
+        expected = parser.GamryParser(filename="tests/cv_data.dta")
+        expected.load()
+
+        fname = os.path.join(self.directory, "cv_data.dta")
+        self.write(fname, data[:500])
+        tail = parser.TailReader(fname)
+        # incomplete header
+        self.assertEqual(tail.poll(), [])
+        self.assertFalse(tail.parser.loaded)
+
+        # header, the first curve and part of a row of the second curve
+        second = data.index(b"CURVE2")
+        self.write(fname, data[500 : second + 200])
+        batches = tail.poll()
+        self.assertTrue(tail.parser.loaded)
+        self.assertEqual(tail.parser.header, expected.header)
+        self.assertEqual([batch.curve for batch in batches], [0, 1])
+        assert_frame_equal(batches[0].rows, expected.curves[0])
+        self.assertEqual(tail.curve_count, 2)
+        partial = len(batches[1].rows)
+        self.assertEqual(tail.offset, data.rindex(b"\n", 0, second + 200) + 1)
+
+        self.write(fname, data[second + 200 :])
+        batches = tail.poll()
+        self.assertEqual(batches[0].curve, 1)
+        self.assertEqual(len(batches[0].rows), 10 - partial)
+        self.assertEqual(tail.curve_count, 5)
+        gp = tail.parser
+        self.assertEqual(gp.curve_count, 5)
+        for curve, expected_curve in zip(gp.curves, expected.curves):
+            assert_frame_equal(curve, expected_curve)
+        self.assertFalse(tail.aborted)
+        self.assertEqual(tail.poll(), [])
+
+    def test_aborted(self):
+        fname = os.path.join(self.directory, "eispot_data.dta")
+        shutil.copyfile("tests/eispot_data_curveaborted.dta", fname)
+        tail = parser.TailReader(fname, parser=parser.Impedance)
+        batches = list(tail.follow(interval=0))
+        self.assertTrue(tail.aborted)
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(tail.parser.curve().shape, (5, 5))
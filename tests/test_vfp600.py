@@ -34,3 +34,45 @@ class TestVFP600(unittest.TestCase):
         self.assertEqual(round(curve["T"].iloc[-1] * 100), 127)
         self.assertEqual(curve["Voltage"].iloc[-1], 0.033333)
         self.assertEqual(round(curve["Current"].iloc[-1] * 1e13), 5125)
+
+    def test_views(self):
+        gp = parser.VFP600()
+        gp.load("tests/vfp600_data.dta")
+        stored = gp.curves[0].copy()
+
+        curve = gp.curve()
+        self.assertTrue(gp.curve().equals(curve))
+        self.assertEqual(gp.curves[0].columns.tolist(), ["T", "Voltage", "Current"])
+        # repeated calls do not modify the stored curve
+        gp.curve()
+        self.assertTrue(gp.curves[0].equals(stored))
+
+        gp.load("tests/vfp600_data.dta", engine="scan")
+        self.assertTrue(gp.curve().equals(curve))
+
+    def test_iter_chunks(self):
+        gp = parser.VFP600(lazy=True)
+        gp.load("tests/vfp600_data.dta")
+        chunks = list(gp.iter_chunks(chunksize=8))
+        self.assertEqual([len(chunk) for chunk in chunks], [8, 8, 4])
+        self.assertEqual(chunks[0].columns.tolist(), ["T", "Voltage", "Current"])
+        # the time axis continues across chunks
+        self.assertEqual(chunks[1]["T"].iloc[0], 8 / 15)
+
+    def test_units(self):
+        units = dict(Voltage="V", Current="A")
+        for columns in [None, ["Voltage"], ["Current"]]:
+            expected = {
+                key: unit
+                for key, unit in units.items()
+                if columns is None or key in columns
+            }
+            # every engine pairs the columns with their own units
+            for options in [
+                dict(engine="python"),
+                dict(engine="scan"),
+                dict(lazy=True),
+            ]:
+                gp = parser.VFP600(columns=columns, **options)
+                gp.load("tests/vfp600_data.dta")
+                self.assertEqual(gp._curve_units, expected)